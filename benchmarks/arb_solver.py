@@ -0,0 +1,125 @@
+"""
+Compares arbitrage solver methods, with and without warm starts.
+
+Arbitrages each pool against random-walk prices, reporting the trade
+simulations per single-pair solve and the time spent sizing trades. Then runs
+the volume-limited strategy with each multi-pair optimizer, with and without
+warm starts, reporting the trade simulations and time per timestep.
+
+Usage: python -m benchmarks.arb_solver [--samples N]
+"""
+
+import argparse
+import time
+from collections import Counter
+from copy import deepcopy
+
+from curvesim.metrics import init_metrics
+from curvesim.pipelines.common import DEFAULT_METRICS, ArbSolverState, get_arb_trades
+from curvesim.pipelines.vol_limited_arb.strategy import VolumeLimitedStrategy
+from curvesim.pipelines.vol_limited_arb.trader import (
+    VolumeLimitedArbitrageur,
+    multipair_optimal_arbitrage,
+)
+
+from .common import (
+    make_cryptoswap_pool,
+    make_metapool,
+    make_price_sampler,
+    make_stableswap_pool,
+    make_tricrypto_pool,
+    timeit,
+)
+
+METHODS = ["brentq", "newton"]
+OPTIMIZERS = ["least_squares", "lm"]
+
+
+def run(pool, price_sampler, method, stats, warm_start=False):
+    """Sizes and executes arbitrage trades for each price sample."""
+    pool = deepcopy(pool)
+    solver_state = ArbSolverState() if warm_start else None
+    for sample in price_sampler:
+        trades = get_arb_trades(pool, sample.prices, stats, method, solver_state)
+        for trade in trades:
+            if trade.amount_in > 0:
+                pool.trade(trade.coin_in, trade.coin_out, trade.amount_in)
+
+
+def run_strategy(pool, price_sampler, stats, warm_start, optimizer):
+    """Runs the volume-limited strategy, adding its trader's stats to `stats`."""
+
+    class Arbitrageur(VolumeLimitedArbitrageur):
+        # pylint: disable-next=missing-function-docstring
+        def __init__(self, pool):
+            super().__init__(pool)
+            self.stats = stats
+            if not warm_start:
+                self.solver_state = None
+
+        # pylint: disable-next=arguments-differ
+        def compute_trades(self, prices, volume_limits):
+            trades, errors, _ = multipair_optimal_arbitrage(
+                self.pool,
+                prices,
+                volume_limits,
+                self.stats,
+                self.solver_state,
+                optimizer,
+            )
+            return trades, {"price_errors": errors}
+
+    metrics = init_metrics(DEFAULT_METRICS, pool=pool)
+    volume_multipliers = {pair: 0.5 for pair in price_sampler.volumes.columns}
+    strategy = VolumeLimitedStrategy(metrics, volume_multipliers)
+    strategy.trader_class = Arbitrageur
+    strategy(deepcopy(pool), None, price_sampler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=100)
+    args = parser.parse_args()
+
+    pools = {
+        "stableswap": make_stableswap_pool(),
+        "metapool": make_metapool(),
+        "cryptoswap": make_cryptoswap_pool(),
+    }
+
+    print("Single-pair solves")
+    print(f"{'pool':>12}{'method':>14}{'evals/solve':>13}{'time':>8}")
+    for name, (pool, prices) in pools.items():
+        price_sampler = make_price_sampler(prices, args.samples)
+        for method in METHODS:
+            for warm_start in [False, True]:
+                stats = Counter()
+                run(pool, price_sampler, method, stats, warm_start)
+                evals = stats["arb_evaluations"] / max(stats["arb_solves"], 1)
+                t = timeit(run, pool, price_sampler, method, Counter(), warm_start)
+                label = method + (", warm" if warm_start else "")
+                print(f"{name:>12}{label:>14}{evals:>13.2f}{t:>7.2f}s")
+
+    pools["tricrypto"] = make_tricrypto_pool()
+
+    print("\nVolume-limited strategy, trade simulations per timestep")
+    print(
+        f"{'pool':>12}{'optimizer':>20}{'single-pair':>13}{'optimizer':>11}{'time':>9}"
+    )
+    for name, (pool, prices) in pools.items():
+        price_sampler = make_price_sampler(prices, args.samples)
+        for optimizer in OPTIMIZERS:
+            for warm_start in [False, True]:
+                stats = Counter()
+                start = time.perf_counter()
+                run_strategy(pool, price_sampler, stats, warm_start, optimizer)
+                t = (time.perf_counter() - start) / args.samples * 1000
+
+                label = optimizer + (", warm" if warm_start else "")
+                single = stats["arb_evaluations"] / args.samples
+                evals = stats["optimizer_evaluations"] / args.samples
+                print(f"{name:>12}{label:>20}{single:>13.1f}{evals:>11.1f}{t:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Synthetic pools and market data for benchmarks, so they run offline.
+"""
+
+import time
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from curvesim.iterators.price_samplers import PriceVolume
+from curvesim.pool.sim_interface import (
+    SimCurveCryptoPool,
+    SimCurveMetaPool,
+    SimCurvePool,
+)
+
+
+def make_metadata(names, symbol="BENCH"):
+    """Returns minimal pool metadata for the given coin names."""
+    return {
+        "coins": {
+            "names": names,
+            "addresses": [f"0x{i:040x}" for i in range(len(names))],
+        },
+        "chain": "mainnet",
+        "symbol": symbol,
+        "name": symbol,
+        "address": "0x" + "0" * 40,
+    }
+
+
+def make_stableswap_pool():
+    """Returns a 3-coin stableswap pool with $3M of liquidity."""
+    pool = SimCurvePool(A=250, D=3_000_000 * 10**18, n=3, admin_fee=5 * 10**9)
+    pool.metadata = make_metadata(["USDC", "DAI", "USDT"])
+    return pool, {"USDC": 1, "DAI": 1, "USDT": 1}
+
+
+def make_metapool():
+    """Returns a metapool paired with a 2-coin basepool."""
+    basepool = SimCurvePool(A=250, D=20_000_000 * 10**18, n=2, admin_fee=5 * 10**9)
+    basepool.metadata = make_metadata(["USDC", "DAI"])
+    pool = SimCurveMetaPool(
+        A=250, D=4_000_000 * 10**18, n=2, admin_fee=5 * 10**9, basepool=basepool
+    )
+    pool.metadata = make_metadata(["FRAX", "BP"])
+    return pool, {"FRAX": 1, "USDC": 1, "DAI": 1}
+
+
+def make_cryptoswap_pool():
+    """Returns a 2-coin cryptoswap pool resembling a USDC/ETH pool."""
+    pool = SimCurveCryptoPool(
+        A=400000,
+        gamma=72500000000000,
+        n=2,
+        precisions=[1, 1],
+        mid_fee=26000000,
+        out_fee=45000000,
+        allowed_extra_profit=2000000000000,
+        fee_gamma=230000000000000,
+        adjustment_step=146000000000000,
+        admin_fee=5000000000,
+        ma_half_time=600,
+        price_scale=[1550997347493624157],
+        balances=[20477317313816545807568241, 13270936465339000000000000],
+        tokens=1550997347493624157 * 10**7,
+        xcp_profit=10**18,
+        xcp_profit_a=10**18,
+    )
+    pool.metadata = make_metadata(["USDC", "ETH"])
+    return pool, {"USDC": 1, "ETH": 1.55}
+
+
+def make_tricrypto_pool():
+    """Returns a 3-coin cryptoswap pool resembling a USDT/WBTC/ETH pool."""
+    pool = SimCurveCryptoPool(
+        A=1707629,
+        gamma=11809167828997,
+        n=3,
+        precisions=[1, 1, 1],
+        mid_fee=3000000,
+        out_fee=30000000,
+        allowed_extra_profit=2000000000000,
+        fee_gamma=500000000000000,
+        adjustment_step=490000000000000,
+        admin_fee=5000000000,
+        ma_half_time=865,
+        price_scale=[30453123431671769818574, 1871140849377954208512],
+        balances=[
+            18418434882428000000000000,
+            605473277480000000000,
+            9914993293693631287774,
+        ],
+        tokens=47986553926751950746367,
+        xcp_profit=1000448625854298803,
+        xcp_profit_a=1000440033249679801,
+    )
+    pool.metadata = make_metadata(["USDT", "WBTC", "ETH"])
+    return pool, {"USDT": 1, "WBTC": 30453, "ETH": 1871}
+
+
+def make_price_sampler(prices, n_samples=100, seed=0):
+    """
+    Returns a :class:`.PriceVolume` sampler with random-walk prices and
+    uniformly distributed volumes.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(prices)
+    walks = {name: np.exp(np.cumsum(rng.normal(0, 0.003, n_samples))) for name in names}
+    pairs = list(combinations(names, 2))
+
+    columns = {}
+    for a, b in pairs:
+        columns[("price", (a, b))] = prices[a] / prices[b] * walks[a] / walks[b]
+    for a, b in pairs:
+        columns[("volume", (a, b))] = rng.uniform(1e5, 1e6, n_samples) / prices[a]
+
+    index = pd.date_range("2024-01-01", periods=n_samples, freq="1h")
+    data = pd.DataFrame(columns, index=index)
+    data.columns = pd.MultiIndex.from_tuples(list(columns))
+    return PriceVolume(data)
+
+
+def timeit(func, *args, repeat=3, **kwargs):
+    """Returns the best wall time of `repeat` calls to `func`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,58 @@
+"""
+Compares serial, thread, and process execution of `run_pipeline` across grid sizes.
+
+Usage: python -m benchmarks.executors [--samples N] [--workers N]
+"""
+
+import argparse
+import sys
+
+from curvesim.iterators.param_samplers import ParameterizedPoolIterator
+from curvesim.metrics import init_metrics
+from curvesim.pipelines import run_pipeline
+from curvesim.pipelines.common import DEFAULT_METRICS
+from curvesim.pipelines.executors import ProcessExecutor, SerialExecutor, ThreadExecutor
+from curvesim.pipelines.vol_limited_arb.strategy import VolumeLimitedStrategy
+
+from .common import make_price_sampler, make_stableswap_pool, timeit
+
+GRID_SIZES = [1, 2, 4, 8, 16]
+
+
+def run(executor, n_runs, pool, price_sampler):
+    """Runs a grid of `n_runs` A values with the given executor."""
+    variable_params = {"A": [100 + 100 * i for i in range(n_runs)]}
+    param_sampler = ParameterizedPoolIterator(pool, variable_params)
+    metrics = init_metrics(DEFAULT_METRICS, pool=pool)
+    volume_multipliers = {pair: 0.5 for pair in price_sampler.volumes.columns}
+    strategy = VolumeLimitedStrategy(metrics, volume_multipliers)
+    run_pipeline(param_sampler, price_sampler, strategy, executor=executor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    pool, prices = make_stableswap_pool()
+    price_sampler = make_price_sampler(prices, args.samples)
+    executors = {
+        "serial": SerialExecutor(),
+        "thread": ThreadExecutor(args.workers),
+        "process": ProcessExecutor(args.workers),
+    }
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL enabled: {gil}")
+    print(f"{'runs':>6}" + "".join(f"{name:>10}" for name in executors))
+    for n_runs in GRID_SIZES:
+        times = [
+            timeit(run, executor, n_runs, pool, price_sampler, repeat=1)
+            for executor in executors.values()
+        ]
+        print(f"{n_runs:>6}" + "".join(f"{t:>9.2f}s" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Measures the overhead of sending worker log records to the main process.
+
+Compares a `multiprocessing.Manager` queue with one record per transfer against
+curvesim's batched transport, with and without a worker-side level filter.
+
+Usage: python -m benchmarks.logging_transport [--runs N] [--records N]
+"""
+
+import argparse
+import logging
+import multiprocessing as mp
+import os
+from logging.handlers import QueueHandler, QueueListener
+
+from curvesim.logging import (
+    configure_multiprocess_logging,
+    flush_multiprocess_logging,
+    multiprocessing_logging_queue,
+)
+
+from .common import timeit
+
+logger = logging.getLogger("benchmarks.logging_transport")
+
+
+def _log_records(n_records):
+    for i in range(n_records):
+        logger.warning("Optimizer failed at timestep %s", i)
+    flush_multiprocess_logging()
+
+
+def _configure_manager_logging(logging_queue):
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    root_logger.addHandler(QueueHandler(logging_queue))
+
+
+def run_manager_queue(n_runs, n_records, handler):
+    """Sends each record through a Manager queue proxy."""
+    with mp.Manager() as manager:
+        logging_queue = manager.Queue()
+        listener = QueueListener(logging_queue, handler)
+        listener.start()
+        with mp.Pool(
+            2, initializer=_configure_manager_logging, initargs=(logging_queue,)
+        ) as pool:
+            pool.map(_log_records, [n_records] * n_runs)
+        listener.stop()
+
+
+def run_batched_queue(n_runs, n_records, handler, level="debug"):
+    """Sends batched records through a plain multiprocessing queue."""
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    root_logger.handlers[:] = [handler]
+    try:
+        with multiprocessing_logging_queue() as logging_queue:
+            with mp.Pool(
+                2,
+                initializer=configure_multiprocess_logging,
+                initargs=(logging_queue, level),
+            ) as pool:
+                pool.map(_log_records, [n_records] * n_runs)
+                pool.close()
+                pool.join()
+    finally:
+        root_logger.handlers[:] = handlers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=16)
+    parser.add_argument("--records", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        handler = logging.StreamHandler(devnull)
+        cases = {
+            "manager queue": (run_manager_queue,),
+            "batched queue": (run_batched_queue,),
+            "batched queue, level=error": (run_batched_queue, "error"),
+        }
+
+        print(f"{args.runs} runs x {args.records} warnings")
+        for name, (func, *extra) in cases.items():
+            t = timeit(func, args.runs, args.records, handler, *extra)
+            print(f"{name:>28}: {t:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -92,3 +92,7 @@ class TimeSequenceError(CurvesimException):
 
 class DataSourceError(CurvesimException):
     """Error using a DataSource object."""
+
+
+class ExecutorError(CurvesimException):
+    """Error running simulations with an Executor object."""
@@ -20,7 +20,7 @@ class ParameterizedPoolIterator(ParameterSampler):
     """
 
     # pylint: disable-next=unused-argument
-    def __new__(cls, pool, variable_params=None, fixed_params=None, pool_map=None):
+    def __new__(cls, pool=None, variable_params=None, fixed_params=None, pool_map=None):
         """
         Returns a pool-specific ParameterizedPoolIterator subclass.
 
@@ -36,7 +36,7 @@ class ParameterizedPoolIterator(ParameterSampler):
         """
         pool_map = pool_map or DEFAULT_POOL_MAP
 
-        if cls is not ParameterizedPoolIterator:
+        if cls is not ParameterizedPoolIterator:  # also reached when unpickling
             return super().__new__(cls)
 
         try:
@@ -97,9 +97,24 @@ class ParameterizedPoolIterator(ParameterSampler):
             A dictionary of the pool parameters set on this iteration.
         """
         for params in self.parameter_sequence:
-            pool = deepcopy(self.pool_template)
-            self.set_pool_attributes(pool, params)
-            yield pool, params
+            yield self.make_pool(params), params
+
+    def make_pool(self, params):
+        """
+        Returns a copy of the pool template with the input parameters set.
+
+        Parameters
+        ----------
+        params : dict
+            A dictionary of pool parameters to set.
+
+        Returns
+        -------
+        pool : :class:`~curvesim.templates.SimPool`
+        """
+        pool = deepcopy(self.pool_template)
+        self.set_pool_attributes(pool, params)
+        return pool
 
     def make_parameter_sequence(self, variable_params):
         """
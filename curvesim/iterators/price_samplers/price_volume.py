@@ -55,13 +55,15 @@ class PriceVolume(PriceSampler):
         -------
         :class:`PriceVolumeSample`
         """
-        for row in self.data.iterrows():
-            timestamp, row_data = row
-
-            prices = row_data["price"].to_dict()
-            volumes = row_data["volume"].to_dict()
-
-            yield PriceVolumeSample(timestamp, prices, volumes)  # type:ignore
+        # Rows are converted to dicts in bulk, rather than one Series at a time
+        prices = self.prices.to_dict("records")
+        volumes = self.volumes.to_dict("records")
+        for sample in zip(self.data.index, prices, volumes):
+            yield PriceVolumeSample(*sample)  # type:ignore
+
+    def __len__(self):
+        """Returns the number of timesteps."""
+        return len(self.data)
 
     @property
     def prices(self):
@@ -7,8 +7,10 @@ import logging
 import logging.config
 import multiprocessing as mp
 import os
+import time
 from contextlib import contextmanager
 from logging.handlers import QueueHandler, QueueListener
+from multiprocessing.util import Finalize
 from typing import Dict, List
 
 # -- convenient parameters to adjust for debugging -- #
@@ -105,20 +107,100 @@ def multiprocessing_logging_queue():
     """
     Context manager for a logging queue that can be shared
     across multiple processes.
+
+    The queue must be passed to worker processes when they are created
+    (e.g., through a pool initializer), not as a task argument.
     """
-    with mp.Manager() as manager:
-        try:
-            logging_queue = manager.Queue()
-            root_logger = get_logger("")
-            listener = QueueListener(logging_queue, *root_logger.handlers)
-            listener.start()
-            yield logging_queue
-        finally:
-            listener.stop()
+    logging_queue = mp.Queue()
+    root_logger = get_logger("")
+    listener = BatchQueueListener(logging_queue, *root_logger.handlers)
+    listener.start()
+    try:
+        yield logging_queue
+    finally:
+        listener.stop()
+        logging_queue.close()
+        logging_queue.join_thread()
+
+
+def configure_multiprocess_logging(logging_queue, level=logging.DEBUG):
+    """
+    Configure root logger in process to enqueue logs.
 
+    Records below `level` are dropped in the worker, before being enqueued.
+    Remaining records are sent in batches (see :class:`BatchQueueHandler`) and
+    flushed when the process exits.
+    """
+    if isinstance(level, str):
+        level = LEVELS[level.strip().lower()]
+
+    handler = BatchQueueHandler(logging_queue)
+    handler.setLevel(level)
 
-def configure_multiprocess_logging(logging_queue):
-    """Configure root logger in process to enqueue logs."""
     root_logger = get_logger("")
     root_logger.handlers.clear()
-    root_logger.addHandler(QueueHandler(logging_queue))
+    root_logger.addHandler(handler)
+
+    # run before the queue's own finalizers, which stop its feeder thread
+    Finalize(None, flush_multiprocess_logging, exitpriority=20)
+
+
+def flush_multiprocess_logging():
+    """Sends any batched log records in this process to the logging queue."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+class BatchQueueHandler(QueueHandler):
+    """
+    Queue handler that enqueues lists of records instead of single records,
+    reducing the number of inter-process transfers.
+
+    A batch is sent when it reaches `capacity` records, when `flush_interval`
+    seconds have passed since the last batch, or when :meth:`flush` is called.
+    """
+
+    def __init__(self, queue, capacity=100, flush_interval=1.0):
+        super().__init__(queue)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.prepare(record))
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+            return
+
+        if (
+            len(self.buffer) >= self.capacity
+            or time.monotonic() - self.last_flush > self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer:
+                self.enqueue(self.buffer)
+                self.buffer = []
+            self.last_flush = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class BatchQueueListener(QueueListener):
+    """Queue listener that handles batches from a :class:`BatchQueueHandler`."""
+
+    def handle(self, record):
+        if isinstance(record, list):
+            for _record in record:
+                super().handle(_record)
+        else:
+            super().handle(record)
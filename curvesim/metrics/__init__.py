@@ -26,7 +26,7 @@ from .results import SimResults, make_results
 from .state_log import StateLog
 
 
-def init_metrics(metric_classes, **kwargs):
+def init_metrics(metric_classes, freqs=None, **kwargs):
     """
     Initializes metric classes with **kwargs as keyword arguments. Each metric class
     only uses the keyword arguments specified in its __init__ method.
@@ -36,6 +36,11 @@ def init_metrics(metric_classes, **kwargs):
     metric_classes : list
         A list of metric classes (e.g., from curvesim.metrics.metrics)
 
+    freqs : dict, optional
+        Maps metric classes to the fixed pandas frequency (e.g., "1D") at which to
+        sample them (see :class:`~curvesim.metrics.base.MetricBase`). Other metrics
+        are computed at every timestamp.
+
     kwargs :
         The keyword arguments used when initializing each metric class.
 
@@ -44,4 +49,12 @@ def init_metrics(metric_classes, **kwargs):
     metrics :
         A list of the initialized metrics.
     """
-    return [Metric(**kwargs) for Metric in metric_classes]
+    freqs = freqs or {}
+
+    metrics = []
+    for Metric in metric_classes:
+        if Metric in freqs:
+            metrics.append(Metric(freq=freqs[Metric], **kwargs))
+        else:
+            metrics.append(Metric(**kwargs))
+    return metrics
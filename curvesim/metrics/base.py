@@ -11,11 +11,15 @@ __all__ = [
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 
+from numpy import full, nan, where, zeros
 from pandas import DataFrame, MultiIndex, Series
 
 from curvesim.exceptions import MetricError
 from curvesim.utils import cache, override
 
+# Values recorded in the pool state log which are derived from the pool state
+DERIVED_POOL_STATE = ("virtual_value",)
+
 
 class MetricBase(ABC):
     """
@@ -26,13 +30,22 @@ class MetricBase(ABC):
     defined individually for metrics specified in :mod:`.metrics.metrics`.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, freq=None, **kwargs):
         """
         All metric classes must include kwargs in their constructor to ignore
         extra keywords passed by :class:`.StateLog`.
+
+        Parameters
+        ----------
+        freq : str, optional
+            A fixed pandas frequency (e.g., "1D") at which to sample the metric.
+            If provided, the metric is only computed at the first timestamp of
+            each period, and trades are attributed to the period they were
+            executed in.  By default, the metric is computed at every timestamp.
         """
+        self.freq = freq
 
-    def compute(self, state_log):
+    def compute(self, state_log, updates=None):
         """
         Computes metrics and summary statistics from the data provided by
         :class:`.StateLog` at the end of each simulation run.
@@ -45,6 +58,10 @@ class MetricBase(ABC):
         state_log : dict
             State log data returned by func:`.StateLog.get_logs()`
 
+        updates : DataFrame, optional
+            Metric values recorded with :func:`update_function` at each timestamp.
+            If provided, these are used instead of :func:`metric_function`.
+
         Returns
         -------
             data : DataFrame
@@ -56,7 +73,9 @@ class MetricBase(ABC):
                 specified, returns None.
         """
         timestamps = state_log["price_sample"].timestamp
-        data = self.metric_function(**state_log).set_index(timestamps)
+        if updates is None:
+            updates = self.metric_function(**state_log)
+        data = updates.set_index(timestamps)
         return data, summarize_data(data, self.summary_functions)
 
     @property
@@ -91,6 +110,38 @@ class MetricBase(ABC):
         """
         raise NotImplementedError
 
+    @property
+    def update_function(self):
+        """
+        Returns a function that computes metrics for a single timestamp, from the
+        live pool just after that timestamp's trades. (Optional)
+
+        If specified, the :class:`.StateLog` calls the function at each (sampled)
+        timestamp, with :code:`price_sample`, :code:`trade_data`, and :code:`pool`
+        keywords, instead of calling :func:`metric_function` at the end of the run.
+
+        Returns
+        -------
+        function or None
+            A function that returns a dict of sub-metric values. Returns None if
+            the metric is only computed at the end of each run.
+        """
+
+    @property
+    def inputs(self):
+        """
+        Names of the state log data used by :func:`metric_function`. (Optional)
+
+        The :class:`.StateLog` only records the data needed by the metrics it
+        computes at the end of each run.
+
+        Returns
+        -------
+        list of str or None
+            Keywords of :func:`.StateLog.get_logs()` used by the metric. Returns
+            None if the metric may use all of them.
+        """
+
     @property
     def plot_config(self):
         """
@@ -167,6 +218,41 @@ class Metric(MetricBase):
         except KeyError:
             return None
 
+    @property
+    @override
+    def update_function(self):
+        """
+        Returns a function that computes metrics for a single timestamp, from the
+        live pool just after that timestamp's trades. (Optional)
+
+        Returns
+        -------
+        config["functions"]["update"] : function or None
+            Function returning a dict of sub-metric values. Returns None if
+            :python:`self.config["functions"]["update"]` is not present.
+        """
+        try:
+            return self.config["functions"]["update"]
+        except KeyError:
+            return None
+
+    @property
+    @override
+    def inputs(self):
+        """
+        Names of the state log data used by :func:`metric_function`. (Optional)
+
+        Returns
+        -------
+        config["functions"]["inputs"] : list of str or None
+            Keywords of :func:`.StateLog.get_logs()` used by the metric. Returns
+            None if :python:`self.config["functions"]["inputs"]` is not present.
+        """
+        try:
+            return self.config["functions"]["inputs"]
+        except KeyError:
+            return None
+
     @property
     @override
     def summary_functions(self):
@@ -253,7 +339,7 @@ class PoolMetric(Metric):
             metric computations.
         """
         self._pool = pool
-        super().__init__(**kwargs)  # kwargs are ignored
+        super().__init__(**kwargs)
 
     @property
     @abstractmethod
@@ -271,6 +357,8 @@ class PoolMetric(Metric):
 
     def set_pool_state(self, pool_state):
         for attr, val in pool_state.items():
+            if attr in DERIVED_POOL_STATE:
+                continue
             if attr.endswith("_base"):
                 setattr(self._pool.basepool, attr[:-5], val)
             else:
@@ -302,6 +390,9 @@ class PricingMixin:
 
     Also provides :code:`numeraire` and :code:`numeraire_idx` attributes for computing
     prices or values with a preferred numeraire.
+
+    Lookups of the coin pairs giving each exchange rate are memoized, so prices
+    can be looked up by array or list indexing.
     """
 
     def __init__(self, coin_names, **kwargs):
@@ -312,6 +403,7 @@ class PricingMixin:
             Symbols for the coins used in a simulation. A numeraire is selected from
             the specified coins.
         """
+        self.coin_names = list(coin_names)
         self.numeraire = get_numeraire(coin_names)
         super().__init__(**kwargs)
 
@@ -345,6 +437,79 @@ class PricingMixin:
 
         return prices[(base, quote)]
 
+    def get_market_prices(self, base, quote, prices, timesteps):
+        """
+        Returns exchange rates for arrays of coins, each at a given timestamp.
+        Computes the same values as :func:`get_market_price`.
+
+        Parameters
+        ----------
+        base : pandas.Series
+            Categorical symbols for the "in" coins; the "base" currencies
+            (e.g., a column of the "trades" :ref:`state log data<metric-inputs>`).
+        quote : str or pandas.Series
+            Symbol, or categorical symbols, for the "out" coins; the "quote"
+            currencies. Categories must be the same as for `base`.
+        prices : pandas.DataFrame
+            Market prices for each pair (columns) at each timestamp (rows).
+        timesteps : numpy.ndarray
+            The row of `prices` to use for each coin.
+
+        Returns
+        -------
+        numpy.ndarray
+            The price of each "base" coin, quoted in the "quote" coin.
+        """
+        coin_names = list(base.cat.categories)
+        base = base.cat.codes.to_numpy()
+        if isinstance(quote, str):
+            quote = full(len(base), coin_names.index(quote))
+        else:
+            quote = quote.cat.codes.to_numpy()
+
+        columns, inverted = get_pair_columns(coin_names, get_coin_pairs(prices))
+        columns = columns[base, quote]
+        if ((columns < 0) & (base != quote)).any():
+            raise MetricError("Market prices missing for some coin pairs.")
+
+        pair_prices = prices.to_numpy(dtype=float)[timesteps, columns]
+        market_prices = where(inverted[base, quote], 1 / pair_prices, pair_prices)
+        return where(base == quote, 1.0, market_prices)
+
+    def get_numeraire_prices(self, prices):
+        """
+        Returns the market price of each coin in :code:`self.coin_names`, quoted
+        in the numeraire.  Computes the same values as :func:`get_market_price`,
+        but prices are NaN for coins without a price pair with the numeraire.
+
+        Parameters
+        ----------
+        prices : pandas.DataFrame, pandas.Series, or dict
+            Market prices for each pair, at each timestamp (rows of a DataFrame)
+            or at a single timestamp.
+
+        Returns
+        -------
+        pandas.DataFrame or dict
+            For a DataFrame of prices, the price of each coin (columns) at each
+            timestamp (rows).  Otherwise, a dict mapping coins to prices.
+        """
+        if isinstance(prices, DataFrame):
+            return get_numeraire_prices(prices, self.coin_names, self.numeraire)
+
+        numeraire_pairs = get_numeraire_pairs(
+            tuple(self.coin_names), get_coin_pairs(prices), self.numeraire
+        )
+        numeraire_prices = {}
+        for coin, (pair, inverted) in zip(self.coin_names, numeraire_pairs):
+            if coin == self.numeraire:
+                numeraire_prices[coin] = 1.0
+            elif pair is None:
+                numeraire_prices[coin] = nan
+            else:
+                numeraire_prices[coin] = 1 / prices[pair] if inverted else prices[pair]
+        return numeraire_prices
+
 
 def get_coin_pairs(prices):
     """
@@ -362,6 +527,72 @@ def get_coin_pairs(prices):
     )
 
 
+def get_pair_columns(coin_names, coin_pairs):
+    """
+    Returns, for each (base, quote) pair of coin indices, the index of the coin
+    pair whose price gives their exchange rate (-1 if there is none), and
+    whether that price must be inverted.
+
+    Results are memoized, and returned as read-only arrays.
+    """
+    return _get_pair_columns(tuple(coin_names), tuple(coin_pairs))
+
+
+@cache
+def get_numeraire_pairs(coin_names, coin_pairs, numeraire):
+    """
+    Returns, for each coin, the coin pair whose price gives its exchange rate
+    with the numeraire (None if there is none), and whether that price must be
+    inverted.  Arguments must be tuples, so results can be memoized.
+    """
+    columns, inverted = get_pair_columns(coin_names, coin_pairs)
+    numeraire_idx = coin_names.index(numeraire)
+
+    numeraire_pairs = []
+    for column, invert in zip(columns[:, numeraire_idx], inverted[:, numeraire_idx]):
+        pair = coin_pairs[column] if column >= 0 else None
+        numeraire_pairs.append((pair, bool(invert)))
+    return tuple(numeraire_pairs)
+
+
+@cache
+def _get_pair_columns(coin_names, coin_pairs):
+    n = len(coin_names)
+    columns = full((n, n), -1)
+    inverted = zeros((n, n), dtype=bool)
+
+    coin_ids = {coin: i for i, coin in enumerate(coin_names)}
+    for k, (base, quote) in enumerate(coin_pairs):
+        if base not in coin_ids or quote not in coin_ids:
+            continue
+        i, j = coin_ids[base], coin_ids[quote]
+        columns[i, j], inverted[i, j] = k, False
+        if columns[j, i] < 0:
+            columns[j, i], inverted[j, i] = k, True
+
+    columns.flags.writeable = False
+    inverted.flags.writeable = False
+    return columns, inverted
+
+
+def get_numeraire_prices(prices, coin_names, numeraire):
+    """
+    Returns the market price of each coin (columns) in the numeraire at each
+    timestamp (rows), as computed by :meth:`PricingMixin.get_market_price`.
+    Prices are NaN for coins without a price pair with the numeraire.
+    """
+    columns, inverted = get_pair_columns(coin_names, get_coin_pairs(prices))
+    numeraire_idx = list(coin_names).index(numeraire)
+    columns = columns[:, numeraire_idx]
+    inverted = inverted[:, numeraire_idx]
+
+    pair_prices = prices.to_numpy(dtype=float)[:, columns]
+    numeraire_prices = where(inverted, 1 / pair_prices, pair_prices)
+    numeraire_prices[:, columns < 0] = nan
+    numeraire_prices[:, numeraire_idx] = 1.0
+    return DataFrame(numeraire_prices, index=prices.index, columns=coin_names)
+
+
 def get_numeraire(coins):
     """
     Returns a preferred numeraire from the provided list of coins.
@@ -396,7 +627,7 @@ class PricingMetric(PricingMixin, Metric):
             the specified coins.
 
         """
-        super().__init__(coin_names)
+        super().__init__(coin_names, **kwargs)
 
 
 class PoolPricingMetric(PricingMixin, PoolMetric):
@@ -413,4 +644,4 @@ class PoolPricingMetric(PricingMixin, PoolMetric):
             :func:`pool_config` and stored as :python:`self._pool` for access during
             metric computations. Number and names of coins derived from pool metadata.
         """
-        super().__init__(pool.asset_names, pool=pool)
+        super().__init__(pool.asset_names, pool=pool, **kwargs)
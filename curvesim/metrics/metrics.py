@@ -15,7 +15,22 @@ __all__ = [
 from copy import deepcopy
 
 from altair import Axis, Scale
-from numpy import array, exp, inf, log, timedelta64
+from numpy import (
+    add,
+    arange,
+    array,
+    bincount,
+    concatenate,
+    cumsum,
+    diagonal,
+    exp,
+    full,
+    log,
+    searchsorted,
+    timedelta64,
+    where,
+    zeros,
+)
 from pandas import DataFrame, concat
 
 from curvesim.pool.sim_interface import (
@@ -40,6 +55,7 @@ class ArbMetrics(PricingMetric):
         return {
             "functions": {
                 "metrics": self.compute_arb_metrics,
+                "inputs": ["prices", "numeraire_prices", "trades", "trade_data"],
                 "summary": {
                     "arb_profit": "sum",
                     "pool_fees": "sum",
@@ -88,16 +104,16 @@ class ArbMetrics(PricingMetric):
         }
 
     def __init__(self, pool, **kwargs):
-        super().__init__(pool.asset_names)
+        super().__init__(pool.asset_names, **kwargs)
 
     def compute_arb_metrics(self, **kwargs):
         """Computes all metrics for each timestamp in an individual run."""
-        price_sample = kwargs["price_sample"]
+        trades = kwargs["trades"]
         trade_data = kwargs["trade_data"]
 
-        prices = DataFrame(price_sample.prices.to_list(), index=price_sample.index)
-
-        profits = self._compute_profits(prices, trade_data.trades)
+        profits = self._compute_profits(
+            kwargs["prices"], kwargs["numeraire_prices"], trades, trade_data.index
+        )
         price_error = trade_data.price_errors.apply(
             lambda errors: sum(abs(e) for e in errors.values())
         )
@@ -107,44 +123,37 @@ class ArbMetrics(PricingMetric):
 
         return results
 
-    def _compute_profits(self, price_df, trade_df):  # pylint: disable=too-many-locals
+    def _compute_profits(self, price_df, numeraire_price_df, trade_df, index):
         """
-        Computes arbitrageur profits and pool fees for a single row of data (i.e.,
-        a single timestamp) in units of the chosen numeraire, `self.numeraire`.
+        Computes arbitrageur profits and pool fees for each timestamp in `index`
+        (one per trade "period") in units of the chosen numeraire,
+        `self.numeraire`.  Each trade is valued at the prices of the timestep it
+        was executed at.
         """
-        numeraire = self.numeraire
-
-        profit = []
-        for price_row, trade_row in zip(price_df.iterrows(), trade_df):
-
-            timestamp, prices = price_row
-            arb_profit = 0
-            pool_profit = 0
-
-            for trade in trade_row:
-                market_price = self.get_market_price(
-                    trade.coin_in, trade.coin_out, prices
-                )
-                arb = trade.amount_out - trade.amount_in * market_price
-                fee = trade.fee
+        timesteps = trade_df.timestep.to_numpy()
+        periods = trade_df.period.to_numpy()
+        coin_in, coin_out = trade_df.coin_in, trade_df.coin_out
 
-                if trade.coin_out != numeraire:
-                    price = self.get_market_price(trade.coin_out, numeraire, prices)
-                    arb *= price
-                    fee *= price
+        market_prices = self.get_market_prices(coin_in, coin_out, price_df, timesteps)
+        numeraire_prices = numeraire_price_df.to_numpy()[
+            timesteps, coin_out.cat.codes.to_numpy()
+        ]
 
-                arb_profit += arb
-                pool_profit += fee
+        amount_in = trade_df.amount_in.to_numpy(dtype=float)
+        amount_out = trade_df.amount_out.to_numpy(dtype=float)
+        arb = (amount_out - amount_in * market_prices) * numeraire_prices
+        arb_profit = bincount(periods, arb, minlength=len(index))
 
-            profit.append(
-                {
-                    "timestamp": timestamp,
-                    "arb_profit": arb_profit / 10**18,
-                    "pool_profit": pool_profit / 10**18,
-                }
-            )
+        fee = trade_df.fee.to_numpy()
+        in_numeraire = (coin_out == self.numeraire).to_numpy()
+        pool_profit = _sum_by_timestep(
+            periods, len(index), fee, numeraire_prices, in_numeraire
+        )
 
-        return DataFrame(profit).set_index("timestamp")
+        return DataFrame(
+            {"arb_profit": arb_profit / 10**18, "pool_profit": pool_profit},
+            index=index,
+        )
 
 
 class PoolVolume(PoolPricingMetric):
@@ -156,7 +165,10 @@ class PoolVolume(PoolPricingMetric):
     @cache
     def pool_config(self):
         base = {
-            "functions": {"summary": {"pool_volume": "sum"}},
+            "functions": {
+                "inputs": ["price_sample", "trades"],
+                "summary": {"pool_volume": "sum"},
+            },
             "plot": {
                 "metrics": {
                     "pool_volume": {
@@ -192,6 +204,8 @@ class PoolVolume(PoolPricingMetric):
         for pool in functions:
             cfg = deepcopy(base)
             cfg["functions"]["metrics"] = functions[pool]
+            if pool is SimCurveCryptoPool:
+                cfg["functions"]["inputs"].append("numeraire_prices")
             _units = units[pool]
             cfg["plot"]["metrics"]["pool_volume"]["title"] = "Daily Volume " + _units
             cfg["plot"]["summary"]["pool_volume"]["title"] = "Total Volume " + _units
@@ -203,59 +217,52 @@ class PoolVolume(PoolPricingMetric):
         """
         Records trade volume for stableswap non-meta-pools.
         """
-        trade_data = kwargs["trade_data"]
-
-        def per_timestamp_function(trade_data):
-            trades = trade_data.trades
-            return sum(trade.amount_in for trade in trades) / 10**18
-
-        return self._get_volume(trade_data, per_timestamp_function)
+        trades = kwargs["trades"]
+        return self._get_volume(kwargs["price_sample"], trades)
 
     def get_stableswap_metapool_volume(self, **kwargs):
         """
         Records trade volume for stableswap meta-pools. Only includes trades involving
         the meta-asset (basepool-only trades are ignored).
         """
-        trade_data = kwargs["trade_data"]
+        trades = kwargs["trades"]
 
         meta_asset = self._pool.asset_names[0]
+        is_meta = (trades.coin_in == meta_asset) | (trades.coin_out == meta_asset)
+        trades = trades[is_meta]
 
-        def per_timestamp_function(trade_data):
-            volume = 0
-            for trade in trade_data.trades:
-                if meta_asset in (trade.coin_in, trade.coin_out):
-                    volume += trade.amount_in
-            return volume / 10**18
-
-        return self._get_volume(trade_data, per_timestamp_function)
+        return self._get_volume(kwargs["price_sample"], trades)
 
     def get_cryptoswap_pool_volume(self, **kwargs):
         """
         Records trade volume for cryptoswap non-meta-pools.
         """
-        trades = kwargs["trade_data"].trades
-        prices = kwargs["price_sample"].prices
-
-        trade_price_data = concat([trades, prices], axis=1)
-        numeraire = self.numeraire
+        trades = kwargs["trades"]
+        price_sample = kwargs["price_sample"]
 
-        def per_timestamp_function(trade_price_data):
-            trades = trade_price_data.trades
-            prices = trade_price_data.prices
-            get_price = self.get_market_price
+        numeraire_prices = kwargs["numeraire_prices"].to_numpy()[
+            trades.timestep.to_numpy(), trades.coin_in.cat.codes.to_numpy()
+        ]
+        in_numeraire = (trades.coin_in == self.numeraire).to_numpy()
 
-            volume = 0
-            for trade in trades:
-                volume += trade.amount_in * get_price(trade.coin_in, numeraire, prices)
-            return volume / 10**18
+        return self._get_volume(price_sample, trades, numeraire_prices, in_numeraire)
 
-        return self._get_volume(trade_price_data, per_timestamp_function)
+    def _get_volume(self, price_sample, trades, prices=None, unpriced=None):
+        """
+        Sums the amounts traded in during each timestamp's period, converted by
+        `prices` except where `unpriced` is True.
+        """
+        if unpriced is None:
+            unpriced = full(len(trades), True)
 
-    def _get_volume(self, trade_data, per_timestamp_function):
-        volume = trade_data.apply(per_timestamp_function, axis=1)
-        results = DataFrame(volume)
-        results.columns = ["pool_volume"]
-        return results
+        volume = _sum_by_timestep(
+            trades.period.to_numpy(),
+            len(price_sample),
+            trades.amount_in.to_numpy(),
+            prices,
+            unpriced,
+        )
+        return DataFrame({"pool_volume": volume}, index=price_sample.index)
 
 
 class PoolBalance(PoolMetric):
@@ -270,6 +277,7 @@ class PoolBalance(PoolMetric):
         ss_config = {
             "functions": {
                 "metrics": self.get_pool_balance,
+                "update": self.get_pool_balance_update,
                 "summary": {"pool_balance": ["median", "min"]},
             },
             "plot": {
@@ -312,12 +320,23 @@ class PoolBalance(PoolMetric):
         balance = pool_state.apply(self._compute_stableswap_balance, axis=1)
         return DataFrame(balance, columns=["pool_balance"])
 
+    def get_pool_balance_update(self, **kwargs):
+        """
+        Computes the pool balance metric from the live pool at a single timestamp.
+        Used for any Curve pool.
+        """
+        return {"pool_balance": self._compute_balance()}
+
     def _compute_stableswap_balance(self, pool_state_row):
         """
         Computes balance metric for a single row of data (i.e., a single timestamp).
         Used for any Curve pool.
         """
         self.set_pool_state(pool_state_row)
+        return self._compute_balance()
+
+    def _compute_balance(self):
+        """Computes balance metric for the pool's current state."""
         pool = self._pool
 
         xp = array(pool._xp())  # pylint: disable=protected-access
@@ -371,142 +390,88 @@ class PoolValue(PoolPricingMetric):
         }
 
         base = {
-            "functions": {"summary": summary_fns},
+            "functions": {
+                "inputs": ["pool_state", "reserves", "numeraire_prices"],
+                "summary": summary_fns,
+            },
             "plot": plot,
         }
 
-        functions = {
-            SimCurvePool: self.get_stableswap_pool_value,
-            SimCurveMetaPool: self.get_stableswap_metapool_value,
-            SimCurveRaiPool: self.get_stableswap_metapool_value,
-            SimCurveCryptoPool: self.get_cryptoswap_pool_value,
+        update_functions = {
+            SimCurvePool: self.get_pool_value_update,
+            SimCurveMetaPool: self.get_metapool_value_update,
+            SimCurveRaiPool: self.get_metapool_value_update,
+            SimCurveCryptoPool: self.get_pool_value_update,
         }
 
         config = {}
-        for pool, fn in functions.items():
+        for pool, update_fn in update_functions.items():
             config[pool] = deepcopy(base)
-            config[pool]["functions"]["metrics"] = fn
+            config[pool]["functions"]["metrics"] = self.get_pool_value
+            config[pool]["functions"]["update"] = update_fn
 
         return config
 
-    def get_stableswap_pool_value(self, **kwargs):
-        """
-        Computes all metrics for each timestamp in an individual run.
-        Used for non-meta stableswap pools.
-        """
-
-        return self._get_pool_value(
-            kwargs["pool_state"],
-            kwargs["price_sample"],
-            self._get_stableswap_virtual_value,
-        )
-
-    def get_stableswap_metapool_value(self, **kwargs):
+    def get_pool_value(self, pool_state, reserves, numeraire_prices, **kwargs):
         """
         Computes all metrics for each timestamp in an individual run.
-        Used for stableswap metapools.
-        """
-
-        return self._get_metapool_value(
-            kwargs["pool_state"],
-            kwargs["price_sample"],
-            self._get_stableswap_virtual_value,
-        )
-
-    def get_cryptoswap_pool_value(self, **kwargs):
-        """
-        Computes all metrics for each timestamp in an individual run.
-        Used for non-meta cryptoswap pools.
+        Used for any pool type.
         """
+        # numeraire prices are at every timestamp, even if the metric is sampled
+        numeraire_prices = numeraire_prices[numeraire_prices.index.isin(reserves.index)]
+        pool_value = 0
+        for coin_name in reserves.columns:
+            pool_value += reserves[coin_name] / 10**18 * numeraire_prices[coin_name]
+        pool_value_virtual = pool_state.virtual_value / 10**18
 
-        return self._get_pool_value(
-            kwargs["pool_state"],
-            kwargs["price_sample"],
-            self._get_cryptoswap_virtual_value,
-        )
+        results = concat([pool_value_virtual, pool_value], axis=1)
+        results.columns = list(self.config["plot"]["metrics"])
+        return results.astype("float64")
 
-    def _get_pool_value(self, pool_state, price_sample, virtual_price_fn):
+    def get_pool_value_update(self, price_sample, **kwargs):
         """
-        Computes all metrics for each timestamp in an individual run.
+        Computes all metrics from the live pool at a single timestamp.
         Used for non-meta pools.
         """
-        reserves = DataFrame(
-            pool_state.balances.to_list(),
-            index=pool_state.index,
-            columns=self._pool.coin_names,
-        )
-
-        prices = DataFrame(price_sample.prices.to_list(), index=price_sample.index)
-
-        pool_value = self._get_value_from_prices(reserves / 10**18, prices)
-        pool_value_virtual = pool_state.apply(virtual_price_fn, axis=1)
+        reserves = dict(zip(self._pool.coin_names, self._pool.balances))
+        return self._get_pool_value_update(reserves, price_sample.prices)
 
-        results = concat([pool_value_virtual, pool_value], axis=1)
-        results.columns = list(self.config["plot"]["metrics"])
-        return results.astype("float64")
-
-    def _get_metapool_value(self, pool_state, price_sample, virtual_price_fn):
+    def get_metapool_value_update(self, price_sample, **kwargs):
         """
-        Computes all metrics for each timestamp in an individual run.
+        Computes all metrics from the live pool at a single timestamp.
         Used for stableswap metapools.
         """
-        max_coin = self._pool.max_coin
         pool = self._pool
+        max_coin = pool.max_coin
 
-        meta_reserves = DataFrame(
-            pool_state.balances.to_list(),
-            index=pool_state.index,
-            columns=pool.coin_names,
-        )
-
-        base_reserves = DataFrame(
-            pool_state.balances_base.to_list(),
-            index=pool_state.index,
-            columns=pool.basepool.coin_names,
-        )
-
-        prices = DataFrame(price_sample.prices.to_list(), index=price_sample.index)
-
-        LP_token_proportion = meta_reserves.iloc[:, max_coin] / pool_state.tokens_base
-        base_reserves = base_reserves.mul(LP_token_proportion, axis=0)
-        reserves = concat([meta_reserves.iloc[:, :max_coin], base_reserves], axis=1)
+        LP_token_proportion = pool.balances[max_coin] / pool.basepool.tokens
+        base_reserves = [x * LP_token_proportion for x in pool.basepool.balances]
 
-        pool_value = self._get_value_from_prices(reserves / 10**18, prices)
-        pool_value_virtual = pool_state.apply(virtual_price_fn, axis=1)
-
-        results = concat([pool_value_virtual, pool_value], axis=1)
-        results.columns = list(self.config["plot"]["metrics"])
-        return results.astype("float64")
+        reserves = {
+            **dict(zip(pool.coin_names[:max_coin], pool.balances[:max_coin])),
+            **dict(zip(pool.basepool.coin_names, base_reserves)),
+        }
+        return self._get_pool_value_update(reserves, price_sample.prices)
 
-    def _get_value_from_prices(self, reserves, prices):
+    def _get_pool_value_update(self, reserves, prices):
         """
-        Computes pool value in the chosen numeraire, `self.numeraire`.
+        Computes all metrics at a single timestamp from the pool's reserves.
         Can be used for any pool type.
         """
-        get_price = self.get_market_price
-        numeraire = self.numeraire
+        numeraire_prices = self.get_numeraire_prices(prices)
 
-        value = 0
-        for coin_name in reserves.columns:
-            value += reserves[coin_name] * get_price(coin_name, numeraire, prices)
-        return value
+        pool_value = 0
+        for coin_name, reserve in reserves.items():
+            pool_value += reserve / 10**18 * numeraire_prices[coin_name]
 
-    def _get_stableswap_virtual_value(self, pool_state_row):
-        """
-        Computes virtual pool value for a single row of data (i.e., a single timestamp).
-        Used for any stableswap pool.
-        """
-        self.set_pool_state(pool_state_row)
-        return self._pool.D() / 10**18
+        pool = self._pool
+        if isinstance(pool, SimCurveCryptoPool):
+            # pylint: disable-next=protected-access
+            pool_value_virtual = pool._get_xcp(pool.D) / 10**18
+        else:
+            pool_value_virtual = pool.D() / 10**18
 
-    def _get_cryptoswap_virtual_value(self, pool_state_row):
-        """
-        Computes virtual pool value for a single row of data (i.e., a single timestamp).
-        Used for any cryptoswap pool.
-        """
-        self.set_pool_state(pool_state_row)
-        # pylint: disable-next=protected-access
-        return self._pool._get_xcp(self._pool.D) / 10**18
+        return {"pool_value_virtual": pool_value_virtual, "pool_value": pool_value}
 
     def compute_annualized_returns(self, data):
         """Computes annualized returns from a series of pool values."""
@@ -520,6 +485,9 @@ class PriceDepth(PoolMetric):
     """
     Computes metrics indicating a pool's price (liquidity) depth. Generally, uses
     liquidity density, % change in reserves per % change in price.
+
+    Liquidity density is computed analytically from the slope of the pool's
+    price curve, so no trades are simulated.
     """
 
     @property
@@ -549,103 +517,110 @@ class PriceDepth(PoolMetric):
             },
         }
 
-        functions = {
-            SimCurvePool: self.get_stableswap_LD,
-            SimCurveMetaPool: self.get_stableswap_LD,
-            SimCurveRaiPool: self.get_stableswap_LD,
-            SimCurveCryptoPool: self.get_cryptoswap_LD,
-        }
-
         config = {}
-        for pool, fn in functions.items():
+        for pool in [
+            SimCurvePool,
+            SimCurveMetaPool,
+            SimCurveRaiPool,
+            SimCurveCryptoPool,
+        ]:
             config[pool] = deepcopy(base)
-            config[pool]["functions"]["metrics"] = fn
+            config[pool]["functions"]["metrics"] = self.get_LD
+            config[pool]["functions"]["update"] = self.get_LD_update
 
         return config
 
-    def get_stableswap_LD(self, **kwargs):
-        """
-        Computes liquidity density for each timestamp in an individual run.
-        Used for all Curve stableswap pools.
-        """
-        pool_state = kwargs["pool_state"]
-
-        def trade_size_function(coin_in):
-            x_per_dx = 10**8
-            return self._pool.asset_balances[coin_in] // x_per_dx
-
-        return self._get_LD(pool_state, trade_size_function)
-
-    def get_cryptoswap_LD(self, **kwargs):
+    def get_LD(self, **kwargs):
         """
         Computes liquidity density for each timestamp in an individual run.
-        Used for all Curve crpytoswap pools.
+        Used for any sim pool.
         """
         pool_state = kwargs["pool_state"]
 
-        extra_profit = self._pool.allowed_extra_profit  # disable price_scale updates
-        self._pool.allowed_extra_profit = inf
-
-        def trade_size_function(coin_in):
-            return self._pool.get_min_trade_size(coin_in)
-
-        LD = self._get_LD(pool_state, trade_size_function)
-        self._pool.allowed_extra_profit = extra_profit
-        return LD
+        LD = pool_state.apply(self._get_LD_by_row, axis=1)
+        return DataFrame(LD, columns=["liquidity_density"])
 
-    def _get_LD(self, pool_state, trade_size_function):
+    def get_LD_update(self, **kwargs):
         """
-        Computes liquidity density for each timestamp in an individual run.
+        Computes liquidity density from the live pool at a single timestamp.
         Used for any sim pool.
         """
-        coin_pairs = get_pairs(self._pool.coin_names)  # only meta assets for metapools
-
-        LD = pool_state.apply(
-            self._get_LD_by_row,
-            axis=1,
-            coin_pairs=coin_pairs,
-            trade_size_function=trade_size_function,
-        )
+        return {"liquidity_density": self._compute_LD()}
 
-        return DataFrame(LD, columns=["liquidity_density"])
-
-    def _get_LD_by_row(self, pool_state_row, coin_pairs, trade_size_function):
+    def _get_LD_by_row(self, pool_state_row):
         """
         Computes liquidity density for a single row of data (i.e., a single timestamp).
         Used for any sim pool.
         """
         self.set_pool_state(pool_state_row)
+        return self._compute_LD()
+
+    def _compute_LD(self):
+        """
+        Computes liquidity density for the pool's current state, averaged over
+        each coin pair in both directions.  Used for any sim pool.
+        """
         pool = self._pool
 
-        LD = []
-        for pair in coin_pairs:
-            amount_in = [trade_size_function(coin) for coin in pair]
-            LD_i = _compute_liquidity_density(pool, *pair, amount_in[0])
-            LD_j = _compute_liquidity_density(pool, *reversed(pair), amount_in[1])
-            LD += [LD_i, LD_j]
+        directed_pairs = []
+        for pair in get_pairs(pool.coin_names):  # only meta assets for metapools
+            directed_pairs += [tuple(pair), tuple(reversed(pair))]
+
+        LD = _compute_liquidity_density(pool, directed_pairs)
         return sum(LD) / len(LD)
 
 
-def _compute_liquidity_density(pool, coin_in, coin_out, amount_in):
+def _compute_liquidity_density(pool, pairs):
     """
-    Computes liquidity density for a single pair of coins.
+    Computes liquidity density for each (directed) pair of coins, at the pool's
+    current state.
     """
-    x_avg = pool.asset_balances[coin_in] + amount_in / 2
-    price_pre = pool.price(coin_in, coin_out, use_fee=False)
-    price_post = _post_trade_price(pool, coin_in, coin_out, amount_in)
-    LD = amount_in * (price_pre + price_post) / (2 * (price_pre - price_post) * x_avg)
-    return LD
+    prices = pool.prices(pairs, use_fee=False)
+    slopes = diagonal(pool.price_jacobian(pairs, use_fee=False))
+    balances = pool.asset_balances
+    return [
+        _liquidity_density(balances[coin_in], price, slope)
+        for (coin_in, _), price, slope in zip(pairs, prices, slopes)
+    ]
 
 
-def _post_trade_price(pool, coin_in, coin_out, amount_in, use_fee=False):
+def _liquidity_density(balance, price, slope):
     """
-    Computes price after executing a trade of size amount_in.
+    Returns the % change in the balance of the "in" coin per % change in price,
+    given the derivative of the price with respect to the amount traded in.
     """
-    with pool.use_snapshot_context():
-        pool.trade(coin_in, coin_out, amount_in)
-        price = pool.price(coin_in, coin_out, use_fee=use_fee)
+    return -price / (balance * slope)
+
 
-    return price
+def _sum_by_timestep(timesteps, length, amounts, prices, unpriced):
+    """
+    Returns the sum of the amounts (Python ints) at each of `length` timesteps,
+    each multiplied by its price unless `unpriced`, in units of 10**18.
+
+    The sums are the same as summing each timestep's values in order with
+    Python numbers: unpriced amounts are added exactly, as ints, until the first
+    priced amount of the timestep, and as floats afterwards.
+    """
+    values = amounts.astype(float)
+    if prices is not None:
+        values = where(unpriced, values, values * prices)
+
+    # Leading unpriced amounts of each timestep
+    n_priced = concatenate([[0], cumsum(~unpriced)])
+    starts = searchsorted(timesteps, timesteps)
+    leading = n_priced[1:] == n_priced[starts]
+
+    exact_sums = zeros(length, dtype=object)
+    add.at(exact_sums, timesteps[leading], amounts[leading])
+
+    weights = where(leading, 0.0, values)
+    first = leading & (starts == arange(len(timesteps)))
+    weights[first] = exact_sums[timesteps[first]].astype(float)
+    sums = bincount(timesteps, weights, minlength=length) / 10**18
+
+    exact = bincount(timesteps, ~unpriced, minlength=length) == 0
+    sums[exact] = (exact_sums[exact] / 10**18).astype(float)
+    return sums
 
 
 class Timestamp(Metric):
@@ -653,7 +628,9 @@ class Timestamp(Metric):
 
     @property
     def config(self):
-        return {"functions": {"metrics": self._get_timestamp}}
+        return {
+            "functions": {"metrics": self._get_timestamp, "inputs": ["price_sample"]}
+        }
 
     def _get_timestamp(self, **kwargs):
         price_sample = kwargs["price_sample"]
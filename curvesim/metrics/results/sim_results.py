@@ -105,7 +105,8 @@ class SimResults:
             If true, includes summary data in the plot.
 
         data : bool, default=True
-            If true, includes timeseries data in the plot.
+            If true, includes timeseries data in the plot. Skipped if there is
+            no timeseries data (e.g., if simulated with `data_per_trade=False`).
 
         save_as : str, optional
             Path to save plot output to. Typically an .html file. See
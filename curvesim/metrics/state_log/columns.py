@@ -0,0 +1,234 @@
+"""
+Preallocated, per-field storage of the values recorded by the `StateLog`, rows
+of captured pool state, and the flat table of executed trades.
+"""
+from dataclasses import fields, is_dataclass
+
+from numpy import array, empty
+from pandas import Categorical, DataFrame
+
+
+def make_columns(record, size, fixed_shape=True):
+    """
+    Returns a column for each field of a logged record (a dict or dataclass),
+    with room for `size` values.
+
+    If `fixed_shape` is True, the record's lists and dicts are assumed to keep
+    the same length and keys at every timestep, and are stored as 2D arrays.
+    Otherwise, each value is stored as a Python object.
+    """
+    columns = {}
+    for field, value in get_fields(record).items():
+        if not fixed_shape:
+            columns[field] = Column(size, object)
+        elif isinstance(value, list):
+            columns[field] = ListColumn(size, value)
+        elif isinstance(value, dict):
+            columns[field] = DictColumn(size, value)
+        else:
+            columns[field] = Column(size, _get_dtype([value]))
+    return columns
+
+
+def get_fields(record):
+    """Returns a logged record's fields as a dict."""
+    if is_dataclass(record):
+        return {field.name: getattr(record, field.name) for field in fields(record)}
+    return record
+
+
+def _get_dtype(values):
+    """
+    Returns the array dtype for a field's values: floats and bools are stored
+    natively, but ints may exceed 64 bits, so they (and all other values) are
+    stored as Python objects.
+    """
+    for dtype in (float, bool):
+        if all(type(value) is dtype for value in values):
+            return dtype
+    return object
+
+
+def to_lists(values):
+    """Returns the values as a list, with tuple values converted to lists."""
+    return [list(value) if isinstance(value, tuple) else value for value in values]
+
+
+class Column:
+    """Preallocated array of the values of a single logged field."""
+
+    __slots__ = ["data"]
+
+    def __init__(self, size, dtype):
+        self.data = empty(size, dtype=dtype)
+
+    def __setitem__(self, index, value):
+        self.data[index] = value
+
+    def resize(self, size):
+        """Grows the column to hold `size` values, keeping existing values."""
+        data = empty((size, *self.data.shape[1:]), dtype=self.data.dtype)
+        data[: len(self.data)] = self.data
+        self.data = data
+
+    def to_list(self, rows):
+        """Returns the values in `rows` (a slice or index array) as Python objects."""
+        return self.data[rows].tolist()
+
+
+class ListColumn(Column):
+    """Column of fixed-length lists, stored as a 2D array."""
+
+    __slots__ = []
+
+    def __init__(self, size, value):
+        super().__init__((size, len(value)), _get_dtype(value))
+
+
+class DictColumn(Column):
+    """Column of dicts with fixed keys, stored as a 2D array of their values."""
+
+    __slots__ = ["keys"]
+
+    def __init__(self, size, value):
+        self.keys = list(value)
+        super().__init__((size, len(value)), _get_dtype(value.values()))
+
+    def __setitem__(self, index, value):
+        self.data[index] = [value[key] for key in self.keys]
+
+    def to_list(self, rows):
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in self.data[rows].tolist()]
+
+
+class RecordColumns:
+    """
+    Columns of a logged record's fields, with the timestep at which each row was
+    recorded, growing as needed.
+    """
+
+    __slots__ = ["columns", "timesteps", "capacity"]
+
+    def __init__(self, record, size, fixed_shape=True):
+        self.columns = make_columns(record, size, fixed_shape)
+        self.timesteps = []
+        self.capacity = size
+
+    def __len__(self):
+        return len(self.timesteps)
+
+    def append(self, timestep, record):
+        """Records the values of the `timestep`-th timestep in a new row."""
+        index = len(self.timesteps)
+        if index == self.capacity:
+            self.capacity *= 2
+            for column in self.columns.values():
+                column.resize(self.capacity)
+
+        columns = self.columns
+        for field, value in get_fields(record).items():
+            columns[field][index] = value
+        self.timesteps.append(timestep)
+
+    def to_dict(self, rows=None):
+        """
+        Returns each field's values in `rows` (a slice or index array), or in
+        all rows by default.
+        """
+        if rows is None:
+            rows = slice(len(self))
+        return {field: column.to_list(rows) for field, column in self.columns.items()}
+
+
+class RecordRows:
+    """
+    Rows of a logged record's fields, each captured as a tuple, with the
+    timestep at which each row was recorded.
+
+    Appending a tuple is cheaper than writing each field into a preallocated
+    column, so this is used for records captured at every timestep.  List
+    values should be captured as tuples, which the garbage collector stops
+    tracking, and are returned as lists.
+    """
+
+    __slots__ = ["fields", "rows", "timesteps"]
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.rows = []
+        self.timesteps = []
+
+    def __len__(self):
+        return len(self.timesteps)
+
+    def append(self, timestep, row):
+        """Records the values of the `timestep`-th timestep, as a tuple."""
+        self.rows.append(row)
+        self.timesteps.append(timestep)
+
+    def to_dict(self, rows=None):
+        """
+        Returns each field's values in `rows` (a slice or index array), or in
+        all rows by default.
+        """
+        if rows is None:
+            selected = self.rows
+        elif isinstance(rows, slice):
+            selected = self.rows[rows]
+        else:
+            selected = [self.rows[i] for i in rows]
+        values = zip(*selected) if selected else [()] * len(self.fields)
+        return {field: to_lists(column) for field, column in zip(self.fields, values)}
+
+
+class TradeTable:
+    """
+    Flat table of the trades executed at every timestep, with coins stored as
+    their indices in the pool's `asset_names`.
+    """
+
+    __slots__ = ["coin_names", "coin_ids", "rows"]
+
+    def __init__(self, coin_names):
+        self.coin_names = list(coin_names)
+        self.coin_ids = {name: i for i, name in enumerate(self.coin_names)}
+        self.coin_ids.update({i: i for i in range(len(self.coin_names))})
+        self.rows = []
+
+    def append(self, timestep, trades):
+        """Records the trades executed at the `timestep`-th timestep."""
+        ids = self.coin_ids
+        self.rows.extend(
+            (
+                timestep,
+                ids[t.coin_in],
+                ids[t.coin_out],
+                t.amount_in,
+                t.amount_out,
+                t.fee,
+            )
+            for t in trades
+        )
+
+    def to_frame(self):
+        """
+        Returns the trades as a DataFrame with a row per trade, in order of
+        execution.  Coins are categoricals whose codes are the coin indices, and
+        amounts are Python ints, since they may exceed 64 bits.
+        """
+        columns = list(zip(*self.rows)) or [()] * 6
+        timestep, coin_in, coin_out, amount_in, amount_out, fee = columns
+        return DataFrame(
+            {
+                "timestep": array(timestep, dtype=int),
+                "coin_in": self._to_categorical(coin_in),
+                "coin_out": self._to_categorical(coin_out),
+                "amount_in": array(amount_in, dtype=object),
+                "amount_out": array(amount_out, dtype=object),
+                "fee": array(fee, dtype=object),
+            }
+        )
+
+    def _to_categorical(self, coin_ids):
+        return Categorical.from_codes(coin_ids, categories=self.coin_names)
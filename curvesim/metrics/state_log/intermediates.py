@@ -0,0 +1,141 @@
+"""
+Intermediate values derived from the state log data, which metrics can use as
+inputs.  Each intermediate is computed at most once per run and shared by all
+metrics that use it.
+"""
+from pandas import DataFrame, concat
+
+from curvesim.exceptions import UnregisteredPoolError
+from curvesim.metrics.base import get_numeraire, get_numeraire_prices
+from curvesim.pool.sim_interface import (
+    SimCurveCryptoPool,
+    SimCurveMetaPool,
+    SimCurvePool,
+    SimCurveRaiPool,
+)
+
+
+def get_intermediates(names, state_logs, pool):
+    """
+    Computes the named intermediates, and any intermediates they depend on,
+    from the state log data.
+
+    Parameters
+    ----------
+    names : iterable of str
+        Names of the intermediates to compute.
+    state_logs : dict
+        State log data returned by :func:`.StateLog.get_logs()`.
+    pool : :class:`~curvesim.templates.SimPool`
+        The simulated pool.
+
+    Returns
+    -------
+    dict
+        The computed intermediates, by name.
+    """
+    data = dict(state_logs)
+    intermediates = {}
+    for name in get_dependencies(names):
+        if name in intermediate_functions and name not in data:
+            data[name] = intermediate_functions[name](pool=pool, **data)
+            intermediates[name] = data[name]
+    return intermediates
+
+
+def get_dependencies(names):
+    """
+    Returns the named state log data and intermediates, and all data they
+    depend on, with each intermediate listed after its inputs.
+    """
+    ordered = []
+
+    def add_dependencies(name):
+        if name in ordered:
+            return
+        for input_name in intermediate_inputs.get(name, []):
+            add_dependencies(input_name)
+        ordered.append(name)
+
+    for name in names:
+        add_dependencies(name)
+    return ordered
+
+
+def get_prices(price_sample, **kwargs):
+    """
+    Returns the market price of each coin pair (columns) at each timestamp
+    (rows).
+    """
+    return DataFrame(price_sample.prices.to_list(), index=price_sample.index)
+
+
+def get_pool_numeraire_prices(prices, pool, **kwargs):
+    """
+    Returns the market price of each of the pool's assets (columns) at each
+    timestamp (rows), in the numeraire chosen from the assets by
+    :func:`~curvesim.metrics.base.get_numeraire`.
+    """
+    coin_names = pool.asset_names
+    return get_numeraire_prices(prices, coin_names, get_numeraire(coin_names))
+
+
+def get_reserves(pool_state, pool, **kwargs):
+    """
+    Returns the pool's reserves of each coin (columns) at each timestamp (rows).
+    Functions for each pool type are specified in the `reserves_functions` dict.
+    """
+    try:
+        return reserves_functions[type(pool)](pool_state, pool)
+    except KeyError as e:
+        raise UnregisteredPoolError(
+            f"Reserves getter not implemented for pool type '{type(pool)}'."
+        ) from e
+
+
+def get_pool_reserves(pool_state, pool):
+    """Returns reserves for non-meta pools."""
+    return DataFrame(
+        pool_state.balances.to_list(),
+        index=pool_state.index,
+        columns=pool.coin_names,
+    )
+
+
+def get_metapool_reserves(pool_state, pool):
+    """
+    Returns reserves for stableswap meta-pools.  The basepool LP token is
+    replaced by its share of the basepool's reserves.
+    """
+    max_coin = pool.max_coin
+
+    meta_reserves = get_pool_reserves(pool_state, pool)
+    base_reserves = DataFrame(
+        pool_state.balances_base.to_list(),
+        index=pool_state.index,
+        columns=pool.basepool.coin_names,
+    )
+
+    LP_token_proportion = meta_reserves.iloc[:, max_coin] / pool_state.tokens_base
+    base_reserves = base_reserves.mul(LP_token_proportion, axis=0)
+    return concat([meta_reserves.iloc[:, :max_coin], base_reserves], axis=1)
+
+
+intermediate_functions = {
+    "prices": get_prices,
+    "numeraire_prices": get_pool_numeraire_prices,
+    "reserves": get_reserves,
+}
+
+intermediate_inputs = {
+    "prices": ["price_sample"],
+    "numeraire_prices": ["prices"],
+    "reserves": ["pool_state"],
+}
+
+reserves_functions = {
+    SimCurvePool: get_pool_reserves,
+    SimCurveMetaPool: get_metapool_reserves,
+    SimCurveRaiPool: get_metapool_reserves,
+    SimCurveCryptoPool: get_pool_reserves,
+}
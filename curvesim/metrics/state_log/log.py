@@ -2,20 +2,53 @@
 Module to house the `StateLog`, a generic class to record changing pool states
 during simulations.
 """
-from pandas import DataFrame, concat
+from numpy import array, flatnonzero, isin, searchsorted
+from pandas import DataFrame, concat, to_datetime
 
 from curvesim.metrics.base import PoolMetric
 from curvesim.templates import Log
 from curvesim.utils import override
 
+from .columns import RecordColumns, RecordRows, TradeTable, get_fields
+from .intermediates import get_dependencies, get_intermediates, intermediate_functions
 from .pool_parameters import get_pool_parameters
-from .pool_state import get_pool_state
+from .pool_state import get_pool_state_capture
+
+# Number of timesteps to allocate for when the run length isn't given
+DEFAULT_LENGTH = 1024
+
+# Number of rows to initially allocate for data only recorded at sampled timesteps
+SAMPLED_LENGTH = 64
+
+# Records whose fields are stored as typed arrays, with fixed shapes
+FIXED_SHAPE_RECORDS = ("price_sample",)
 
 
 class StateLog(Log):
     """
     Logger that records simulation/pool state throughout each simulation run and
     computes metrics at the end of each run.
+
+    Each field of the logged records is stored in its own preallocated array,
+    which grows as needed if the run's length isn't known in advance.  Pool
+    state is captured as a tuple per timestep, by the function registered for
+    the pool's type (see :func:`.get_pool_state_capture`).
+
+    Executed trades are also recorded in a flat table, given to metrics as
+    "trades".
+
+    Metrics with an :func:`~.MetricBase.update_function` are computed from the
+    live pool at each timestep instead, and pool state or other data is only
+    recorded if a metric computed at the end of the run uses it.
+
+    Intermediate values derived from the log data (e.g., market prices or pool
+    reserves) that metrics list in their :func:`~.MetricBase.inputs` are
+    computed once at the end of each run and shared by those metrics.
+
+    Metrics with a sampling frequency (see :class:`~.MetricBase`) are only
+    computed at the first timestep of each period, and data only used by such
+    metrics is only recorded at those timesteps.  Trades are still priced at
+    the timestep they were executed at, and summed per period.
     """
 
     __slots__ = [
@@ -23,44 +56,215 @@ class StateLog(Log):
         "pool",
         "state_per_run",
         "state_per_trade",
+        "trades",
+        "updates",
+        "update_functions",
+        "inputs",
+        "intermediates",
+        "record_freqs",
+        "periods",
+        "samples",
+        "capture_pool_state",
+        "length",
+        "capacity",
+        "data_per_trade",
     ]
 
-    def __init__(self, pool, metrics):
+    def __init__(self, pool, metrics, length=None, data_per_trade=True):
+        """
+        Parameters
+        ----------
+        pool : :class:`~curvesim.templates.SimPool`
+            The pool to record the state of.
+        metrics : list of :class:`~curvesim.metrics.base.Metric`
+            Metrics to compute at the end of the run.
+        length : int, optional
+            Number of timesteps in the run, if known.
+        data_per_trade : bool or str, default=True
+            If False, per-timestamp metric data is discarded once it's
+            summarized, and :func:`compute_metrics` returns it without rows.  If
+            a fixed pandas frequency (e.g., "1D"), the data is downsampled to that
+            frequency (see :func:`downsample`).
+        """
         self.pool = pool
         self.metrics = prepare_metrics(metrics, pool)
         self.state_per_run = get_pool_parameters(pool)
-        self.state_per_trade = []
+        self.state_per_trade = {}
+        self.trades = TradeTable(pool.asset_names)
+        self.updates = {}
+        self.update_functions = get_update_functions(self.metrics)
+        self.inputs = get_inputs(self.metrics)
+        self.intermediates = plan_intermediates(self.metrics)
+        self.record_freqs = {"price_sample": [None]}
+        self.periods = dict.fromkeys(get_freqs(self.metrics))
+        self.samples = {freq: [] for freq in self.periods}
+        self.capture_pool_state = None
+        self.length = 0
+        self.capacity = length or DEFAULT_LENGTH
+        self.data_per_trade = data_per_trade
 
     @override
     def update(self, **kwargs):
-        """Records pool state and any keyword arguments provided."""
+        """
+        Records pool state and any keyword arguments provided, as needed by the
+        metrics, and computes metrics with update functions.
+        """
+        sampled = [None]
+        if self.periods:
+            sampled += self._sample(kwargs["price_sample"].timestamp)
+
+        if self._records("pool_state", sampled):
+            self._record_pool_state()
+
+        state = {key: val for key, val in kwargs.items() if self._records(key, sampled)}
+        if "trade_data" in kwargs and self._get_record_freqs("trades"):
+            trades = get_fields(kwargs["trade_data"])["trades"]
+            self.trades.append(self.length, trades)
+
+        for key, record in state.items():
+            if key not in self.state_per_trade:
+                size = self._get_size(self._get_record_freqs(key))
+                fixed_shape = key in FIXED_SHAPE_RECORDS
+                self.state_per_trade[key] = RecordColumns(record, size, fixed_shape)
+            self.state_per_trade[key].append(self.length, record)
 
-        self.state_per_trade.append({"pool_state": get_pool_state(self.pool), **kwargs})
+        for i, update_function in self.update_functions.items():
+            freq = self.metrics[i].freq
+            if freq not in sampled:
+                continue
+            record = update_function(pool=self.pool, **kwargs)
+            if i not in self.updates:
+                self.updates[i] = RecordColumns(record, self._get_size([freq]))
+            self.updates[i].append(self.length, record)
 
-    def get_logs(self):
-        """Returns the accumulated log data."""
+        self.length += 1
 
-        df = DataFrame(self.state_per_trade)
+    def _record_pool_state(self):
+        """Records the pool's state, captured as a tuple."""
+        if self.capture_pool_state is None:
+            fields, self.capture_pool_state = get_pool_state_capture(self.pool)
+            self.state_per_trade["pool_state"] = RecordRows(fields)
+        records = self.state_per_trade["pool_state"]
+        records.append(self.length, self.capture_pool_state(self.pool))
 
-        times = [state["price_sample"].timestamp for state in self.state_per_trade]
-        state_per_trade = {col: DataFrame(df[col].to_list(), index=times) for col in df}
+    def _sample(self, timestamp):
+        """
+        Returns the sampling frequencies for which the current timestep is the
+        first of a period, and records it as sampled.
+        """
+        sampled = []
+        timestamp = to_datetime(timestamp)
+        for freq, last_period in self.periods.items():
+            period = timestamp.floor(freq)
+            if period != last_period:
+                self.periods[freq] = period
+                self.samples[freq].append(self.length)
+                sampled.append(freq)
+        return sampled
 
-        return {
+    def _get_record_freqs(self, key):
+        """
+        Returns the sampling frequencies of the metrics that use the state log
+        data named `key` (with None for metrics computed at every timestep).
+        """
+        if key not in self.record_freqs:
+            self.record_freqs[key] = [
+                freq
+                for freq, inputs in self.inputs.items()
+                if inputs is None or key in inputs
+            ]
+        return self.record_freqs[key]
+
+    def _records(self, key, sampled):
+        """
+        Returns True if the state log data named `key` is needed by a metric
+        sampled at the current timestep.
+        """
+        return any(freq in sampled for freq in self._get_record_freqs(key))
+
+    def _get_size(self, freqs):
+        if None in freqs:
+            return self.capacity
+        return min(self.capacity, SAMPLED_LENGTH)
+
+    def get_logs(self, freq=None):
+        """
+        Returns the accumulated log data, and the intermediates computed from it
+        that are used by the metrics.
+
+        Parameters
+        ----------
+        freq : str, optional
+            If provided, only the data recorded at the timesteps sampled at this
+            frequency is returned, and each trade's "period" is the row of the
+            sampled timestep that started the period it was executed in.
+            Intermediates derived from market prices are still computed at
+            every timestep, so trades can be priced at their own "timestep".
+        """
+        timesteps = None if freq is None else self.samples[freq]
+
+        state_per_trade = {}
+        price_sample = None
+        if self.state_per_trade:
+            times = self.state_per_trade["price_sample"].columns["timestamp"]
+            times = times.to_list(slice(self.length))
+            for key, records in self.state_per_trade.items():
+                state_per_trade[key] = _to_frame(records, times, timesteps)
+            if timesteps is not None:
+                records = self.state_per_trade["price_sample"]
+                price_sample = _to_frame(records, times)
+
+        trades = {}
+        if self._get_record_freqs("trades"):
+            trades["trades"] = self.trades.to_frame()
+            periods = trades["trades"]["timestep"]
+            if timesteps is not None:
+                periods = searchsorted(timesteps, periods, side="right") - 1
+            trades["trades"]["period"] = periods
+
+        logs = {
             "pool_parameters": DataFrame(self.state_per_run, index=[0]),
             **state_per_trade,
+            **trades,
         }
+        data = logs if price_sample is None else {**logs, "price_sample": price_sample}
+        intermediates = self.intermediates.get(freq, [])
+        logs.update(get_intermediates(intermediates, data, self.pool))
+        return logs
+
+    def get_updates(self, i):
+        """
+        Returns the values recorded at each (sampled) timestep by the update
+        function of the `i`-th metric, or None if it doesn't have one.
+        """
+        if i not in self.updates:
+            return None
+        return DataFrame(self.updates[i].to_dict())
 
     @override
     def compute_metrics(self):
         """Computes metrics from the accumulated log data."""
 
-        state_logs = self.get_logs()
-        metric_data = [metric.compute(state_logs) for metric in self.metrics]
+        state_logs = {}
+        metric_data = []
+        for i, metric in enumerate(self.metrics):
+            if metric.freq not in state_logs:
+                state_logs[metric.freq] = self.get_logs(metric.freq)
+            data = metric.compute(state_logs[metric.freq], self.get_updates(i))
+            metric_data.append(data)
         data_per_trade, summary_data = tuple(zip(*metric_data))  # transpose tuple list
 
+        data_per_trade = concat(data_per_trade, axis=1)
+        if self.data_per_trade is False:
+            data_per_trade = data_per_trade.iloc[:0]
+        elif self.data_per_trade is not True:
+            data_per_trade = downsample(
+                data_per_trade, self.data_per_trade, self.metrics
+            )
+
         return (
-            state_logs["pool_parameters"],
-            concat(data_per_trade, axis=1),
+            DataFrame(self.state_per_run, index=[0]),
+            data_per_trade,
             concat(summary_data, axis=1),
         )
 
@@ -74,3 +278,84 @@ def prepare_metrics(metrics, pool):
         if isinstance(metric, PoolMetric):
             metric.set_pool(pool)
     return metrics
+
+
+def get_update_functions(metrics):
+    """Returns the update function of each metric that has one, by index."""
+    functions = {}
+    for i, metric in enumerate(metrics):
+        if metric.update_function:
+            functions[i] = metric.update_function
+    return functions
+
+
+def get_freqs(metrics):
+    """Returns the distinct sampling frequencies of the metrics, in order."""
+    freqs = [metric.freq for metric in metrics if metric.freq is not None]
+    return list(dict.fromkeys(freqs))
+
+
+def get_inputs(metrics):
+    """
+    Returns the names of the state log data (and intermediates) used by the
+    metrics computed at the end of each run, by the sampling frequency of those
+    metrics.  The names are None for a frequency if any of its metrics may use
+    all of the data.
+    """
+    inputs = {}
+    for metric in metrics:
+        if metric.update_function:
+            continue
+        if metric.inputs is None:
+            inputs[metric.freq] = None
+        elif inputs.setdefault(metric.freq, set()) is not None:
+            inputs[metric.freq].update(get_dependencies(metric.inputs))
+    return inputs
+
+
+def plan_intermediates(metrics):
+    """
+    Returns the names of the intermediates used by the metrics computed at the
+    end of each run, by the sampling frequency of those metrics.  Each name is
+    listed once per frequency, after the intermediates it depends on.
+    """
+    names = {}
+    for metric in metrics:
+        if not metric.update_function and metric.inputs:
+            names.setdefault(metric.freq, []).extend(metric.inputs)
+
+    return {
+        freq: [
+            name for name in get_dependencies(inputs) if name in intermediate_functions
+        ]
+        for freq, inputs in names.items()
+    }
+
+
+def downsample(data, freq, metrics):
+    """
+    Returns per-timestamp metric data resampled to a fixed pandas frequency,
+    using the "resample" rule in each sub-metric's plot config, or the first
+    value in each period for sub-metrics without one.
+    """
+    rules = dict.fromkeys(data.columns, "first")
+    for metric in metrics:
+        plot_config = metric.plot_config or {}
+        for name, config in plot_config.get("metrics", {}).items():
+            if name in rules and config.get("resample"):
+                rules[name] = config["resample"]
+    return data.resample(freq).agg(rules)
+
+
+def _to_frame(records, times, timesteps=None):
+    """
+    Returns the recorded rows as a DataFrame indexed by timestamp, only
+    including rows recorded at the given timesteps, if provided.
+    """
+    record_timesteps = array(records.timesteps, dtype=int)
+    if timesteps is None:
+        rows = slice(len(records))
+    else:
+        rows = flatnonzero(isin(record_timesteps, timesteps))
+    index = [times[timestep] for timestep in record_timesteps[rows].tolist()]
+    return DataFrame(records.to_dict(rows), index=index)
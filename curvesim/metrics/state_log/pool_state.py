@@ -6,60 +6,116 @@ from curvesim.pool.sim_interface import (
     SimCurveRaiPool,
 )
 
+from .columns import to_lists
+
 
 def get_pool_state(pool):
     """
-    Returns pool state for the input pool. Functions for each pool type are
-    specified in the `pool_state_functions` dict. Each function returns the
-    values necessary to reconstruct pool state throughout a simulation run.
+    Returns pool state for the input pool. The recorded fields and the function
+    capturing them are specified for each pool type in the `pool_state_captures`
+    dict, and are the values necessary to reconstruct pool state throughout a
+    simulation run.
+
+    The pool's "virtual_value" (`D` for stableswap pools, `xcp` for cryptoswap
+    pools) is also recorded, so metrics needn't reconstruct the pool state to
+    compute it.
+    """
+    fields, capture = get_pool_state_capture(pool)
+    return dict(zip(fields, to_lists(capture(pool))))
+
+
+def get_pool_state_capture(pool):
+    """
+    Returns the pool state fields for the pool's type, and the function that
+    captures their values as a tuple, as specified in the `pool_state_captures`
+    dict.
+
+    List values (e.g., balances) are captured as tuples, so the captured state
+    holds no mutable objects and needn't be tracked by the garbage collector.
     """
     try:
-        return pool_state_functions[type(pool)](pool)
+        return pool_state_captures[type(pool)]
     except KeyError as e:
         raise UnregisteredPoolError(
             f"State getter not implemented for pool type '{type(pool)}'."
         ) from e
 
 
-def get_cryptoswap_pool_state(pool):
-    """Returns pool state for stableswap non-meta pools."""
-    return {
-        "D": pool.D,
-        "balances": pool.balances.copy(),
-        "tokens": pool.tokens,
-        "price_scale": pool.price_scale.copy(),
-        "_price_oracle": pool._price_oracle.copy(),  # pylint: disable=protected-access
-        "xcp_profit": pool.xcp_profit,
-        "xcp_profit_a": pool.xcp_profit_a,
-        "last_prices": pool.last_prices.copy(),
-        "last_prices_timestamp": pool.last_prices_timestamp,
-        "_block_timestamp": pool._block_timestamp,  # pylint: disable=protected-access
-        "not_adjusted": pool.not_adjusted,
-        "virtual_price": pool.virtual_price,
-    }
-
-
-def get_stableswap_pool_state(pool):
-    """Returns pool state for stableswap non-meta pools."""
-    return {
-        "balances": pool.balances.copy(),
-        "tokens": pool.tokens,
-        "admin_balances": pool.admin_balances.copy(),
-    }
+def capture_cryptoswap_pool_state(pool):
+    """Returns pool state for cryptoswap non-meta pools."""
+    # pylint: disable=protected-access
+    return (
+        pool.D,
+        tuple(pool.balances),
+        pool.tokens,
+        tuple(pool.price_scale),
+        tuple(pool._price_oracle),
+        pool.xcp_profit,
+        pool.xcp_profit_a,
+        tuple(pool.last_prices),
+        pool.last_prices_timestamp,
+        pool._block_timestamp,
+        pool.not_adjusted,
+        pool.virtual_price,
+        pool._get_xcp(pool.D),
+    )
 
 
-def get_stableswap_metapool_state(pool):
+def capture_stableswap_pool_state(pool):
     """Returns pool state for stableswap non-meta pools."""
-    state = get_stableswap_pool_state(pool)
-    bp_state = get_stableswap_pool_state(pool.basepool)
-    bp_state = {key + "_base": val for key, val in bp_state.items()}
-    state.update(bp_state)
-    return state
-
-
-pool_state_functions = {
-    SimCurvePool: get_stableswap_pool_state,
-    SimCurveMetaPool: get_stableswap_metapool_state,
-    SimCurveRaiPool: get_stableswap_metapool_state,
-    SimCurveCryptoPool: get_cryptoswap_pool_state,
+    return (
+        tuple(pool.balances),
+        pool.tokens,
+        tuple(pool.admin_balances),
+        pool.D(),
+    )
+
+
+def capture_stableswap_metapool_state(pool):
+    """Returns pool state for stableswap meta-pools."""
+    basepool = pool.basepool
+    return (
+        tuple(pool.balances),
+        pool.tokens,
+        tuple(pool.admin_balances),
+        tuple(basepool.balances),
+        basepool.tokens,
+        tuple(basepool.admin_balances),
+        pool.D(),
+    )
+
+
+CRYPTOSWAP_POOL_STATE = (
+    "D",
+    "balances",
+    "tokens",
+    "price_scale",
+    "_price_oracle",
+    "xcp_profit",
+    "xcp_profit_a",
+    "last_prices",
+    "last_prices_timestamp",
+    "_block_timestamp",
+    "not_adjusted",
+    "virtual_price",
+    "virtual_value",
+)
+
+STABLESWAP_POOL_STATE = ("balances", "tokens", "admin_balances", "virtual_value")
+
+STABLESWAP_METAPOOL_STATE = (
+    "balances",
+    "tokens",
+    "admin_balances",
+    "balances_base",
+    "tokens_base",
+    "admin_balances_base",
+    "virtual_value",
+)
+
+pool_state_captures = {
+    SimCurvePool: (STABLESWAP_POOL_STATE, capture_stableswap_pool_state),
+    SimCurveMetaPool: (STABLESWAP_METAPOOL_STATE, capture_stableswap_metapool_state),
+    SimCurveRaiPool: (STABLESWAP_METAPOOL_STATE, capture_stableswap_metapool_state),
+    SimCurveCryptoPool: (CRYPTOSWAP_POOL_STATE, capture_cryptoswap_pool_state),
 }
@@ -15,18 +15,16 @@ pool data such as :class:`~curvesim.pool_data.metadata.PoolMetaDataInterface`;
 instantiates a param_sampler, price_sampler, and strategy; and invokes `run_pipeline`,
 returning its result metrics.
 """
-from multiprocessing import Pool as cpu_pool
+from curvesim.logging import get_logger
 
-from curvesim.logging import (
-    configure_multiprocess_logging,
-    get_logger,
-    multiprocessing_logging_queue,
-)
+from .executors import ProcessExecutor, SerialExecutor
 
 logger = get_logger(__name__)
 
 
-def run_pipeline(param_sampler, price_sampler, strategy, ncpu=4):
+def run_pipeline(
+    param_sampler, price_sampler, strategy, ncpu=4, scheduler=None, executor=None
+):
     """
     Core function for running pipelines.
 
@@ -46,7 +44,18 @@ def run_pipeline(param_sampler, price_sampler, strategy, ncpu=4):
         A function dictating what happens at each timestep.
 
     ncpu : int, default=4
-        Number of cores to use.
+        Number of cores to use.  Ignored if `executor` is provided.
+
+    scheduler : :class:`~curvesim.pipelines.scheduling.TaskScheduler`, optional
+        Scheduler that orders runs by estimated cost when `ncpu` > 1.  Pass the
+        same scheduler to later calls to reuse its learned cost estimates and
+        inspect its :attr:`utilization` after the run.  Ignored if `executor`
+        is provided.
+
+    executor : :class:`~curvesim.templates.Executor`, optional
+        Executor used to run the simulations (see :mod:`.executors`).  Defaults
+        to a :class:`.ProcessExecutor` if `ncpu` > 1, or a :class:`.SerialExecutor`
+        otherwise.
 
     Returns
     -------
@@ -54,40 +63,16 @@ def run_pipeline(param_sampler, price_sampler, strategy, ncpu=4):
         Contains the metrics produced by the strategy.
 
     """
-    if ncpu > 1:
-        with multiprocessing_logging_queue() as logging_queue:
-            strategy_args_list = [
-                (pool, params, price_sampler) for pool, params in param_sampler
-            ]
-
-            wrapped_args_list = [
-                (strategy, logging_queue, *args) for args in strategy_args_list
-            ]
-
-            with cpu_pool(ncpu) as clust:
-                results = tuple(
-                    zip(*clust.starmap(wrapped_strategy, wrapped_args_list))
-                )
-                clust.close()
-                clust.join()  # coverage needs this
+    if executor is not None:
+        results = executor.run(strategy, param_sampler, price_sampler)
 
     else:
-        results = []
-        for pool, params in param_sampler:
-            metrics = strategy(pool, params, price_sampler)
-            results.append(metrics)
-        results = tuple(zip(*results))
-
-    return results
+        if ncpu > 1:
+            executor = ProcessExecutor(ncpu, scheduler)
+        else:
+            executor = SerialExecutor(scheduler)
 
+        with executor:
+            results = executor.run(strategy, param_sampler, price_sampler)
 
-def wrapped_strategy(strategy, logging_queue, *args):
-    """
-    This wrapper ensures we configure logging to use the
-    multiprocessing enqueueing logic within the new process.
-
-    Must be defined at the top-level of the module so it can
-    be pickled.
-    """
-    configure_multiprocess_logging(logging_queue)
-    return strategy(*args)
+    return tuple(zip(*results))
@@ -1,18 +1,29 @@
 """
 Contains variables and functions common to the arbitrage pipelines.
 """
-__all__ = ["DEFAULT_METRICS", "get_arb_trades", "get_asset_data", "get_pool_data"]
+__all__ = [
+    "DEFAULT_METRICS",
+    "ArbSolverState",
+    "get_arb_trades",
+    "get_asset_data",
+    "get_pool_data",
+]
 
-from scipy.optimize import root_scalar
+from collections import Counter
 
 from curvesim.logging import get_logger
 from curvesim.metrics import metrics as Metrics
 from curvesim.templates.trader import ArbTrade
 
+from .arb_solver import ArbSolverState, solve_arb_size
 from .get_asset_data import get_asset_data
 from .get_pool_data import get_pool_data
 
 logger = get_logger(__name__)
+
+# Upper bound of warm-started solves, as a multiple of the last solution
+WARM_BRACKET_SCALE = 2
+
 DEFAULT_METRICS = [
     Metrics.Timestamp,
     Metrics.PoolValue,
@@ -23,7 +34,16 @@ DEFAULT_METRICS = [
 ]
 
 
-def get_arb_trades(pool, prices):
+# pylint: disable-next=too-many-arguments,too-many-locals
+def get_arb_trades(
+    pool,
+    prices,
+    stats=None,
+    method="newton",
+    solver_state=None,
+    executor=None,
+    outcomes=None,
+):
     """
     Returns triples of "trades", one for each coin pair in `combo`.
 
@@ -38,6 +58,33 @@ def get_arb_trades(pool, prices):
     prices : iterable
         External market prices for each coin-pair
 
+    stats : collections.Counter, optional
+        If provided, the number of solves ("arb_solves") and trade simulations
+        ("arb_evaluations") are added to it, along with the number of
+        warm-started solves ("arb_warm_starts") and those that fell back to the
+        full bracket ("arb_warm_start_fallbacks").  Pairs skipped because the
+        market price is within the pool's bid/ask band (only for pools where
+        :attr:`~.SimPool.fee_band_is_exact`) are counted in "arb_band_skips",
+        and calls where all pairs were skipped in "arb_skipped_timesteps".
+
+    method : str, default="newton"
+        Trade size solver method (see :func:`.solve_arb_size`).
+
+    solver_state : :class:`.ArbSolverState`, optional
+        If provided, each pair's solve is warm-started from its last solution,
+        which is then updated.
+
+    executor : concurrent.futures.Executor, optional
+        If provided, pairs are solved concurrently, each on a clone of the pool
+        (see :meth:`.SnapshotMixin.clone`), kept in `solver_state` if given.
+        Solves are independent, so the trades are the same as when solved in
+        turn.
+
+    outcomes : dict, optional
+        If provided, the outcome of each trade that was simulated at its final
+        size while solving is added to it, as `(amount_out, fee, price)` keyed
+        by (coin_in, coin_out), where `price` is the post-trade price with fees.
+
 
     Returns
     -------
@@ -48,65 +95,198 @@ def get_arb_trades(pool, prices):
         "price_target": price target for arbing the token pair
     """
 
-    def post_trade_price_error(dx, coin_in, coin_out, price_target):
-        with pool.use_snapshot_context():
-            dx = int(dx)
-            if dx > 0:
-                pool.trade(coin_in, coin_out, dx)
-            price = pool.price(coin_in, coin_out, use_fee=True)
-
-        return price - price_target
+    counts = Counter()
+    last_solutions = {} if solver_state is None else solver_state.solutions
+    skip_band = pool.fee_band_is_exact
 
-    trades = []
+    # Pool prices in both directions for all pairs, from one pool evaluation
+    pairs = list(prices)
+    reversed_pairs = [(j, i) for i, j in pairs]
+    pool_prices = pool.prices(pairs + reversed_pairs, use_fee=True)
 
-    for pair in prices:
-        coin_in, coin_out, target_price = _get_arb_direction(pair, pool, prices[pair])
-
-        lower_bound = pool.get_min_trade_size(coin_in)
-        profit_per_unit = post_trade_price_error(
-            lower_bound, coin_in, coin_out, target_price
+    arbs = []
+    solves = []
+    for k, pair in enumerate(pairs):
+        pool_price_pair = pool_prices[k], pool_prices[k + len(pairs)]
+        coin_in, coin_out, target_price, spot_error = _get_arb_direction(
+            pair, pool_price_pair, prices[pair]
         )
-        if profit_per_unit <= 0:
-            trades.append(ArbTrade(coin_in, coin_out, 0, target_price))
+        arb = (coin_in, coin_out, target_price)
+        last = last_solutions.pop((coin_in, coin_out), None)
+        arbs.append(arb)
+
+        # Market price is within the pool's bid/ask band, so no trade is profitable
+        if skip_band and spot_error <= 0:
+            counts["arb_band_skips"] += 1
             continue
 
-        upper_bound = pool.get_max_trade_size(coin_in, coin_out)
-        try:
-            res = root_scalar(
-                post_trade_price_error,
-                args=(coin_in, coin_out, target_price),
-                bracket=(lower_bound, upper_bound),
-                method="brentq",
-            )
-            size = int(res.root)
-        except ValueError:
-            pool_price = pool.price(coin_in, coin_out)
-            logger.error(
-                "Opt_arb error: Pair: (%s, %s), Pool price: %s,"
-                "Target Price: %s, Diff: %s",
-                coin_in,
-                coin_out,
-                pool_price,
-                target_price,
-                pool_price - target_price,
-            )
-            size = 0
-
-        trades.append(ArbTrade(coin_in, coin_out, size, target_price))
+        solves.append((k, arb, last))
+
+    if executor is None:
+        results = [
+            _get_arb_size(pool, arb, method, last, counts) for _, arb, last in solves
+        ]
+    else:
+        clones = _get_pool_clones(pool, len(solves), solver_state)
+        futures = [
+            executor.submit(_get_arb_size_on_clone, clone, arb, method, last)
+            for clone, (_, arb, last) in zip(clones, solves)
+        ]
+        results = []
+        for future in futures:
+            *result, solve_counts = future.result()
+            results.append(result)
+            counts.update(solve_counts)
+
+    sizes = [0] * len(arbs)
+    for (k, arb, _), (size, profit_per_unit, outcome) in zip(solves, results):
+        if size > 0:
+            last_solutions[arb[:2]] = (size, profit_per_unit)
+        if outcome is not None and outcomes is not None:
+            outcomes[arb[:2]] = outcome
+        sizes[k] = size
+
+    trades = [ArbTrade(*arb[:2], size, arb[2]) for arb, size in zip(arbs, sizes)]
+
+    if stats is not None:
+        if trades and counts["arb_band_skips"] == len(trades):
+            counts["arb_skipped_timesteps"] += 1
+        stats.update(counts)
 
     return trades
 
 
-def _get_arb_direction(pair, pool, market_price):
+def _get_pool_clones(pool, n, solver_state):
+    """
+    Returns `n` clones of the pool in its current state, reusing and updating
+    those kept in `solver_state`.
+    """
+    clones = [] if solver_state is None else solver_state.clones
+    for clone in clones[:n]:
+        pool.update_clone(clone)
+    clones.extend(pool.clone() for _ in range(n - len(clones)))
+    return clones[:n]
+
+
+def _get_arb_size_on_clone(pool, arb, method, last):
+    """
+    Returns the size of an arbitrage trade, as :func:`_get_arb_size`, with its
+    solver counts, for solves on pool clones in another thread or process.
+    """
+    counts = Counter()
+    return (*_get_arb_size(pool, arb, method, last, counts), counts)
+
+
+def _get_arb_size(pool, arb, method, last, counts):
+    """
+    Returns the size of an arbitrage trade `arb` (coin_in, coin_out,
+    price_target), or 0 if unprofitable, the profit per unit of the smallest
+    trade, and the outcome of the trade if the solver simulated it.
+    """
+    coin_in, coin_out, target_price = arb
+
+    lower_bound = pool.get_min_trade_size(coin_in)
+    profit_per_unit = _post_trade_price_error(pool, lower_bound, *arb)
+    counts["arb_evaluations"] += 1
+    if profit_per_unit <= 0:
+        return 0, profit_per_unit, None
+
+    upper_bound = pool.get_max_trade_size(coin_in, coin_out)
+    counts["arb_solves"] += 1
+    outcomes = {}
+    try:
+        size = _solve_arb_size(
+            pool,
+            arb,
+            (lower_bound, upper_bound),
+            profit_per_unit,
+            method,
+            last,
+            counts,
+            outcomes,
+        )
+    except ValueError:
+        pool_price = pool.price(coin_in, coin_out)
+        logger.error(
+            "Opt_arb error: Pair: (%s, %s), Pool price: %s,"
+            "Target Price: %s, Diff: %s",
+            coin_in,
+            coin_out,
+            pool_price,
+            target_price,
+            pool_price - target_price,
+        )
+        return 0, profit_per_unit, None
+
+    size = int(size)
+    return size, profit_per_unit, outcomes.get(size)
+
+
+def _post_trade_price_error(pool, dx, coin_in, coin_out, price_target):
+    with pool.use_snapshot_context():
+        dx = int(dx)
+        if dx > 0:
+            pool.trade(coin_in, coin_out, dx)
+        price = pool.price(coin_in, coin_out, use_fee=True)
+
+    return price - price_target
+
+
+# pylint: disable-next=too-many-arguments
+def _solve_arb_size(pool, arb, bracket, error_at_lower, method, last, counts, outcomes):
+    """
+    Solves for the size of an arbitrage trade `arb` (coin_in, coin_out,
+    price_target), warm-started from the `last` solution for the pair, if any.
+    """
+    kwargs = {"stats": counts, "outcomes": outcomes}
+    if last is None:
+        return solve_arb_size(pool, *arb, bracket, error_at_lower, method, **kwargs)
+
+    # Scale the last size by the change in price error, i.e. reuse its average
+    # slope over the trade
+    last_size, last_error = last
+    x0 = last_size * error_at_lower / last_error
+    counts["arb_warm_starts"] += 1
+
+    if method == "newton":
+        return solve_arb_size(pool, *arb, bracket, error_at_lower, method, x0, **kwargs)
+
+    # Other methods only use the bracket, so narrow it around the initial guess
+    lower, upper = bracket
+    warm_bracket = (lower, min(upper, WARM_BRACKET_SCALE * x0))
+    try:
+        return solve_arb_size(
+            pool, *arb, warm_bracket, error_at_lower, method, **kwargs
+        )
+    except ValueError:
+        counts["arb_warm_start_fallbacks"] += 1
+
+    return solve_arb_size(pool, *arb, bracket, error_at_lower, method, **kwargs)
+
+
+def _get_arb_direction(pair, pool_prices, market_price):
+    """
+    Returns the coins and price target of the more profitable direction to
+    arbitrage `pair`, and the error of the pool's spot price (with fees) in that
+    direction.
+
+    `pool_prices` are the pool's spot prices (with fees) of `pair` and its
+    reverse, which give the pool's bid/ask band, so a non-positive error means
+    the market price is within it.  Unless :attr:`~.SimPool.fee_band_is_exact`,
+    a trade may still be profitable, e.g. if the pool's fee or price scale
+    changes with the trade.
+    """
     i, j = pair
-    price_error_i = pool.price(i, j) - market_price
-    price_error_j = pool.price(j, i) - 1 / market_price
+    price_error_i = pool_prices[0] - market_price
+    price_error_j = pool_prices[1] - 1 / market_price
 
     if price_error_i >= price_error_j:
         target_price = market_price
         coin_in, coin_out = i, j
+        price_error = price_error_i
     else:
         target_price = 1 / market_price
         coin_in, coin_out = j, i
+        price_error = price_error_j
 
-    return coin_in, coin_out, target_price
+    return coin_in, coin_out, target_price, price_error
@@ -0,0 +1,262 @@
+"""
+Solver for the size of a single-pair arbitrage trade.
+"""
+
+__all__ = ["ArbSolverState", "solve_arb_size"]
+
+from dataclasses import field
+
+from numpy import finfo
+from scipy.optimize import brentq
+
+from curvesim.utils import dataclass
+
+# Tolerances match scipy's brentq defaults
+XTOL = 2e-12
+RTOL = 4 * finfo(float).eps
+MAX_ITER = 50
+
+# Relative price error below which Newton iterations stop; smaller errors are
+# within the precision of the pools' fixed-point math
+FTOL = 1e-11
+
+# Relative distance between iterates below which secant slopes are used
+SECANT_THRESHOLD = 0.01
+
+
+@dataclass(slots=True)
+class ArbSolverState:
+    """
+    Solver state carried between timesteps to warm-start arbitrage solves.
+
+    Attributes
+    ----------
+    solutions : dict
+        Last trade size solved for each (coin_in, coin_out) pair, with the
+        price error at the lower bound of its bracket.
+
+    jacobians : dict
+        Last Jacobian of the multi-pair optimizer, keyed by the tuple of coin
+        pairs it was computed for.
+
+    clones : list
+        Pool clones reused for concurrent solves (see :func:`.get_arb_trades`).
+    """
+
+    solutions: dict = field(default_factory=dict)
+    jacobians: dict = field(default_factory=dict)
+    clones: list = field(default_factory=list)
+
+
+class _PriceError:
+    """
+    Post-trade price error as a function of trade size, counting evaluations.
+
+    Each evaluation simulates the trade under a pool snapshot.  If `outcomes`
+    is given, the outcome of each simulated trade is recorded in it (see
+    :func:`solve_arb_size`).
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(self, pool, coin_in, coin_out, price_target, outcomes=None):
+        self.pool = pool
+        self.coin_in = coin_in
+        self.coin_out = coin_out
+        self.price_target = price_target
+        self.outcomes = outcomes
+        self.evaluations = 0
+
+    def __call__(self, dx, with_slope=False):
+        self.evaluations += 1
+
+        pool = self.pool
+        with pool.use_snapshot_context():
+            dx = int(dx)
+            if dx > 0:
+                amount_out, fee = pool.trade(self.coin_in, self.coin_out, dx)
+            price = pool.price(self.coin_in, self.coin_out, use_fee=True)
+            error = price - self.price_target
+
+            if self.outcomes is not None and dx > 0:
+                self.outcomes[dx] = (amount_out, fee, price)
+
+            if with_slope:
+                return error, pool.price_slope(self.coin_in, self.coin_out)
+
+        return error
+
+
+# pylint: disable-next=too-many-arguments
+def solve_arb_size(
+    pool,
+    coin_in,
+    coin_out,
+    price_target,
+    bracket,
+    error_at_lower,
+    method="newton",
+    x0=None,
+    stats=None,
+    outcomes=None,
+):
+    """
+    Returns the trade size that moves the pool's post-trade price to the target.
+
+    The post-trade price is monotonically decreasing in the trade size, so the
+    solution is bracketed by `bracket`, with a positive price error at the lower
+    bound.
+
+    The "newton" method starts from the pool's estimate of the trade size (see
+    :meth:`.SimPool.estimate_trade_size`), if any, else a Newton step from the
+    lower bound or the initial guess `x0`.  It then takes Newton steps using the
+    pool's analytic price slopes (see :meth:`.SimPool.price_slope`), or secant
+    steps if the pool doesn't provide them, falling back to bisection whenever a
+    step leaves the current bracket.  Without a starting point, the solution is
+    found with brentq.
+
+    Parameters
+    ----------
+    pool : :class:`~curvesim.templates.SimPool`
+        Pool to arbitrage on.
+
+    coin_in : str, int
+        ID of "in" coin.
+
+    coin_out : str, int
+        ID of "out" coin.
+
+    price_target : float
+        Target post-trade price of `coin_in` quoted in `coin_out`, with fees.
+
+    bracket : tuple of int
+        Lower and upper bounds on the trade size.
+
+    error_at_lower : float
+        Post-trade price error at the lower bound.  Must be positive.
+
+    method : str, default="newton"
+        "newton" or "brentq".
+
+    x0 : float, optional
+        Initial guess for the "newton" method, used if the pool provides no
+        estimate or price slope, e.g. from the previous timestep's solution.
+
+    stats : collections.Counter, optional
+        If provided, the number of trades simulated is added to its
+        "arb_evaluations" count, including on failure.
+
+    outcomes : dict, optional
+        If provided, the outcome of each trade simulated by the solver is added
+        to it, as `(amount_out, fee, price)` keyed by the integer trade size,
+        where `price` is the post-trade price with fees.  The outcome at the
+        returned size can then be reused instead of simulating the trade again.
+
+    Returns
+    -------
+    float
+        The trade size.
+
+    Raises
+    ------
+    ValueError
+        If the price error doesn't change sign within the bracket.
+    """
+    price_error = _PriceError(pool, coin_in, coin_out, price_target, outcomes)
+    try:
+        return _solve(price_error, bracket, error_at_lower, method, x0)
+    finally:
+        if stats is not None:
+            stats["arb_evaluations"] += price_error.evaluations
+
+
+def _solve(price_error, bracket, error_at_lower, method, x0):
+    """Solves for the root of `price_error`; see :func:`solve_arb_size`."""
+    pool = price_error.pool
+    coin_in = price_error.coin_in
+    coin_out = price_error.coin_out
+    lower, upper = bracket
+
+    x = None
+    slope = None
+    if method == "newton":
+        slope = pool.price_slope(coin_in, coin_out)
+        x = pool.estimate_trade_size(coin_in, coin_out, price_error.price_target)
+        if x is None and slope:
+            x = lower - error_at_lower / slope
+        if x is None:
+            x = x0
+
+    if x is None:
+        return brentq(price_error, lower, upper, xtol=XTOL, rtol=RTOL)
+
+    return _newton(price_error, x, lower, upper, error_at_lower, slope is not None)
+
+
+# pylint: disable-next=too-many-arguments
+def _newton(price_error, x, lower, upper, error_at_lower, use_slope):
+    """
+    Safeguarded Newton (or secant) iteration within the bracket [lower, upper].
+    """
+    ftol = FTOL * abs(price_error.price_target)
+    upper_checked = False
+    prev = (lower, error_at_lower)
+
+    for _ in range(MAX_ITER):
+        if not lower < x < upper:
+            if x >= upper and not upper_checked:
+                _check_upper(price_error, upper)
+                upper_checked = True
+            x = (lower + upper) / 2
+
+        if use_slope:
+            error, slope = price_error(x, with_slope=True)
+        else:
+            error, slope = price_error(x), None
+
+        if abs(error) <= ftol:
+            return x
+
+        if error > 0:
+            lower = x
+        else:
+            upper = x
+            upper_checked = True
+
+        x_next = _step(x, error, slope, *prev)
+        if x_next is None:
+            x_next = (lower + upper) / 2
+        prev = (x, error)
+
+        tol = XTOL + RTOL * abs(x_next)
+        if upper - lower <= tol:
+            return (lower + upper) / 2
+
+        if abs(x_next - x) <= tol and lower <= x_next <= upper:
+            return x_next
+
+        x = x_next
+
+    return brentq(price_error, lower, upper, xtol=XTOL, rtol=RTOL)
+
+
+# pylint: disable-next=too-many-arguments
+def _step(x, error, slope, x_prev, error_prev):
+    """
+    Returns the next Newton iterate, or None if there is no usable slope.
+
+    Analytic slopes hold the pool's invariant fixed, so once iterates are close
+    together, secant slopes (which reflect the full trade) are used instead.
+    """
+    if slope is None or abs(x - x_prev) < SECANT_THRESHOLD * x:
+        if error != error_prev:
+            slope = (error - error_prev) / (x - x_prev)
+
+    if not slope:
+        return None
+    return x - error / slope
+
+
+def _check_upper(price_error, upper):
+    """Raises ValueError, as brentq does, if the upper bound isn't a valid bound."""
+    if price_error(upper) > 0:
+        raise ValueError("f(a) and f(b) must have different signs")
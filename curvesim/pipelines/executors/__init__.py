@@ -0,0 +1,20 @@
+"""
+Executors control where and how the simulation runs in a pipeline are executed.
+
+:class:`SerialExecutor`, :class:`ThreadExecutor`, and :class:`ProcessExecutor`
+run simulations on the local machine, while :class:`DistributedExecutor`
+distributes them across multiple machines.  Any executor can be passed to
+:func:`~curvesim.pipelines.run_pipeline`.
+"""
+
+__all__ = [
+    "DistributedExecutor",
+    "ProcessExecutor",
+    "SerialExecutor",
+    "ThreadExecutor",
+    "run_node",
+]
+
+from .distributed import DistributedExecutor, run_node
+from .local import ProcessExecutor, SerialExecutor
+from .threads import ThreadExecutor
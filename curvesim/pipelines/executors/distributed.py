@@ -0,0 +1,490 @@
+"""
+Executor that distributes simulation runs across multiple machines.
+
+The :class:`DistributedExecutor` serves a task queue and a result queue over TCP
+using :mod:`multiprocessing.managers`.  Each machine runs a node (see
+:func:`run_node`) that connects to the executor, pulls tasks, and runs them in a
+local process pool.
+
+The strategy, price data, and pool template are shipped to each node once per
+job; tasks only contain pool parameters.  Results are returned as compressed
+pickles.  Nodes send periodic heartbeats, and tasks held by nodes that stop
+responding, or taken by nodes that never started them, are retried on other
+nodes.
+
+Nodes can be started on remote machines with:
+
+.. code-block::
+
+    python -m curvesim.pipelines.executors.distributed HOST PORT --authkey KEY
+"""
+
+__all__ = ["DistributedExecutor", "run_node"]
+
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import socket
+import tempfile
+import threading
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing.managers import BaseManager, DictProxy
+from uuid import uuid4
+
+from curvesim.exceptions import ExecutorError
+from curvesim.logging import get_logger
+from curvesim.templates import Executor
+from curvesim.utils import override
+
+from .tasks import make_tasks, pack, run_packed_task, unpack
+
+logger = get_logger(__name__)
+
+_server_state = {}
+
+
+def _get_task_queue():
+    return _server_state.setdefault("tasks", queue.Queue())
+
+
+def _get_result_queue():
+    return _server_state.setdefault("results", queue.Queue())
+
+
+def _get_jobs():
+    return _server_state.setdefault("jobs", {})
+
+
+def _get_control():
+    return _server_state.setdefault("control", {})
+
+
+class _CoordinatorManager(BaseManager):
+    """Manager serving the task/result queues and job contexts."""
+
+
+_CoordinatorManager.register("tasks", callable=_get_task_queue)
+_CoordinatorManager.register("results", callable=_get_result_queue)
+_CoordinatorManager.register("jobs", callable=_get_jobs, proxytype=DictProxy)
+_CoordinatorManager.register("control", callable=_get_control, proxytype=DictProxy)
+
+
+class _NodeManager(BaseManager):
+    """Client-side manager used by nodes to connect to the coordinator."""
+
+
+for _typeid, _proxytype in [
+    ("tasks", None),
+    ("results", None),
+    ("jobs", DictProxy),
+    ("control", DictProxy),
+]:
+    _NodeManager.register(_typeid, proxytype=_proxytype)
+
+
+class DistributedExecutor(Executor):
+    """
+    Distributes simulation runs to nodes connected over the network.
+
+    Nodes can run on other machines (see :func:`run_node`) or be spawned locally
+    with :meth:`spawn_local_nodes`.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        authkey=None,
+        heartbeat_timeout=30.0,
+        max_retries=2,
+        connect_timeout=120.0,
+    ):
+        """
+        Parameters
+        ----------
+        address : tuple, default=("127.0.0.1", 0)
+            (host, port) to serve on.  Use "0.0.0.0" to accept remote nodes and
+            port 0 to pick any free port (see :attr:`address` after starting).
+
+        authkey : bytes, optional
+            Key nodes must present to connect.  Defaults to the current process's
+            authkey, which is only known to locally spawned nodes.
+
+        heartbeat_timeout : float, default=30.0
+            Seconds without a heartbeat after which a node is considered dead and
+            its tasks are retried.
+
+        max_retries : int, default=2
+            Number of times a task is retried before the run fails.
+
+        connect_timeout : float, default=120.0
+            Seconds a run waits with no live nodes before it fails.
+        """
+        self._address = address
+        self.authkey = authkey or bytes(mp.current_process().authkey)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+
+        self._manager = None
+        self._last_seen = {}
+        self._local_nodes = []
+
+    @property
+    def address(self):
+        """The (host, port) the executor is serving on."""
+        if self._manager is None:
+            return self._address
+        return self._manager.address
+
+    def start(self):
+        """Starts serving tasks, if not already started."""
+        if self._manager is None:
+            manager = _CoordinatorManager(address=self._address, authkey=self.authkey)
+            manager.start()
+            self._manager = manager
+            logger.info("Distributed executor serving on %s", manager.address)
+        return self
+
+    def spawn_local_nodes(self, n_nodes, processes=1):
+        """
+        Starts nodes as local processes, e.g. for testing or single-machine use.
+
+        Parameters
+        ----------
+        n_nodes : int
+            Number of nodes to start.
+
+        processes : int, default=1
+            Number of worker processes per node.
+        """
+        self.start()
+        heartbeat_interval = self.heartbeat_timeout / 4
+        for _ in range(n_nodes):
+            node = mp.Process(
+                target=run_node,
+                args=(self.address, self.authkey, processes, heartbeat_interval),
+            )
+            node.start()
+            self._local_nodes.append(node)
+
+    @override
+    def run(self, strategy, param_sampler, price_sampler):
+        self.start()
+        manager = self._manager
+        task_queue = manager.tasks()
+        jobs = manager.jobs()
+
+        job_id = uuid4().hex
+        context, tasks = make_tasks(strategy, param_sampler, price_sampler)
+        jobs[job_id] = pack(context)
+
+        packed_tasks = {}
+        for task_id, (params, pool) in enumerate(tasks):
+            packed_pool = pack(pool) if pool is not None else None
+            packed_tasks[task_id] = (job_id, task_id, params, packed_pool)
+            task_queue.put(packed_tasks[task_id])
+
+        try:
+            results = self._collect_results(job_id, packed_tasks)
+        finally:
+            del jobs[job_id]
+
+        return results
+
+    def _collect_results(self, job_id, packed_tasks):
+        """
+        Collects results for a job, retrying tasks lost with dead nodes.
+
+        Nodes report a task as "started" as soon as they take it from the queue.
+        Once the queue is empty, any pending task that no node has started
+        within `heartbeat_timeout` was taken by a node that died first, and is
+        retried too.
+        """
+        task_queue = self._manager.tasks()
+        result_queue = self._manager.results()
+        poll_interval = min(1.0, self.heartbeat_timeout / 4)
+
+        results = [None] * len(packed_tasks)
+        pending = set(packed_tasks)
+        in_flight = {}  # task_id -> node_id
+        unstarted = {}  # task_id -> time since it's been neither queued nor started
+        attempts = Counter()
+        next_check = time.monotonic()
+        no_nodes_since = None
+
+        def retry(task_id):
+            attempts[task_id] += 1
+            if attempts[task_id] > self.max_retries:
+                raise ExecutorError(
+                    f"Task {task_id} failed after {attempts[task_id]} attempts."
+                )
+            logger.warning(
+                "Retrying task %s (attempt %s)", task_id, attempts[task_id] + 1
+            )
+            in_flight.pop(task_id, None)
+            unstarted.pop(task_id, None)
+            task_queue.put(packed_tasks[task_id])
+
+        while pending:
+            kind, node_id, msg_job_id, task_id, payload = self._receive(
+                result_queue, poll_interval
+            )
+            if kind and msg_job_id == job_id and task_id in pending:
+                if kind == "started":
+                    in_flight[task_id] = node_id
+                    unstarted.pop(task_id, None)
+                elif kind == "result":
+                    results[task_id] = unpack(payload)
+                    pending.discard(task_id)
+                    in_flight.pop(task_id, None)
+                    unstarted.pop(task_id, None)
+                elif kind == "lost":
+                    retry(task_id)
+                else:
+                    raise ExecutorError(
+                        f"Task {task_id} failed on {node_id}:\n{payload}"
+                    )
+
+            now = time.monotonic()
+            if now < next_check:
+                continue
+            next_check = now + poll_interval
+
+            lost = self._get_lost_tasks(in_flight)
+            waiting = pending.difference(in_flight)
+            lost += self._get_unstarted_tasks(task_queue, unstarted, waiting, now)
+            for task_id in lost:
+                retry(task_id)
+
+            no_nodes_since = self._check_nodes(no_nodes_since, now)
+
+        return results
+
+    def _receive(self, result_queue, timeout):
+        """
+        Returns the next message from the nodes, or a tuple of Nones on timeout.
+        """
+        try:
+            message = result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return (None,) * 5
+
+        node_id = message[1]
+        self._last_seen[node_id] = time.monotonic()
+        return message
+
+    def _get_lost_tasks(self, in_flight):
+        """Returns in-flight tasks held by nodes that stopped sending heartbeats."""
+        now = time.monotonic()
+        dead = [
+            node_id
+            for node_id, last_seen in self._last_seen.items()
+            if now - last_seen > self.heartbeat_timeout
+        ]
+
+        lost = []
+        for node_id in dead:
+            logger.warning("Node %s stopped responding", node_id)
+            del self._last_seen[node_id]
+            lost.extend(task for task, node in in_flight.items() if node == node_id)
+        return lost
+
+    def _get_unstarted_tasks(self, task_queue, unstarted, waiting, now):
+        """
+        Returns the tasks that have been neither queued nor started for longer
+        than `heartbeat_timeout`, updating the times in `unstarted`.  Tasks are
+        only known to have been taken from the queue once it's empty.
+        """
+        if not task_queue.empty():
+            unstarted.clear()
+            return []
+
+        for task_id in waiting:
+            unstarted.setdefault(task_id, now)
+        return [
+            task_id
+            for task_id, since in unstarted.items()
+            if now - since > self.heartbeat_timeout
+        ]
+
+    def _check_nodes(self, no_nodes_since, now):
+        """
+        Returns the time since which no nodes have been live, or None if some
+        are, and raises an error if that's been longer than `connect_timeout`.
+        """
+        if self._last_seen:
+            return None
+
+        no_nodes_since = no_nodes_since or now
+        if now - no_nodes_since > self.connect_timeout:
+            raise ExecutorError(
+                f"No nodes connected for {self.connect_timeout} seconds."
+            )
+        return no_nodes_since
+
+    @override
+    def shutdown(self):
+        """Stops connected nodes and the task server."""
+        if self._manager is None:
+            return
+
+        self._manager.control()["shutdown"] = True
+        for node in self._local_nodes:
+            node.join(timeout=self.heartbeat_timeout)
+            if node.is_alive():
+                node.terminate()
+        self._local_nodes = []
+
+        self._manager.shutdown()
+        self._manager = None
+        self._last_seen = {}
+
+
+def run_node(address, authkey, processes=1, heartbeat_interval=5.0):
+    """
+    Connects to a :class:`DistributedExecutor` and runs tasks until it shuts down.
+
+    Parameters
+    ----------
+    address : tuple
+        (host, port) of the executor.
+
+    authkey : bytes
+        Key used to authenticate with the executor.
+
+    processes : int, default=1
+        Number of worker processes to run tasks in.
+
+    heartbeat_interval : float, default=5.0
+        Seconds between heartbeats sent to the executor.
+    """
+    manager = _NodeManager(address=tuple(address), authkey=authkey)
+    manager.connect()
+
+    node = _Node(manager, processes)
+    heartbeat = threading.Thread(
+        target=node.send_heartbeats, args=(heartbeat_interval,), daemon=True
+    )
+    heartbeat.start()
+
+    try:
+        node.run()
+    except (EOFError, ConnectionError):
+        logger.info("Node %s lost connection to executor", node.node_id)
+    finally:
+        node.stop()
+
+
+class _Node:
+    """Pulls tasks from the executor and runs them in a local process pool."""
+
+    def __init__(self, manager, processes):
+        self.node_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.tasks = manager.tasks()
+        self.results = manager.results()
+        self.jobs = manager.jobs()
+        self.control = manager.control()
+
+        self.processes = processes
+        self.pool = ProcessPoolExecutor(processes)
+        self.slots = threading.Semaphore(processes)
+        self.stopped = threading.Event()
+
+        # pylint: disable-next=consider-using-with
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.context_paths = {}
+
+    def run(self):
+        """Runs tasks until the executor shuts down."""
+        while not self.control.get("shutdown", False):
+            if not self.slots.acquire(timeout=1):
+                continue
+
+            try:
+                job_id, task_id, params, packed_pool = self.tasks.get(timeout=1)
+            except queue.Empty:
+                self.slots.release()
+                continue
+
+            # report the task first, so it's retried if the node dies from here
+            self.send("started", job_id, task_id)
+            path = self._get_context_path(job_id)
+            if path is None:  # stale task from a finished job
+                self.slots.release()
+                continue
+
+            future = self._submit(run_packed_task, path, params, packed_pool)
+            future.add_done_callback(partial(self._report, job_id, task_id))
+
+    def _submit(self, *args):
+        try:
+            return self.pool.submit(*args)
+        except BrokenProcessPool:
+            self.pool = ProcessPoolExecutor(self.processes)
+            return self.pool.submit(*args)
+
+    def _get_context_path(self, job_id):
+        """Fetches a job's context once per node and stores it in a local file."""
+        path = self.context_paths.get(job_id)
+        if path is None:
+            context = self.jobs.get(job_id)
+            if context is None:
+                return None
+
+            path = os.path.join(self.tmpdir.name, job_id)
+            with open(path, "wb") as f:
+                f.write(context)
+
+            for old_path in self.context_paths.values():
+                os.remove(old_path)
+            self.context_paths = {job_id: path}
+
+        return path
+
+    def _report(self, job_id, task_id, future):
+        self.slots.release()
+        try:
+            self.send("result", job_id, task_id, future.result())
+        except BrokenProcessPool:
+            self.send("lost", job_id, task_id)
+        except Exception:  # pylint: disable=broad-except
+            self.send("error", job_id, task_id, traceback.format_exc())
+
+    def send(self, kind, job_id=None, task_id=None, payload=None):
+        """Sends a message to the executor."""
+        if not self.stopped.is_set():
+            self.results.put((kind, self.node_id, job_id, task_id, payload))
+
+    def send_heartbeats(self, interval):
+        """Sends heartbeats until the node is stopped."""
+        try:
+            while not self.stopped.wait(interval):
+                self.send("heartbeat")
+        except (EOFError, ConnectionError):
+            pass
+
+    def stop(self):
+        """Stops the local process pool and heartbeats."""
+        self.stopped.set()
+        self.pool.shutdown(wait=False)
+        self.tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a curvesim simulation node.")
+    parser.add_argument("host", help="Executor host")
+    parser.add_argument("port", type=int, help="Executor port")
+    parser.add_argument("--authkey", required=True, help="Executor authkey")
+    parser.add_argument(
+        "--processes", type=int, default=os.cpu_count(), help="Worker processes"
+    )
+    args = parser.parse_args()
+
+    run_node((args.host, args.port), args.authkey.encode(), args.processes)
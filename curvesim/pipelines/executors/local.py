@@ -0,0 +1,209 @@
+"""
+Executors that run simulations on the local machine.
+"""
+
+__all__ = ["ProcessExecutor", "SerialExecutor"]
+
+import importlib
+import os
+import tempfile
+import time
+from contextlib import ExitStack
+from multiprocessing import Pool as cpu_pool
+from uuid import uuid4
+
+from curvesim.logging import (
+    configure_multiprocess_logging,
+    flush_multiprocess_logging,
+    get_logger,
+    multiprocessing_logging_queue,
+)
+from curvesim.templates import Executor
+from curvesim.utils import override
+
+from ..scheduling import TaskScheduler
+from .tasks import make_tasks, pack, run_cached_task, write_packed
+
+logger = get_logger(__name__)
+
+# Imported when workers start, so runs don't pay for them
+WORKER_IMPORTS = [
+    "curvesim.metrics",
+    "curvesim.pipelines.simple.strategy",
+    "curvesim.pipelines.vol_limited_arb.strategy",
+]
+
+
+class SerialExecutor(Executor):
+    """
+    Runs simulations one after another in the current process.
+    """
+
+    def __init__(self, scheduler=None):
+        """
+        Parameters
+        ----------
+        scheduler : :class:`~curvesim.pipelines.scheduling.TaskScheduler`, optional
+            Scheduler whose cost model is updated with the time taken by each run.
+        """
+        self.scheduler = scheduler or TaskScheduler()
+
+    @override
+    def run(self, strategy, param_sampler, price_sampler):
+        cost_model = self.scheduler.cost_model
+
+        results = []
+        for pool, params in param_sampler:
+            start = time.time()
+            metrics = strategy(pool, params, price_sampler)
+            cost_model.update(params, time.time() - start)
+            results.append(metrics)
+
+        return results
+
+
+class ProcessExecutor(Executor):
+    """
+    Runs simulations in a local process pool, dispatching runs in order of
+    estimated cost (see :class:`~curvesim.pipelines.scheduling.TaskScheduler`).
+
+    Worker processes are started on the first run and reused by later runs
+    until :meth:`shutdown` is called.  Passing the same executor to repeated
+    pipeline calls (e.g., :func:`~curvesim.autosim` in a notebook) avoids
+    restarting workers and re-importing modules.  Price data is sent to each
+    worker once and cached for later runs using the same data.
+
+    Example
+    -------
+    .. code-block::
+
+        with ProcessExecutor(ncpu=8) as executor:
+            for address in pool_addresses:
+                results = autosim(address, executor=executor)
+    """
+
+    def __init__(self, ncpu=4, scheduler=None, log_level="debug"):
+        """
+        Parameters
+        ----------
+        ncpu : int, default=4
+            Number of worker processes.
+
+        scheduler : :class:`~curvesim.pipelines.scheduling.TaskScheduler`, optional
+            Scheduler that orders runs by estimated cost.
+
+        log_level : str or int, default="debug"
+            Minimum level of log records sent from workers to the main process.
+            Records below this level are dropped in the workers.
+        """
+        self.ncpu = ncpu
+        self.scheduler = scheduler or TaskScheduler()
+        self.log_level = log_level
+
+        self._resources = None
+        self._pool = None
+        self._tmpdir = None
+
+    def start(self):
+        """Starts the worker processes, if not already started."""
+        if self._pool is None:
+            resources = ExitStack()
+            logging_queue = resources.enter_context(multiprocessing_logging_queue())
+            self._tmpdir = resources.enter_context(tempfile.TemporaryDirectory())
+            self._pool = resources.enter_context(
+                cpu_pool(
+                    self.ncpu,
+                    initializer=_init_worker,
+                    initargs=(logging_queue, self.log_level),
+                )
+            )
+            self._resources = resources
+        return self
+
+    @override
+    def run(self, strategy, param_sampler, price_sampler):
+        self.start()
+        scheduler = self.scheduler
+
+        context, tasks = make_tasks(strategy, param_sampler, price_sampler)
+
+        # price data is stored separately so workers can reuse it across runs
+        strategy, _, param_sampler = context
+        context = (strategy, None, param_sampler)
+        context_path = write_packed(context, self._tmpdir, uuid4().hex)
+        price_path = write_packed(price_sampler, self._tmpdir)
+
+        args_list = []
+        params_list = []
+        for params, pool in tasks:
+            packed_pool = pack(pool) if pool is not None else None
+            args_list.append((context_path, params, packed_pool, price_path))
+            params_list.append(params)
+
+        pilot_sampler = _make_pilot_sampler(price_sampler, scheduler.pilot_samples)
+        if pilot_sampler is None:
+            pilot_args_list = None
+        else:
+            pilot_path = write_packed(pilot_sampler, self._tmpdir)
+            pilot_args_list = [(*args[:-1], pilot_path) for args in args_list]
+
+        try:
+            results = scheduler.run(
+                self._pool, wrapped_task, args_list, params_list, pilot_args_list
+            )
+        finally:
+            os.remove(context_path)
+
+        return results
+
+    @override
+    def shutdown(self):
+        """Stops the worker processes."""
+        if self._pool is None:
+            return
+
+        self._pool.close()
+        self._pool.join()  # coverage needs this
+        self._resources.close()
+
+        self._resources = None
+        self._pool = None
+        self._tmpdir = None
+
+
+def _init_worker(logging_queue, log_level):
+    """Configures logging and imports modules used by simulation runs."""
+    configure_multiprocess_logging(logging_queue, log_level)
+    for module in WORKER_IMPORTS:
+        importlib.import_module(module)
+
+
+def wrapped_task(*args):
+    """
+    Runs a task, then sends the run's batched log records to the
+    main process.
+
+    Must be defined at the top-level of the module so it can
+    be pickled.
+    """
+    result = run_cached_task(*args)
+    flush_multiprocess_logging()
+    return result
+
+
+def _make_pilot_sampler(price_sampler, pilot_samples):
+    """
+    Returns a price sampler for short pilot runs using the first `pilot_samples`
+    price samples, or None if pilot runs are disabled or the price sampler can't
+    be truncated.
+    """
+    if not pilot_samples:
+        return None
+
+    if not hasattr(price_sampler, "data"):
+        logger.warning(
+            "Skipping pilot: %s has no data to truncate.", type(price_sampler).__name__
+        )
+        return None
+
+    return type(price_sampler)(price_sampler.data.iloc[:pilot_samples])
@@ -0,0 +1,118 @@
+"""
+Helpers for shipping simulation runs to worker processes.
+
+A run is split into a shared "context" (strategy, price sampler, and parameter
+sampler), which is sent to each worker once, and lightweight per-run tasks
+(pool parameters, plus the pool itself if the parameter sampler can't rebuild it).
+"""
+
+import hashlib
+import os
+import pickle
+import zlib
+from functools import lru_cache
+
+
+def pack(obj):
+    """Serializes and compresses an object for transfer between processes."""
+    return zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def unpack(data):
+    """Inverse of :func:`pack`."""
+    return pickle.loads(zlib.decompress(data))
+
+
+def make_tasks(strategy, param_sampler, price_sampler):
+    """
+    Splits a pipeline's inputs into a shared context and per-run tasks.
+
+    Parameter samplers with a `make_pool` method (e.g.,
+    :class:`.ParameterizedPoolIterator`) are shipped as part of the context, so
+    workers rebuild each pool from its parameters.  Otherwise, each task
+    includes its pool.
+
+    Returns
+    -------
+    context : tuple
+        (strategy, price_sampler, param_sampler or None)
+
+    tasks : list of tuples
+        (params, pool or None) for each run.
+    """
+    if hasattr(param_sampler, "make_pool"):
+        params_list = [params for _, params in _iter_params(param_sampler)]
+        tasks = [(params, None) for params in params_list]
+        return (strategy, price_sampler, param_sampler), tasks
+
+    tasks = [(params, pool) for pool, params in param_sampler]
+    return (strategy, price_sampler, None), tasks
+
+
+def run_task(context, params, pool):
+    """Runs the strategy for a single task."""
+    strategy, price_sampler, param_sampler = context
+    if pool is None:
+        pool = param_sampler.make_pool(params)
+    return strategy(pool, params, price_sampler)
+
+
+def write_packed(obj, directory, name=None):
+    """
+    Packs an object into a file in `directory` and returns the file's path.
+
+    If `name` isn't given, the file is named by the hash of its contents, and
+    existing files are reused.
+    """
+    data = pack(obj)
+    name = name or hashlib.sha1(data).hexdigest()
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(data)
+    return path
+
+
+def _load_packed(path):
+    with open(path, "rb") as f:
+        return unpack(f.read())
+
+
+# Cached per process, so each file is read once per worker
+load_context = lru_cache(maxsize=2)(_load_packed)
+load_price_sampler = lru_cache(maxsize=4)(_load_packed)
+
+
+def run_packed_task(context_path, params, packed_pool):
+    """
+    Runs a task using the context stored at `context_path`, returning the
+    packed result.
+
+    Must be defined at the top-level of the module so it can be pickled.
+    """
+    context = load_context(context_path)
+    pool = unpack(packed_pool) if packed_pool is not None else None
+    return pack(run_task(context, params, pool))
+
+
+def run_cached_task(context_path, params, packed_pool, price_path):
+    """
+    Runs a task using the context stored at `context_path` and the price
+    sampler stored at `price_path`.
+
+    Must be defined at the top-level of the module so it can be pickled.
+    """
+    strategy, _, param_sampler = load_context(context_path)
+    price_sampler = load_price_sampler(price_path)
+    pool = unpack(packed_pool) if packed_pool is not None else None
+    return run_task((strategy, price_sampler, param_sampler), params, pool)
+
+
+def _iter_params(param_sampler):
+    """Yields (None, params) without building pools, if possible."""
+    parameter_sequence = getattr(param_sampler, "parameter_sequence", None)
+    if parameter_sequence is None:
+        yield from param_sampler
+    else:
+        for params in parameter_sequence:
+            yield None, params
@@ -0,0 +1,79 @@
+"""
+Executor that runs simulations in a thread pool.
+"""
+
+__all__ = ["ThreadExecutor"]
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy, deepcopy
+
+from pandas import DataFrame
+
+from curvesim.logging import get_logger
+from curvesim.templates import Executor
+from curvesim.utils import override
+
+logger = get_logger(__name__)
+
+
+class ThreadExecutor(Executor):
+    """
+    Runs simulations in a thread pool in the current process.
+
+    Avoids the start-up cost of worker processes and the logging queue, which
+    can dominate small parameter sweeps.  Runs only execute in parallel on
+    free-threaded Python builds; with the GIL enabled, this is roughly as fast
+    as :class:`.SerialExecutor`.
+
+    Each run gets its own copy of the strategy (and therefore its metrics) and
+    of the price sampler.  Price data is shared read-only across threads.
+    """
+
+    def __init__(self, max_workers=4):
+        """
+        Parameters
+        ----------
+        max_workers : int, default=4
+            Number of worker threads.
+        """
+        self.max_workers = max_workers
+
+        if _gil_enabled():
+            logger.debug("GIL is enabled: simulation runs will not run in parallel.")
+
+    @override
+    def run(self, strategy, param_sampler, price_sampler):
+        tasks = [
+            (deepcopy(strategy), pool, params, _share_price_sampler(price_sampler))
+            for pool, params in param_sampler
+        ]
+
+        with ThreadPoolExecutor(self.max_workers) as pool_executor:
+            results = list(pool_executor.map(_run_task, tasks))
+
+        return results
+
+
+def _run_task(task):
+    strategy, pool, params, price_sampler = task
+    return strategy(pool, params, price_sampler)
+
+
+def _share_price_sampler(price_sampler):
+    """
+    Returns a copy of the price sampler that shares its underlying data.
+
+    A shallow DataFrame copy references the same arrays but keeps its own
+    internal caches, so concurrent reads don't race on them.
+    """
+    sampler = copy(price_sampler)
+    data = getattr(price_sampler, "data", None)
+    if isinstance(data, DataFrame):
+        sampler.data = data.copy(deep=False)
+    return sampler
+
+
+def _gil_enabled():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
@@ -0,0 +1,250 @@
+"""
+Scheduling of simulation runs across worker processes.
+
+Runs with different pool parameters can differ greatly in cost (e.g., high A
+values with many failed optimizations), so dispatching them in fixed chunks
+leaves cores idle at the tail of a sweep.  The :class:`TaskScheduler` instead
+orders runs by estimated cost (longest first) and dispatches them one at a time,
+so idle workers always pick up the next most expensive run.
+
+Costs are estimated by a :class:`CostModel`, which learns from completed runs
+and/or a quick pilot run over the first few price samples.
+"""
+
+__all__ = ["CostModel", "TaskScheduler"]
+
+import os
+import time
+from collections import defaultdict
+from math import prod
+
+from curvesim.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CostModel:
+    """
+    Estimates the cost (in seconds) of a simulation run from its parameters.
+
+    Costs are learned from completed runs.  Parameter sets that have been seen
+    before are estimated by their average cost.  Otherwise, each parameter value
+    contributes a multiplicative factor relative to the average cost of all runs.
+    """
+
+    def __init__(self, default_cost=1.0):
+        """
+        Parameters
+        ----------
+        default_cost : float, default=1.0
+            Cost returned when no runs have been recorded.
+        """
+        self.default_cost = default_cost
+        self._run_costs = defaultdict(list)
+        self._param_costs = defaultdict(list)
+        self._all_costs = []
+
+    def update(self, params, cost):
+        """
+        Records the cost of a completed run.
+
+        Parameters
+        ----------
+        params : dict or None
+            Pool parameters for the run.
+
+        cost : float
+            Time taken by the run in seconds.
+        """
+        self._run_costs[_params_key(params)].append(cost)
+        for key in _param_items(params):
+            self._param_costs[key].append(cost)
+        self._all_costs.append(cost)
+
+    def estimate(self, params):
+        """
+        Returns the estimated cost of a run.
+
+        Parameters
+        ----------
+        params : dict or None
+            Pool parameters for the run.
+
+        Returns
+        -------
+        float
+        """
+        run_costs = self._run_costs.get(_params_key(params))
+        if run_costs:
+            return _mean(run_costs)
+
+        if not self._all_costs:
+            return self.default_cost
+
+        mean_cost = _mean(self._all_costs)
+        factors = [
+            _mean(self._param_costs[key]) / mean_cost
+            for key in _param_items(params)
+            if key in self._param_costs
+        ]
+        return mean_cost * prod(factors)
+
+    def __len__(self):
+        return len(self._all_costs)
+
+
+class TaskScheduler:
+    """
+    Dispatches simulation runs to a process pool in order of decreasing
+    estimated cost, one run at a time.
+
+    Per-worker utilization for the most recent sweep is stored in
+    :attr:`utilization` and logged when the sweep completes.
+    """
+
+    def __init__(self, cost_model=None, pilot_samples=None):
+        """
+        Parameters
+        ----------
+        cost_model : :class:`CostModel`, optional
+            Model used to order runs.  Persists across sweeps, so reusing a
+            scheduler lets later sweeps benefit from earlier ones.
+
+        pilot_samples : int, optional
+            If set and no costs have been learned yet, runs are first timed on
+            the given number of price samples.  Requires a price sampler with a
+            `data` attribute (e.g., :class:`.PriceVolume`).
+        """
+        self.cost_model = cost_model or CostModel()
+        self.pilot_samples = pilot_samples
+        self.utilization = {}
+
+    def run(self, pool, func, args_list, params_list, pilot_args_list=None):
+        """
+        Runs `func` on each element of `args_list` using the process pool.
+
+        Parameters
+        ----------
+        pool : multiprocessing.pool.Pool
+            Process pool to dispatch tasks to.
+
+        func : callable
+            Top-level (picklable) function called as :python:`func(*args)`.
+
+        args_list : list of tuples
+            Arguments for each task.
+
+        params_list : list of dict
+            Pool parameters for each task, used to estimate and learn costs.
+
+        pilot_args_list : list of tuples, optional
+            Arguments for the pilot runs, in the same order as `args_list`.
+
+        Returns
+        -------
+        list
+            Results in the same order as `args_list`.
+        """
+        costs = [self.cost_model.estimate(params) for params in params_list]
+        if pilot_args_list is not None:
+            costs = self._run_pilot(pool, func, pilot_args_list, costs)
+
+        order = sorted(range(len(args_list)), key=lambda i: costs[i], reverse=True)
+        tasks = [(i, func, args_list[i]) for i in order]
+
+        start = time.time()
+        results = [None] * len(args_list)
+        timings = []
+        for i, pid, t_start, t_end, result in pool.imap_unordered(
+            _timed_call, tasks, chunksize=1
+        ):
+            results[i] = result
+            timings.append((pid, t_start, t_end))
+            self.cost_model.update(params_list[i], t_end - t_start)
+
+        self.utilization = _compute_utilization(timings, start, time.time())
+        _log_utilization(self.utilization)
+
+        return results
+
+    def _run_pilot(self, pool, func, pilot_args_list, costs):
+        """
+        Times short runs if no costs have been learned yet.
+        """
+        if len(self.cost_model) > 0:
+            return costs
+
+        logger.info("Running %s-sample pilot for cost estimates", self.pilot_samples)
+        tasks = [(i, func, args) for i, args in enumerate(pilot_args_list)]
+
+        pilot_costs = list(costs)
+        for i, _, t_start, t_end, _ in pool.imap_unordered(
+            _timed_call, tasks, chunksize=1
+        ):
+            pilot_costs[i] = t_end - t_start
+
+        return pilot_costs
+
+
+def _timed_call(task):
+    """
+    Calls a task function, returning its result with timing data.
+
+    Must be defined at the top-level of the module so it can be pickled.
+    """
+    i, func, args = task
+    t_start = time.time()
+    result = func(*args)
+    t_end = time.time()
+    return i, os.getpid(), t_start, t_end, result
+
+
+def _compute_utilization(timings, start, end):
+    """
+    Returns a dict mapping worker PIDs to number of tasks, busy time, and
+    utilization (busy time as a fraction of the sweep's wall time).
+    """
+    wall_time = max(end - start, 1e-9)
+
+    busy = defaultdict(float)
+    n_tasks = defaultdict(int)
+    for pid, t_start, t_end in timings:
+        busy[pid] += t_end - t_start
+        n_tasks[pid] += 1
+
+    return {
+        pid: {
+            "tasks": n_tasks[pid],
+            "busy": busy[pid],
+            "utilization": busy[pid] / wall_time,
+        }
+        for pid in busy
+    }
+
+
+def _log_utilization(utilization):
+    if not utilization:
+        return
+
+    lines = [
+        f"{pid}: {u['tasks']} runs, {u['busy']:.1f}s busy ({u['utilization']:.0%})"
+        for pid, u in utilization.items()
+    ]
+    mean_util = _mean([u["utilization"] for u in utilization.values()])
+    logger.info(
+        "Worker utilization (mean %.0f%%):\n%s", mean_util * 100, "\n".join(lines)
+    )
+
+
+def _params_key(params):
+    return tuple(_param_items(params))
+
+
+def _param_items(params):
+    if not params:
+        return []
+    return sorted((key, repr(val)) for key, val in params.items())
+
+
+def _mean(values):
+    return sum(values) / len(values)
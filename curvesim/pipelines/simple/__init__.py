@@ -26,6 +26,8 @@ def pipeline(  # pylint: disable=too-many-locals
     pool_ts=None,
     ncpu=None,
     env="prod",
+    executor=None,
+    pair_workers=None,
 ):
     """
     Implements the simple arbitrage pipeline.  This is a very simplified version
@@ -70,6 +72,16 @@ def pipeline(  # pylint: disable=too-many-locals
     ncpu : int, default=os.cpu_count()
         Number of cores to use.
 
+    executor : :class:`~curvesim.templates.Executor`, optional
+        Executor used to run the simulations, overriding `ncpu`.  Pass a
+        :class:`~curvesim.pipelines.executors.ProcessExecutor` to reuse its
+        worker processes across calls.
+
+    pair_workers : int, optional
+        If provided, the arbitrageur solves each coin pair's trade size
+        concurrently on pool clones, in a pool of this many threads.  Solves
+        only run in parallel on free-threaded Python builds.
+
     Returns
     -------
     :class:`~curvesim.metrics.SimResults`
@@ -85,8 +97,10 @@ def pipeline(  # pylint: disable=too-many-locals
     price_sampler = PriceVolume(asset_data)
 
     _metrics = init_metrics(DEFAULT_METRICS, pool=pool)
-    strategy = SimpleStrategy(_metrics)
+    strategy = SimpleStrategy(_metrics, {"max_workers": pair_workers})
 
-    output = run_pipeline(param_sampler, price_sampler, strategy, ncpu=ncpu)
+    output = run_pipeline(
+        param_sampler, price_sampler, strategy, ncpu=ncpu, executor=executor
+    )
     results = make_results(*output, _metrics)
     return results
@@ -1,7 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from curvesim.logging import get_logger
 from curvesim.templates.trader import Trade, Trader
 
-from ..common import get_arb_trades
+from ..common import ArbSolverState, get_arb_trades
 
 logger = get_logger(__name__)
 
@@ -9,8 +11,31 @@ logger = get_logger(__name__)
 class SimpleArbitrageur(Trader):
     """
     Computes, executes, and reports out arbitrage trades.
+
+    Solutions from each timestep are kept in `solver_state` to warm-start the
+    next timestep's solves.
     """
 
+    def __init__(self, pool, max_workers=None):
+        """
+        Parameters
+        ----------
+        pool : :class:`~curvesim.templates.SimPool`
+            The pool to arbitrage.
+        max_workers : int, optional
+            If provided, coin pairs are solved concurrently on pool clones in a
+            pool of this many threads (see :func:`.get_arb_trades`), until
+            :meth:`shutdown` is called.
+        """
+        super().__init__(pool)
+        self.solver_state = ArbSolverState()
+        self.executor = ThreadPoolExecutor(max_workers) if max_workers else None
+
+    def shutdown(self):
+        """Shuts down the thread pool used to solve coin pairs, if any."""
+        if self.executor is not None:
+            self.executor.shutdown()
+
     # pylint: disable-next=arguments-differ,too-many-locals
     def compute_trades(self, prices):
         """
@@ -35,7 +60,15 @@ class SimpleArbitrageur(Trader):
             Dict of additional data to be passed to the state log as part of trade_data.
         """
         pool = self.pool
-        trades = get_arb_trades(pool, prices)
+        outcomes = {}
+        trades = get_arb_trades(
+            pool,
+            prices,
+            self.stats,
+            solver_state=self.solver_state,
+            executor=self.executor,
+            outcomes=outcomes,
+        )
 
         max_profit = 0
         best_trade = None
@@ -45,17 +78,24 @@ class SimpleArbitrageur(Trader):
             min_trade_size = pool.get_min_trade_size(coin_in)
             if amount_in <= min_trade_size:
                 continue
-            with pool.use_snapshot_context():
-                amount_out, _ = pool.trade(coin_in, coin_out, amount_in)
-                # assume we transacted at "infinite" depth at target price
-                # on the other exchange to obtain our in-token
-                profit = amount_out - amount_in * price_target
-                if profit > max_profit:
-                    max_profit = profit
-                    best_trade = Trade(coin_in, coin_out, amount_in)
-                    price_error = (
-                        pool.price(coin_in, coin_out) - price_target
-                    ) / price_target
+
+            # reuse the solver's simulation of the trade, if any
+            outcome = outcomes.get((coin_in, coin_out))
+            if outcome is None:
+                self.stats["profit_evaluations"] += 1
+                with pool.use_snapshot_context():
+                    amount_out, _ = pool.trade(coin_in, coin_out, amount_in)
+                    price = pool.price(coin_in, coin_out)
+            else:
+                amount_out, _, price = outcome
+
+            # assume we transacted at "infinite" depth at target price
+            # on the other exchange to obtain our in-token
+            profit = amount_out - amount_in * price_target
+            if profit > max_profit:
+                max_profit = profit
+                best_trade = Trade(coin_in, coin_out, amount_in)
+                price_error = (price - price_target) / price_target
 
         if not best_trade:
             return [], {"price_errors": {}}
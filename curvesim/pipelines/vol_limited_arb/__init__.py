@@ -13,6 +13,7 @@ from curvesim.pool_data import get_pool_volume
 from .. import run_pipeline
 from ..common import DEFAULT_METRICS, get_asset_data, get_pool_data
 from .strategy import VolumeLimitedStrategy
+from .vectorized import VectorizedVolumeLimitedStrategy
 
 logger = get_logger(__name__)
 
@@ -25,12 +26,17 @@ def pipeline(
     variable_params=None,
     fixed_params=None,
     metrics=None,
+    metric_freqs=None,
+    data_per_trade=True,
     src="coingecko",
     time_sequence=None,
     vol_mult=None,
     pool_ts=None,
     ncpu=None,
     env="prod",
+    executor=None,
+    vectorized=False,
+    pair_workers=None,
 ):
     """
     Implements the volume-limited arbitrage pipeline.
@@ -68,6 +74,24 @@ def pipeline(
         Metrics to compute for each simulation run.
         Defaults to `curvesim.pipelines.common.DEFAULT_METRICS`
 
+    metric_freqs : dict, optional
+        Maps metric classes to the fixed pandas frequency (e.g., "1D") at which to
+        sample them, so they're only computed (and their data only recorded) at the
+        first timestamp of each period. Other metrics are computed at every
+        timestamp.
+
+        Example
+        --------
+        >>> metric_freqs = {PoolValue: "1D", PriceDepth: "1D"}
+
+    data_per_trade : bool or str, default=True
+        If False, each run's per-timestamp metric data is discarded once it's
+        summarized, so only per-run parameters and summary data are returned
+        (plot them with :code:`results.plot(data=False)`).
+        If a fixed pandas frequency (e.g., "1D"), the data is instead downsampled
+        to that frequency before it's returned, using each sub-metric's plot
+        "resample" rule.
+
     src : str or :class:`~curvesim.templates.DateSource`, default="coingecko"
         Source for price/volume data: "coingecko" or "local".
 
@@ -90,6 +114,22 @@ def pipeline(
     ncpu : int, default=os.cpu_count()
         Number of cores to use.
 
+    executor : :class:`~curvesim.templates.Executor`, optional
+        Executor used to run the simulations, overriding `ncpu`.  Pass a
+        :class:`~curvesim.pipelines.executors.ProcessExecutor` to reuse its
+        worker processes across calls.
+
+    vectorized : bool, default=False
+        If True, simulate with
+        :class:`~curvesim.pipelines.vol_limited_arb.vectorized.VectorizedVolumeLimitedStrategy`,
+        which arbitrages each pair in floating point instead of optimizing
+        integer-exact trades.  Only supported for stableswap non-meta pools.
+
+    pair_workers : int, optional
+        If provided, the arbitrageur solves each coin pair's trade size
+        concurrently on pool clones, in a pool of this many threads.  Solves
+        only run in parallel on free-threaded Python builds.
+
     Returns
     -------
     SimResults object
@@ -114,10 +154,19 @@ def pipeline(
         vol_mult = vol_mult.to_dict()
 
     metrics = metrics or DEFAULT_METRICS
-    metrics = init_metrics(metrics, pool=pool)
-    strategy = VolumeLimitedStrategy(metrics, vol_mult)
+    metrics = init_metrics(metrics, freqs=metric_freqs, pool=pool)
+    log_kwargs = {"data_per_trade": data_per_trade}
+    if vectorized:
+        strategy = VectorizedVolumeLimitedStrategy(
+            metrics, vol_mult, log_kwargs=log_kwargs
+        )
+    else:
+        trader_kwargs = {"max_workers": pair_workers}
+        strategy = VolumeLimitedStrategy(metrics, vol_mult, trader_kwargs, log_kwargs)
 
-    output = run_pipeline(param_sampler, price_sampler, strategy, ncpu=ncpu)
+    output = run_pipeline(
+        param_sampler, price_sampler, strategy, ncpu=ncpu, executor=executor
+    )
     results = make_results(*output, metrics)
 
     return results
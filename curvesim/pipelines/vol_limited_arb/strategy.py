@@ -1,9 +1,12 @@
 from typing import Type
 
+import numpy as np
+
 from curvesim.logging import get_logger
 from curvesim.metrics.state_log.log import StateLog
 from curvesim.pipelines.vol_limited_arb.trader import VolumeLimitedArbitrageur
 from curvesim.templates import Log, Strategy, Trader
+from curvesim.utils import override
 
 logger = get_logger(__name__)
 
@@ -16,7 +19,7 @@ class VolumeLimitedStrategy(Strategy):
     trader_class: Type[Trader] = VolumeLimitedArbitrageur
     log_class: Type[Log] = StateLog
 
-    def __init__(self, metrics, vol_mult):
+    def __init__(self, metrics, vol_mult, trader_kwargs=None, log_kwargs=None):
         """
         Parameters
         -----------
@@ -26,21 +29,56 @@ class VolumeLimitedStrategy(Strategy):
             Value(s) multiplied by market volume to specify volume limits.
 
             Can be a scalar or vector with values for each pairwise coin combination.
+        trader_kwargs : dict, optional
+            Keyword arguments to create trader instances with.
+        log_kwargs : dict, optional
+            Keyword arguments to create log instances with.
         """
-        super().__init__(metrics)
+        super().__init__(metrics, trader_kwargs, log_kwargs)
         self.vol_mult = vol_mult
+        self._volume_limits = None
+
+    @override
+    def prepare_for_run(self, price_sampler):
+        """
+        Computes the volume limits for all timesteps of the run.
+
+        Parameters
+        ----------
+        price_sampler : :class:`~curvesim.iterators.price_samplers.PriceVolume`
+            The price sampler for the run.
+        """
+        volume_limits = _compute_volume_limits(
+            price_sampler.prices, price_sampler.volumes, self.vol_mult
+        )
+        self._volume_limits = iter(volume_limits)
 
     def _get_trader_inputs(self, sample):  # pylint: disable=too-few-public-methods
-        volume_limits = _compute_volume_limits(sample, self.vol_mult)
-        return sample.prices, volume_limits
+        return sample.prices, next(self._volume_limits)
 
 
-def _compute_volume_limits(sample, vol_mult):
-    prices = sample.prices
-    volumes = sample.volumes
+def _compute_volume_limits(prices, volumes, vol_mult):
+    """
+    Returns the volume limits for each timestep, as dicts mapping coin pairs in
+    both directions to integer amounts of the "in" coin.
+
+    Limits are computed as arrays over all timesteps, then converted to ints
+    with the same float rounding as per-timestep computation.
+    """
+    pairs = list(volumes.columns)
+    all_pairs = pairs + [(j, i) for i, j in pairs]
+    all_limits = _volume_limit_array(prices, volumes, vol_mult)
+    return [dict(zip(all_pairs, map(int, row))) for row in all_limits.tolist()]
 
-    limits = {key: volumes[key] * vol_mult[key] for key in volumes}
-    reversed_limits = {(j, i): lim * prices[(i, j)] for (i, j), lim in limits.items()}
-    all_limits = {**limits, **reversed_limits}
 
-    return {key: int(val * 10**18) for key, val in all_limits.items()}
+def _volume_limit_array(prices, volumes, vol_mult):
+    """
+    Returns the volume limits for all timesteps as a float array, with a column
+    for each coin pair in `volumes` and then for each reversed pair, in units
+    of `10**-18` of the "in" coin.
+    """
+    pairs = list(volumes.columns)
+    multipliers = np.array([vol_mult[pair] for pair in pairs], dtype=float)
+    limits = volumes[pairs].to_numpy(dtype=float) * multipliers
+    reversed_limits = limits * prices[pairs].to_numpy(dtype=float)
+    return np.hstack([limits, reversed_limits]) * 10**18
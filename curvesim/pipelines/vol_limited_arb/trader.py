@@ -1,21 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pformat
 
+import numpy as np
 from numpy import isnan
-from scipy.optimize import least_squares
+from scipy.optimize import OptimizeResult, least_squares
 
 from curvesim.logging import get_logger
 from curvesim.templates.trader import Trade, Trader
 
-from ..common import get_arb_trades
+from ..common import ArbSolverState, get_arb_trades
 
 logger = get_logger(__name__)
 
+# Initial damping of Levenberg-Marquardt steps, relative to the diagonal of the
+# Gauss-Newton Hessian
+LM_INITIAL_DAMPING = 10**-3
+
+# Fraction of the distance to a bound moved by steps that would reach it
+BOUNDARY_STEP = 0.995
+
 
 class VolumeLimitedArbitrageur(Trader):
     """
     Computes, executes, and reports out arbitrage trades.
+
+    Solutions from each timestep are kept in `solver_state` to warm-start the
+    next timestep's solves.
     """
 
+    def __init__(self, pool, max_workers=None):
+        """
+        Parameters
+        ----------
+        pool : :class:`~curvesim.templates.SimPool`
+            The pool to arbitrage.
+        max_workers : int, optional
+            If provided, coin pairs are solved concurrently on pool clones in a
+            pool of this many threads (see :func:`.get_arb_trades`), until
+            :meth:`shutdown` is called.
+        """
+        super().__init__(pool)
+        self.solver_state = ArbSolverState()
+        self.executor = ThreadPoolExecutor(max_workers) if max_workers else None
+
+    def shutdown(self):
+        """Shuts down the thread pool used to solve coin pairs, if any."""
+        if self.executor is not None:
+            self.executor.shutdown()
+
     def compute_trades(self, prices, volume_limits):  # pylint: disable=arguments-differ
         """
         Computes trades to optimally arbitrage the pool, constrained by volume limits.
@@ -39,13 +71,18 @@ class VolumeLimitedArbitrageur(Trader):
         """
 
         trades, errors, _ = multipair_optimal_arbitrage(
-            self.pool, prices, volume_limits
+            self.pool,
+            prices,
+            volume_limits,
+            self.stats,
+            self.solver_state,
+            executor=self.executor,
         )
         return trades, {"price_errors": errors}
 
 
-def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
-    pool, prices, limits
+def multipair_optimal_arbitrage(  # pylint: disable=too-many-arguments,too-many-locals
+    pool, prices, limits, stats=None, solver_state=None, method="lm", executor=None
 ):
     """
     Computes trades to optimally arbitrage the pool, constrained by volume limits.
@@ -61,6 +98,26 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
     volume_limits : dict
         Current volume limits for each trading pair.
 
+    stats : collections.Counter, optional
+        Solver statistics to update (see :func:`.get_arb_trades`). Also counts
+        the optimizer's trade simulations ("optimizer_evaluations") and reuses
+        of the previous timestep's Jacobian ("optimizer_jacobian_reuses").
+
+    solver_state : :class:`.ArbSolverState`, optional
+        If provided, solves are warm-started from the previous timestep's
+        trade sizes and optimizer Jacobian, which are then updated.
+
+    method : str, default="lm"
+        "lm" to use :func:`levenberg_marquardt` with the pool's price
+        derivatives (see :meth:`.SimPool.price_jacobian`), or, if the pool
+        doesn't provide them, finite differences with Broyden updates;
+        "least_squares" to use :func:`scipy.optimize.least_squares` with
+        finite differences at each step.
+
+    executor : concurrent.futures.Executor, optional
+        If provided, the initial single-pair solves run concurrently (see
+        :func:`.get_arb_trades`).
+
     Returns
     -------
     trades : List[Tuple]
@@ -73,7 +130,9 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
     res : scipy.optimize.OptimizeResult
         Results object from the numerical optimizer.
     """
-    all_trades = get_arb_trades(pool, prices)
+    all_trades = get_arb_trades(
+        pool, prices, stats, solver_state=solver_state, executor=executor
+    )
     input_trades, skipped_trades = _apply_volume_limits(all_trades, limits, pool)
 
     if not input_trades:
@@ -83,35 +142,30 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
     input_trades = _sort_trades_by_size(input_trades)
     least_squares_inputs = _make_least_squares_inputs(input_trades, limits)
 
-    def post_trade_price_error_multi(amounts_in, price_targets, coin_pairs):
-        with pool.use_snapshot_context():
-            for coin_pair, amount_in in zip(coin_pairs, amounts_in):
-                if isnan(amount_in):
-                    dx = 0
-                else:
-                    dx = int(amount_in)
-
-                min_size = pool.get_min_trade_size(coin_pair[0])
-                if dx > min_size:
-                    pool.trade(*coin_pair, dx)
-
-            errors = []
-            for coin_pair, price_target in zip(coin_pairs, price_targets):
-                price = pool.price(*coin_pair, use_fee=True)
-                errors.append(price - price_target)
-
-        return errors
+    coin_pairs = least_squares_inputs["kwargs"]["coin_pairs"]
+    jacobians = {} if solver_state is None else solver_state.jacobians
+    post_trade_errors = _PostTradePriceErrors(
+        pool,
+        **least_squares_inputs["kwargs"],
+        upper_bounds=least_squares_inputs["bounds"][1],
+        jacobian=jacobians.pop(coin_pairs, None),
+        finite_differences=method == "least_squares",
+    )
 
     # Find trades that minimize difference between
     # pool price and external market price
     trades = []
     try:
-        res = least_squares(
-            post_trade_price_error_multi,
-            **least_squares_inputs,
+        optimize = levenberg_marquardt if method == "lm" else least_squares
+        res = optimize(
+            post_trade_errors,
+            least_squares_inputs["x0"],
+            bounds=least_squares_inputs["bounds"],
+            jac=post_trade_errors.jac,
             gtol=10**-15,
             xtol=10**-15,
         )
+        jacobians[coin_pairs] = res.jac
 
         # Record optimized trades
         for trade, amount_in in zip(input_trades, res.x):
@@ -130,9 +184,291 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
         price_errors = _make_price_errors(skipped_trades=all_trades, pool=pool)
         res = None
 
+    if stats is not None:
+        stats["optimizer_evaluations"] += post_trade_errors.evaluations
+        stats["optimizer_jacobian_reuses"] += post_trade_errors.reused
+
     return trades, price_errors, res
 
 
+_LM_MESSAGES = {
+    0: "The maximum number of function evaluations is exceeded.",
+    1: "`gtol` termination condition is satisfied.",
+    2: "`ftol` termination condition is satisfied.",
+    3: "`xtol` termination condition is satisfied.",
+}
+
+
+# pylint: disable-next=too-many-arguments,too-many-locals
+def levenberg_marquardt(
+    fun, x0, bounds, jac, ftol=10**-8, xtol=10**-8, gtol=10**-8, max_nfev=None
+):
+    """
+    Minimizes the sum of squares of `fun` within bounds, using a projected
+    Levenberg-Marquardt method.
+
+    Each iteration solves the damped Gauss-Newton equations, with Marquardt's
+    diagonal scaling, and truncates the step to stay strictly within the
+    bounds.  Steps are accepted if they reduce the cost, with the damping
+    updated as in Nielsen (1999).
+
+    Termination conditions are those of :func:`scipy.optimize.least_squares`
+    with the "trf" method, so tolerances have the same meaning:
+
+    - `ftol`: the cost reduction of a step is below `ftol` times the cost, and
+      agrees with the Gauss-Newton model to within a factor of four.
+    - `xtol`: the step norm is below `xtol * (xtol + norm(x))`.
+    - `gtol`: the infinity norm of the gradient, scaled by the distance to
+      the bound each coordinate is moving towards, is below `gtol`.
+
+    Parameters
+    ----------
+    fun : callable
+        Function of a 1-D array returning the residuals.
+
+    x0 : array_like
+        Initial guess, strictly within the bounds.
+
+    bounds : tuple of array_like
+        Lower and upper bounds on each coordinate.
+
+    jac : callable
+        Function returning the Jacobian of `fun`, called after `fun` at the
+        same point.
+
+    ftol, xtol, gtol : float, default=1e-8
+        Termination tolerances.
+
+    max_nfev : int, optional
+        Maximum number of function evaluations; defaults to `100 * len(x0)`.
+
+    Returns
+    -------
+    scipy.optimize.OptimizeResult
+        With the same fields as returned by :func:`scipy.optimize.least_squares`.
+    """
+    lower, upper = (np.asarray(bound, dtype=float) for bound in bounds)
+    x = np.asarray(x0, dtype=float)
+    max_nfev = max_nfev or 100 * x.size
+
+    f = np.asarray(fun(x), dtype=float)
+    J = np.asarray(jac(x), dtype=float)
+    nfev = njev = 1
+    cost = f @ f / 2
+
+    scale = np.zeros(x.size)
+    damping = LM_INITIAL_DAMPING
+    damping_growth = 2
+    status = None
+    while status is None:
+        g = J.T @ f
+        if _scaled_gradient_norm(x, g, lower, upper) < gtol:
+            status = 1
+            break
+
+        if nfev >= max_nfev:
+            status = 0
+            break
+
+        JTJ = J.T @ J
+        scale = np.maximum(scale, np.diag(JTJ))
+        step = _bounded_step(JTJ, g, scale * damping, x, lower, upper)
+        x_new = x + step
+        f_new = np.asarray(fun(x_new), dtype=float)
+        nfev += 1
+
+        cost_new = f_new @ f_new / 2
+        actual_reduction = cost - cost_new
+        predicted = f + J @ step
+        predicted_reduction = cost - predicted @ predicted / 2
+        if predicted_reduction > 0:
+            ratio = actual_reduction / predicted_reduction
+        else:
+            ratio = 0
+
+        if actual_reduction < ftol * cost and ratio > 0.25:
+            status = 2
+        elif np.linalg.norm(step) < xtol * (xtol + np.linalg.norm(x)):
+            status = 3
+
+        if actual_reduction > 0:
+            x, f, cost = x_new, f_new, cost_new
+            J = np.asarray(jac(x), dtype=float)
+            njev += 1
+            damping *= max(1 / 3, 1 - (2 * ratio - 1) ** 3)
+            damping_growth = 2
+        else:
+            damping *= damping_growth
+            damping_growth *= 2
+
+    g = J.T @ f
+    return OptimizeResult(
+        x=x,
+        cost=cost,
+        fun=f,
+        jac=J,
+        grad=g,
+        optimality=_scaled_gradient_norm(x, g, lower, upper),
+        active_mask=np.zeros(x.size, dtype=int),
+        nfev=nfev,
+        njev=njev,
+        status=status,
+        message=_LM_MESSAGES[status],
+        success=status > 0,
+    )
+
+
+def _scaled_gradient_norm(x, g, lower, upper):
+    """
+    Returns the infinity norm of the gradient, scaled by the distance to the
+    bound each coordinate is moving towards, as in the "trf" method of
+    :func:`scipy.optimize.least_squares`.
+    """
+    v = np.ones(x.size)
+    towards_upper = (g < 0) & np.isfinite(upper)
+    v[towards_upper] = upper[towards_upper] - x[towards_upper]
+    towards_lower = (g > 0) & np.isfinite(lower)
+    v[towards_lower] = x[towards_lower] - lower[towards_lower]
+    return np.linalg.norm(g * v, ord=np.inf)
+
+
+# pylint: disable-next=too-many-arguments
+def _bounded_step(JTJ, g, damping, x, lower, upper):
+    """
+    Returns the damped Gauss-Newton step, keeping iterates strictly within the
+    bounds as in the "trf" method of :func:`scipy.optimize.least_squares`.
+
+    Coordinates whose step would reach a bound instead move most of the way to
+    it, and the step is re-solved for the other coordinates until none reach a
+    bound.
+    """
+    A = JTJ + np.diag(damping)
+    step = np.zeros(x.size)
+    free = np.ones(x.size, dtype=bool)
+
+    while free.any():
+        blocked = ~free
+        rhs = -g[free] - A[np.ix_(free, blocked)] @ step[blocked]
+        step[free] = np.linalg.lstsq(A[np.ix_(free, free)], rhs, rcond=None)[0]
+
+        x_new = x + step
+        below = free & (x_new <= lower)
+        above = free & (x_new >= upper)
+        if not (below.any() or above.any()):
+            break
+
+        step[below] = BOUNDARY_STEP * (lower - x)[below]
+        step[above] = BOUNDARY_STEP * (upper - x)[above]
+        free &= ~(below | above)
+
+    return step
+
+
+class _PostTradePriceErrors:
+    """
+    Post-trade price errors as a function of the amounts traded for each coin
+    pair, counting evaluations.
+
+    Each evaluation simulates all the trades under a pool snapshot.  Jacobians
+    are, in order of preference:
+
+    - the pool's price derivatives (see :meth:`.SimPool.price_jacobian`) at
+      the same post-trade state, which cost no extra evaluations
+    - an initial Jacobian, if given (e.g. from the previous timestep), for the
+      first point
+    - Broyden updates of the last Jacobian, using the step between points
+    - forward differences as the "2-point" scheme of `least_squares`, but
+      reusing the function value at the current point
+
+    If `finite_differences` is True, only the last two are used, and forward
+    differences are computed at every point.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        pool,
+        price_targets,
+        coin_pairs,
+        upper_bounds,
+        jacobian=None,
+        finite_differences=False,
+    ):
+        self.pool = pool
+        self.price_targets = np.asarray(price_targets, dtype=float)
+        self.coin_pairs = coin_pairs
+        self.upper_bounds = np.asarray(upper_bounds, dtype=float)
+        self.initial = jacobian
+        self.finite_differences = finite_differences
+        self.reused = False
+        self.evaluations = 0
+        self._last = None
+        self._previous = None
+
+    def __call__(self, amounts_in):
+        self.evaluations += 1
+
+        pool = self.pool
+        jac = None
+        with pool.use_snapshot_context():
+            for coin_pair, amount_in in zip(self.coin_pairs, amounts_in):
+                if isnan(amount_in):
+                    dx = 0
+                else:
+                    dx = int(amount_in)
+
+                min_size = pool.get_min_trade_size(coin_pair[0])
+                if dx > min_size:
+                    pool.trade(*coin_pair, dx)
+
+            prices = pool.prices(self.coin_pairs, use_fee=True)
+            if not self.finite_differences:
+                jac = pool.price_jacobian(self.coin_pairs)
+
+        errors = np.array(prices) - self.price_targets
+        self._last = (np.array(amounts_in, dtype=float), errors, jac)
+        return errors
+
+    def jac(self, x):
+        """Returns the Jacobian of the price errors at `x`."""
+        if self._last is None or not np.array_equal(self._last[0], x):
+            self(x)
+
+        _, f0, jac = self._last
+        if jac is not None:
+            return jac
+
+        if self.initial is not None:
+            jac, self.initial = self.initial, None
+            self.reused = True
+        elif self._previous is not None and not self.finite_differences:
+            jac = self._broyden_update(x, f0)
+        else:
+            jac = self._forward_differences(x, f0)
+
+        self._previous = (x.copy(), f0, jac)
+        return jac
+
+    def _broyden_update(self, x, f0):
+        """Updates the last Jacobian to match the change in errors since then."""
+        x_prev, f_prev, jac = self._previous
+        step = x - x_prev
+        return jac + np.outer(f0 - f_prev - jac @ step, step) / (step @ step)
+
+    def _forward_differences(self, x, f0):
+        """Computes the Jacobian by forward differences."""
+        h = np.finfo(float).eps ** 0.5 * np.maximum(1, np.abs(x))
+        h = np.where(x + h > self.upper_bounds, -h, h)
+        h = (x + h) - x
+
+        jac = np.empty((f0.size, x.size))
+        for k, h_k in enumerate(h):
+            x_k = x.copy()
+            x_k[k] += h_k
+            jac[:, k] = (self(x_k) - f0) / h_k
+        return jac
+
+
 def _apply_volume_limits(arb_trades, limits, pool):
     """
     Returns list of ArbTrades with amount_in set to min(limit, amount_in). Any trades
@@ -208,9 +544,11 @@ def _make_price_errors(trades=None, trade_errors=None, skipped_trades=None, pool
             price_errors[coin_pair] = price_error / trade.price_target
 
     if skipped_trades:
-        for trade in skipped_trades:
+        coin_pairs = [(trade.coin_in, trade.coin_out) for trade in skipped_trades]
+        pool_prices = pool.prices(coin_pairs, use_fee=True)
+        for trade, pool_price in zip(skipped_trades, pool_prices):
             coin_pair = trade.coin_in, trade.coin_out
-            price_error = pool.price(*coin_pair, use_fee=True) - trade.price_target
+            price_error = pool_price - trade.price_target
             price_errors[coin_pair] = price_error / trade.price_target
 
     return price_errors
@@ -0,0 +1,316 @@
+"""
+Implements a floating-point, whole-series variant of the volume-limited
+arbitrage strategy for stableswap pools.
+"""
+from math import prod, sqrt
+from typing import Type
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.pool.sim_interface import SimCurvePool
+from curvesim.pool.sim_interface.trade_math import stableswap_trade_size
+from curvesim.templates.trader import Trader, TradeResult
+from curvesim.utils import override
+
+from .strategy import VolumeLimitedStrategy, _volume_limit_array
+
+# Relative tolerance of the floating-point invariant solve
+FLOAT_TOLERANCE = 10**-14
+
+
+class VectorizedArbitrageur(Trader):
+    """
+    Computes, executes, and reports out volume-limited arbitrage trades on a
+    :class:`.SimCurvePool`, in floating point.
+
+    Each coin pair is arbitraged in turn by inverting the pool's spot price to
+    the market price along the stableswap curve, capped by the pair's volume
+    limit, so no trades are simulated to size arbitrages and there is no
+    multi-pair optimization.  Trades are executed on a floating-point copy of
+    the pool's balances, which is mirrored into the pool when they are "done".
+    """
+
+    def __init__(self, pool):
+        """
+        Parameters
+        ----------
+        pool : :class:`~curvesim.pool.sim_interface.SimCurvePool`
+            The pool to arbitrage.
+        """
+        if type(pool) is not SimCurvePool:  # pylint: disable=unidiomatic-typecheck
+            raise CurvesimValueError(
+                f"Vectorized arbitrage isn't implemented for '{type(pool)}'."
+            )
+        super().__init__(pool)
+        self.float_pool = None
+        self.indices = None
+
+    # pylint: disable-next=arguments-differ
+    def compute_trades(self, pairs, prices, limits):
+        """
+        Computes and executes, on the floating-point pool, trades to arbitrage
+        each coin pair in turn, constrained by volume limits.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            Coin pairs, as coin names.
+        prices : list of float
+            Market price of each pair.
+        limits : list of float
+            Volume limits, in units of `D`, of each pair and then of each
+            reversed pair.
+
+        Returns
+        -------
+        trades : list of :class:`TradeResult` objects
+            The executed trades.
+
+        additional_data: dict
+            Dict with the relative post-trade price errors ("price_errors").
+        """
+        if self.float_pool is None:
+            # created at the first timestep, after the pool's run preparation
+            self.float_pool = _FloatStableswap(self.pool)
+            self.indices = [tuple(self.pool.get_asset_indices(*p)) for p in pairs]
+
+        trade_data = self.float_pool.arbitrage(pairs, self.indices, prices, limits)
+        self.stats["pair_arbitrages"] += len(pairs)
+        return trade_data["trades"], {"price_errors": trade_data["price_errors"]}
+
+    def do_trades(self, trades):
+        """
+        Mirrors the floating-point pool's state, after executing `trades`, into
+        the pool.
+
+        Parameters
+        ----------
+        trades : list of :class:`TradeResult` objects
+            Trades executed by :meth:`compute_trades`.
+
+        Returns
+        -------
+        trades: list of :class:`TradeResult` objects
+            The input trades.
+        """
+        self.float_pool.copy_state_to(self.pool)
+        return trades
+
+
+class VectorizedVolumeLimitedStrategy(VolumeLimitedStrategy):
+    """
+    Volume-limited arbitrage of a :class:`.SimCurvePool`, computed in floating
+    point by a :class:`VectorizedArbitrageur`.
+
+    Market prices and volume limits for all timesteps are computed as arrays
+    up front.  The state log, metrics and results are the same as for
+    :class:`.VolumeLimitedStrategy`, up to floating-point error and the
+    pair-by-pair approximation.
+    """
+
+    trader_class: Type[Trader] = VectorizedArbitrageur
+
+    def __init__(self, metrics, vol_mult, trader_kwargs=None, log_kwargs=None):
+        """
+        Parameters
+        -----------
+        metrics : List[Metric]
+            A list of metrics used to evaluate the performance of the strategy.
+        vol_mult : dict
+            Values multiplied by market volume to specify volume limits, for
+            each pairwise coin combination.
+        trader_kwargs : dict, optional
+            Keyword arguments to create trader instances with.
+        log_kwargs : dict, optional
+            Keyword arguments to create log instances with.
+        """
+        super().__init__(metrics, vol_mult, trader_kwargs, log_kwargs)
+        self._pairs = None
+        self._trader_inputs = None
+
+    @override
+    def prepare_for_run(self, price_sampler):
+        """
+        Computes the market prices and volume limits for all timesteps of the
+        run, as lists of floats.
+
+        Parameters
+        ----------
+        price_sampler : :class:`~curvesim.iterators.price_samplers.PriceVolume`
+            The price sampler for the run.
+        """
+        pairs = list(price_sampler.volumes.columns)
+        prices = price_sampler.prices
+        limits = _volume_limit_array(prices, price_sampler.volumes, self.vol_mult)
+        prices = prices[pairs].to_numpy(dtype=float)
+
+        self._pairs = pairs
+        self._trader_inputs = zip(prices.tolist(), limits.tolist())
+
+    @override
+    def _get_trader_inputs(self, sample):
+        return (self._pairs, *next(self._trader_inputs))
+
+
+class _FloatStableswap:
+    """
+    Floating-point copy of a stableswap pool's balances, which executes
+    arbitrage trades as :meth:`.CurvePool.exchange` does.
+
+    Balances are in units of `D`, since :class:`.SimCurvePool` requires all
+    rates to be `10**18`.  The invariant is cached between trades.
+    """
+
+    __slots__ = [
+        "A",
+        "n",
+        "fee",
+        "fee_mul",
+        "admin_fee",
+        "balances",
+        "admin_balances",
+        "_D",
+    ]
+
+    def __init__(self, pool):
+        self.A = pool.A
+        self.n = pool.n
+        self.fee = pool.fee / 10**10
+        self.fee_mul = None if pool.fee_mul is None else pool.fee_mul / 10**10
+        self.admin_fee = pool.admin_fee / 10**10
+        self.balances = [float(x) for x in pool.balances]
+        self.admin_balances = [float(x) for x in pool.admin_balances]
+        self._D = None
+
+    def copy_state_to(self, pool):
+        """Sets the pool's balances to the rounded floating-point balances."""
+        pool.balances = [int(x) for x in self.balances]
+        pool.admin_balances = [int(x) for x in self.admin_balances]
+
+    def arbitrage(self, pairs, indices, prices, limits):
+        """
+        Arbitrages each coin pair in turn towards its market price, up to its
+        volume limit, and returns the trade data to log.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            Coin pairs, as coin names.
+        indices : list of tuple
+            Coin pairs, as coin indices.
+        prices : list of float
+            Market price of each pair.
+        limits : list of float
+            Volume limits, in units of `D`, of each pair and then of each
+            reversed pair.
+
+        Returns
+        -------
+        dict
+            Executed trades ("trades") and relative post-trade price errors
+            ("price_errors"), as returned by
+            :class:`.VolumeLimitedArbitrageur`.
+        """
+        trades = []
+        targets = []
+        for k, (pair, (i, j), price) in enumerate(zip(pairs, indices, prices)):
+            if self.price(i, j) - price >= self.price(j, i) - 1 / price:
+                coin_in, coin_out, price_target, limit = *pair, price, limits[k]
+            else:
+                i, j = j, i
+                coin_in, coin_out = pair[1], pair[0]
+                price_target, limit = 1 / price, limits[k + len(pairs)]
+            targets.append((coin_in, coin_out, i, j, price_target))
+
+            size = self.trade_size(i, j, price_target)
+            if size is None or size <= 0:
+                continue
+
+            dx = min(size, limit)
+            dy, fee = self.exchange(i, j, dx)
+            trades.append(TradeResult(coin_in, coin_out, int(dx), int(dy), int(fee)))
+
+        price_errors = {}
+        for coin_in, coin_out, i, j, price_target in targets:
+            price_error = self.price(i, j) - price_target
+            price_errors[coin_in, coin_out] = price_error / price_target
+
+        return {"trades": trades, "price_errors": price_errors}
+
+    def fee_factor(self, xi, xj):
+        """Returns the fee, as a fraction, for a trade between balances `xi`, `xj`."""
+        if self.fee_mul is None:
+            return self.fee
+        return (
+            self.fee_mul
+            * self.fee
+            / ((self.fee_mul - 1) * 4 * xi * xj / (xi + xj) ** 2 + 1)
+        )
+
+    def D(self):
+        """Returns the stableswap invariant, as :meth:`.CurvePool.get_D`."""
+        if self._D is None:
+            self._D = self._get_D()
+        return self._D
+
+    def _get_D(self):
+        xp = self.balances
+        n = self.n
+        Ann = self.A * n
+        S = sum(xp)
+        D = S
+        while True:
+            D_P = D ** (n + 1) / n**n / prod(xp)
+            D_next = (Ann * S + D_P * n) * D / ((Ann - 1) * D + (n + 1) * D_P)
+            if abs(D_next - D) <= FLOAT_TOLERANCE * D:
+                return D_next
+            D = D_next
+
+    def get_y(self, i, j, x, D):
+        """Returns the balance of coin `j` if coin `i` has balance `x`."""
+        xx = self.balances[:]
+        xx[i] = x
+        xx = [xx[k] for k in range(self.n) if k != j]
+        n = self.n
+        Ann = self.A * n
+
+        # y-equation: y**2 + b * y = c, solved in closed form
+        c = D ** (n + 1) / n**n / prod(xx) / Ann
+        b = sum(xx) + D / Ann - D
+        disc = sqrt(b * b + 4 * c)
+        return 2 * c / (b + disc) if b > 0 else (disc - b) / 2
+
+    def price(self, i, j):
+        """Returns the spot price of coin `i` in coin `j`, with fees."""
+        xp = self.balances
+        D = self.D()
+        n = self.n
+        xi = xp[i] / D
+        xj = xp[j] / D
+
+        aP = self.A * n ** (n + 1) * prod(x / D for x in xp)
+        T = xi * xj * aP
+        return (T + xj) / (T + xi) * (1 - self.fee_factor(xp[i], xp[j]))
+
+    def trade_size(self, i, j, price_target):
+        """
+        Returns the amount of coin `i` to trade for coin `j` to move the spot
+        price (with fees) to `price_target`, or None if the inversion failed.
+        """
+        xp = self.balances
+        price_target /= 1 - self.fee_factor(xp[i], xp[j])
+        return stableswap_trade_size(self.A, xp, self.D(), i, j, price_target)
+
+    def exchange(self, i, j, dx):
+        """Trades `dx` of coin `i` for coin `j`, as :meth:`.CurvePool.exchange`."""
+        xp = self.balances
+        x = xp[i] + dx
+        y = self.get_y(i, j, x, self.D())
+        dy = xp[j] - y
+        fee = dy * self.fee_factor((xp[i] + x) / 2, (xp[j] + y) / 2)
+        admin_fee = fee * self.admin_fee
+
+        xp[i] += dx
+        xp[j] -= dy - fee + admin_fee
+        self._D = None
+        self.admin_balances[j] += admin_fee
+        return dy - fee, fee
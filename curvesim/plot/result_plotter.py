@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
 
+from curvesim.exceptions import PlotError
+from curvesim.logging import get_logger
+
+logger = get_logger(__name__)
+
 
 class ResultPlotter(ABC):
     """
@@ -39,7 +44,8 @@ class ResultPlotter(ABC):
             If true, includes summary data in the plot.
 
         data : bool, default=True
-            If true, includes timeseries data in the plot.
+            If true, includes timeseries data in the plot. Skipped if there is
+            no timeseries data (e.g., if simulated with `data_per_trade=False`).
 
         save_as : str, optional
             Path to save plot output to.
@@ -49,7 +55,18 @@ class ResultPlotter(ABC):
         -------
         A chart object.
 
+        Raises
+        ------
+        PlotError
+            If only timeseries data is plotted, but there is none.
+
         """
+        if data and results.data().empty:
+            if not summary:
+                raise PlotError("No timeseries data to plot.")
+            logger.info("No timeseries data to plot, plotting summary data only.")
+            data = False
+
         if summary and data:
             chart = self.plot_results(results)
         elif summary:
@@ -1199,7 +1199,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         return self.dydx(i, j, use_fee=True)
 
-    def dydx(self, i, j, use_fee=False):  # pylint: disable=too-many-locals
+    def dydx(self, i, j, use_fee=False):
         """
         Returns the spot price of i-th coin quoted in terms of j-th coin,
         i.e. the ratio of output coin amount to input coin amount for
@@ -1221,13 +1221,35 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         float
             Price of i-th coin quoted in j-th coin
 
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        return self.dydx_pairs([(i, j)], use_fee=use_fee)[0]
+
+    def dydx_pairs(self, pairs, use_fee=False):  # pylint: disable=too-many-locals
+        """
+        Returns the spot prices of each (i, j) pair of coin indices, as
+        :meth:`dydx`, with the virtual balances, invariant terms and fee
+        computed once.
+
+        Parameters
+        ----------
+        pairs: list of tuple
+            (i, j) pairs of coin indices.
+        use_fee: bool, default=False
+            Deduct fees.
+
+        Returns
+        -------
+        list of float
+            Price of i-th coin quoted in j-th coin, for each pair.
+
         Note
         ----
         This is a "view" function; it doesn't change the state of the pool.
         """
         xp = self._xp()
-        x_i = xp[i]
-        x_j = xp[j]
         n = len(xp)
 
         D = self.D
@@ -1239,22 +1261,29 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
 
         coeff = A * gamma**2 / (10**18 + gamma - K0) ** 2
         frac = (10**18 + gamma + K0) * (sum(xp) - D) / (10**18 + gamma - K0)
-        dydx_top = x_j * (A_multiplier * D + coeff * (x_i + frac))
-        dydx_bottom = x_i * (A_multiplier * D + coeff * (x_j + frac))
-        dydx = dydx_top / dydx_bottom
+        fee = self._fee(xp) if use_fee else 0
+
+        prices = []
+        for i, j in pairs:
+            x_i = xp[i]
+            x_j = xp[j]
+            dydx_top = x_j * (A_multiplier * D + coeff * (x_i + frac))
+            dydx_bottom = x_i * (A_multiplier * D + coeff * (x_j + frac))
+            dydx = dydx_top / dydx_bottom
+
+            if j > 0:
+                price_scale = self.price_scale[j - 1]
+                dydx = dydx * 10**18 / price_scale
+            if i > 0:
+                price_scale = self.price_scale[i - 1]
+                dydx = dydx * price_scale / 10**18
 
-        if j > 0:
-            price_scale = self.price_scale[j - 1]
-            dydx = dydx * 10**18 / price_scale
-        if i > 0:
-            price_scale = self.price_scale[i - 1]
-            dydx = dydx * price_scale / 10**18
+            if use_fee:
+                dydx = dydx - dydx * fee / 10**10
 
-        if use_fee:
-            fee = self._fee(xp)
-            dydx = dydx - dydx * fee / 10**10
+            prices.append(dydx)
 
-        return dydx
+        return prices
 
 
 def _get_unix_timestamp():
@@ -1,6 +1,8 @@
 """Module to house the `SimPool` extension of the `CurveCryptoPool`."""
 from math import prod
 
+import numpy as np
+
 from curvesim.exceptions import SimPoolError
 from curvesim.templates.sim_pool import SimPool
 from curvesim.utils import cache, override
@@ -10,6 +12,11 @@ from ..cryptoswap.calcs import newton_D
 from ..cryptoswap.calcs.factory_2_coin import _sqrt_int
 from ..cryptoswap.calcs.tricrypto_ng import _cbrt
 from .asset_indices import AssetIndicesMixin
+from .trade_math import (
+    cryptoswap_fee_gradient,
+    cryptoswap_price_gradient,
+    cryptoswap_price_slope,
+)
 
 
 # pylint: disable-next=too-many-instance-attributes
@@ -72,6 +79,109 @@ class SimCurveCryptoPool(SimPool, AssetIndicesMixin, CurveCryptoPool):
         p = self.dydx(i, j, use_fee=use_fee)
         return p
 
+    @override
+    def prices(self, pairs, use_fee=True):
+        """
+        Returns the spot prices of each (coin_in, coin_out) pair, as
+        :meth:`price`, computing the virtual balances, invariant terms and fee once.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            (coin_in, coin_out) pairs of coin IDs.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        list of float
+            Price of `coin_in` quoted in `coin_out`, for each pair.
+        """
+        indices = [self.get_asset_indices(*pair) for pair in pairs]
+        return self.dydx_pairs(indices, use_fee=use_fee)
+
+    @override
+    def price_slope(self, coin_in, coin_out, use_fee=True):
+        """
+        Returns the derivative of :meth:`price` with respect to the amount of
+        `coin_in` traded for `coin_out`, holding `D` and `price_scale` fixed.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        float
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+
+        fee_params = None
+        if use_fee:
+            fee_params = (self.mid_fee, self.out_fee, self.fee_gamma)
+
+        xp = self._xp()
+        _, slope = cryptoswap_price_slope(
+            self.A, self.gamma, xp, self.D, i, j, fee_params
+        )
+
+        # convert from units of D
+        price_scale = [10**18, *self.price_scale]
+        slope *= price_scale[i] / price_scale[j] * price_scale[i] / 10**18
+        return slope
+
+    @override
+    def price_jacobian(self, pairs, use_fee=True):
+        """
+        Returns the derivatives of :meth:`price` for each coin pair with respect
+        to the amount traded for each coin pair, holding `D` and `price_scale`
+        fixed.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            (coin_in, coin_out) pairs of coin IDs.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square matrix whose entry `[k, m]` is the derivative of the price of
+            `pairs[k]` with respect to the amount of `pairs[m][0]` traded for
+            `pairs[m][1]`.
+        """
+        xp = self._xp()
+        price_scale = [10**18, *self.price_scale]
+
+        if use_fee:
+            fee, fee_grad = cryptoswap_fee_gradient(
+                xp, self.mid_fee, self.out_fee, self.fee_gamma
+            )
+
+        gradients = []
+        directions = np.zeros((len(xp), len(pairs)))
+        unit_scales = []
+        for m, pair in enumerate(pairs):
+            i, j = self.get_asset_indices(*pair)
+            p, grad = cryptoswap_price_gradient(self.A, self.gamma, xp, self.D, i, j)
+            if use_fee:
+                grad = np.multiply(grad, 1 - fee) - np.multiply(fee_grad, p)
+            gradients.append(grad)
+
+            # along the curve, d(xp[j])/d(xp[i]) = -p, in units of D
+            directions[i, m] = price_scale[i] / 10**18
+            directions[j, m] = -p * price_scale[i] / 10**18
+            unit_scales.append(price_scale[i] / price_scale[j])
+
+        # convert prices from units of D
+        return np.array(unit_scales)[:, None] * (np.array(gradients) @ directions)
+
     @override
     def trade(self, coin_in, coin_out, size):
         """
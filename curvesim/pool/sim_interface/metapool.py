@@ -1,9 +1,18 @@
+import numpy as np
+
 from curvesim.exceptions import CurvesimValueError, SimPoolError
 from curvesim.templates.sim_pool import SimPool
 from curvesim.utils import cache, override
 
 from ..stableswap import CurveMetaPool
 from .asset_indices import AssetIndicesMixin
+from .trade_math import (
+    stableswap_fee_factor,
+    stableswap_invariant_gradient,
+    stableswap_price_gradient,
+    stableswap_price_slope,
+    stableswap_trade_size,
+)
 
 
 class SimCurveMetaPool(SimPool, AssetIndicesMixin, CurveMetaPool):
@@ -91,6 +100,259 @@ class SimCurveMetaPool(SimPool, AssetIndicesMixin, CurveMetaPool):
         xp = self._xp()
         return self._dydx(i, j, xp=xp, use_fee=use_fee)
 
+    @override
+    def prices(self, pairs, use_fee=True):
+        """
+        Returns the spot prices of each (coin_in, coin_out) pair, as
+        :meth:`price`, computing the virtual balances and invariants once.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            (coin_in, coin_out) pairs of coin IDs.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        list of float
+            Price of `coin_in` quoted in `coin_out`, for each pair.
+        """
+        bp_token_index = self.n_total
+        indices = [tuple(self.get_asset_indices(*pair)) for pair in pairs]
+
+        underlying = [ij for ij in indices if bp_token_index not in ij]
+        prices = dict(zip(underlying, self.dydx_pairs(underlying, use_fee=use_fee)))
+
+        xp = D = None
+        for i, j in indices:
+            if (i, j) not in prices:
+                if xp is None:
+                    xp = self._xp()
+                    D = self.D(xp)
+                meta_i, meta_j = self.get_meta_asset_indices(i, j, bp_token_index)
+                prices[i, j] = self._dydx(meta_i, meta_j, xp, use_fee, D=D)
+
+        return [prices[ij] for ij in indices]
+
+    @override
+    def price_slope(self, coin_in, coin_out, use_fee=True):
+        """
+        Returns the derivative of :meth:`price` with respect to the amount of
+        `coin_in` traded for `coin_out`, holding `D` fixed.
+
+        Dynamic fees are treated as constant.  For trades between a metapool
+        coin and a basepool coin, the basepool leg of the trade is treated as a
+        fixed conversion, so the derivative is approximate.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        float
+        """
+        curve, fee, in_scale, price_scale = self._get_curve(coin_in, coin_out, use_fee)
+        _, slope = stableswap_price_slope(*curve)
+        return slope * (1 - fee) * in_scale * price_scale
+
+    @override
+    def price_jacobian(self, pairs, use_fee=True):
+        """
+        Returns the derivatives of :meth:`price` for each coin pair with respect
+        to the amount traded for each coin pair, holding the metapool's `D`
+        fixed.
+
+        Trades are modeled on both levels of the pool.  Each coin is valued in
+        (virtual) basepool LP tokens: metapool coins by their price on the
+        metapool curve, and basepool coins by the derivative of the basepool
+        invariant.  Trades between a metapool coin and a basepool coin deposit
+        that value into, or withdraw it from, the basepool and move the
+        metapool's LP token balance by the same amount, so no basepool
+        deposits or withdrawals are simulated.
+
+        Dynamic fees are treated as constant, and fees on basepool deposits
+        and withdrawals are neglected.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            (coin_in, coin_out) pairs of coin IDs.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square matrix whose entry `[k, m]` is the derivative of the price of
+            `pairs[k]` with respect to the amount of `pairs[m][0]` traded for
+            `pairs[m][1]`.
+        """
+        values, log_gradients, scales, xp = self._lp_token_values()
+        coords = [self._state_coords(*pair) for pair in pairs]
+
+        prices = np.empty(len(pairs))
+        directions = np.zeros((len(values), len(pairs)))
+        for m, (a, b) in enumerate(coords):
+            value = scales[a] * values[a]
+            prices[m] = value / (scales[b] * values[b])
+            if use_fee:
+                prices[m] *= 1 - self._curve_fee_factor(xp, a, b)
+
+            directions[a, m] += scales[a]
+            directions[b, m] -= value / values[b]
+
+            # LP tokens deposited into, or withdrawn from, the metapool
+            if a >= self.n > b:
+                directions[self.max_coin, m] += value
+            elif b >= self.n > a:
+                directions[self.max_coin, m] -= value
+
+        log_price_gradients = np.array(
+            [log_gradients[a] - log_gradients[b] for a, b in coords]
+        )
+        return prices[:, None] * (log_price_gradients @ directions)
+
+    def _state_coords(self, coin_in, coin_out):
+        """
+        Returns the positions of `coin_in` and `coin_out` in the pool state used
+        by :meth:`price_jacobian`: metapool balances followed by basepool
+        balances.
+        """
+        coords = []
+        for i in self.get_asset_indices(coin_in, coin_out):
+            if i == self.n_total:  # basepool LP token
+                coords.append(self.max_coin)
+            elif i < self.max_coin:
+                coords.append(i)
+            else:
+                coords.append(self.n + i - self.max_coin)
+        return coords
+
+    def _lp_token_values(self):
+        """
+        Returns the values of each coin in virtual basepool LP tokens (without
+        fees), the gradients of their logs with respect to the pool state, the
+        state units per unit of each coin, and the pool state.
+        """
+        bp = self.basepool
+        n = self.n
+
+        rates = self.rates
+        xp = self._xp_mem(rates, self.balances)
+        base_xp = bp._xp()  # pylint: disable=protected-access
+        base_values, base_log_jacobian = stableswap_invariant_gradient(
+            bp.A, base_xp, bp.D(base_xp)
+        )
+
+        values = np.ones(n + bp.n)
+        log_gradients = np.zeros((n + bp.n, n + bp.n))
+        D = self.D(xp)
+        for c in range(self.max_coin):
+            values[c], grad = stableswap_price_gradient(self.A, xp, D, c, self.max_coin)
+            log_gradients[c, :n] = np.array(grad) / values[c]
+
+        values[n:] = base_values
+        log_gradients[n:, n:] = base_log_jacobian
+
+        scales = np.array([*rates, *bp.rates]) / 10**18
+        return values, log_gradients, scales, [*xp, *base_xp]
+
+    def _curve_fee_factor(self, xp, a, b):
+        """
+        Returns the fee of the curve traded on between state positions `a` and
+        `b`: the basepool's if both are basepool coins, else the metapool's.
+        """
+        n = self.n
+        if a >= n and b >= n:
+            return stableswap_fee_factor(self.basepool, xp[n:], a - n, b - n)
+
+        max_coin = self.max_coin
+        return stableswap_fee_factor(self, xp[:n], min(a, max_coin), min(b, max_coin))
+
+    @override
+    def estimate_trade_size(self, coin_in, coin_out, price_target):
+        """
+        Returns an estimate of the amount of `coin_in` to trade for `coin_out`
+        to move :meth:`price` (with fees) to `price_target`.
+
+        The price target is inverted along the stableswap curve the trade
+        moves, ignoring fees retained by the pool and, for trades between a
+        metapool coin and a basepool coin, changes to the basepool.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        price_target : float
+            Target price of `coin_in` quoted in `coin_out`.
+
+        Returns
+        -------
+        float or None
+            The estimated amount of "in" coin, or None if the inversion failed.
+        """
+        curve, fee, in_scale, price_scale = self._get_curve(coin_in, coin_out, True)
+        price_target /= (1 - fee) * price_scale
+        size = stableswap_trade_size(*curve, price_target)
+
+        if size is None:
+            return None
+        return size / in_scale
+
+    def _get_curve(self, coin_in, coin_out, use_fee):
+        """
+        Returns the stableswap curve moved by trading `coin_in` for `coin_out`,
+        as arguments (A, xp, D, i, j) to the functions in `trade_math`, and the
+        fee charged on that curve.
+
+        Also returns the factors converting the curve's quantities to the
+        pair's: curve balance units per unit of `coin_in`, and price of the
+        pair per curve price (with fees).  For trades between a metapool coin
+        and a basepool coin, these are taken from the current pool state.
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+        bp_token_index = self.n_total
+        max_coin = self.max_coin
+        pool = self
+        underlying = False
+
+        if bp_token_index in (i, j):
+            i, j = self.get_meta_asset_indices(i, j, bp_token_index)
+        elif i >= max_coin and j >= max_coin:
+            pool = self.basepool
+            i, j = i - max_coin, j - max_coin
+        else:
+            underlying = True
+            i, j = min(i, max_coin), min(j, max_coin)
+
+        xp = pool._xp()  # pylint: disable=protected-access
+        curve = (pool.A, xp, pool.D(xp), i, j)
+        in_scale = pool.rates[i] / 10**18
+
+        fee = 0
+        if use_fee:
+            fee = stableswap_fee_factor(pool, xp, i, j)
+
+        price_scale = 1.0
+        if underlying:
+            p, _ = stableswap_price_slope(*curve)
+            price_scale = self.price(coin_in, coin_out, use_fee) / (p * (1 - fee))
+
+            # basepool LP tokens per unit of the "in" coin
+            if i == max_coin:
+                in_scale *= price_scale
+
+        return curve, fee, in_scale, price_scale
+
     @override
     def trade(self, coin_in, coin_out, size):
         """
@@ -1,9 +1,17 @@
+import numpy as np
+
 from curvesim.exceptions import SimPoolError
 from curvesim.templates.sim_pool import SimPool
 from curvesim.utils import cache, override
 
 from ..stableswap import CurvePool
 from .asset_indices import AssetIndicesMixin
+from .trade_math import (
+    stableswap_fee_factor,
+    stableswap_price_gradient,
+    stableswap_price_slope,
+    stableswap_trade_size,
+)
 
 
 class SimCurvePool(SimPool, AssetIndicesMixin, CurvePool):
@@ -33,6 +41,15 @@ class SimCurvePool(SimPool, AssetIndicesMixin, CurvePool):
         """Return list of asset balances in same order as asset_names."""
         return self.balances
 
+    @property
+    @override
+    def fee_band_is_exact(self):
+        """
+        True unless the pool has dynamic fees: with a fixed fee, the price with
+        fees only decreases as more of `coin_in` is traded for `coin_out`.
+        """
+        return self.fee_mul is None
+
     @override
     def price(self, coin_in, coin_out, use_fee=True):
         """
@@ -64,6 +81,124 @@ class SimCurvePool(SimPool, AssetIndicesMixin, CurvePool):
         i, j = self.get_asset_indices(coin_in, coin_out)
         return self.dydx(i, j, use_fee=use_fee)
 
+    @override
+    def prices(self, pairs, use_fee=True):
+        """
+        Returns the spot prices of each (coin_in, coin_out) pair, as
+        :meth:`price`, computing the virtual balances and invariant once.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            (coin_in, coin_out) pairs of coin IDs.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        list of float
+            Price of `coin_in` quoted in `coin_out`, for each pair.
+        """
+        indices = [self.get_asset_indices(*pair) for pair in pairs]
+        return self.dydx_pairs(indices, use_fee=use_fee)
+
+    @override
+    def price_slope(self, coin_in, coin_out, use_fee=True):
+        """
+        Returns the derivative of :meth:`price` with respect to the amount of
+        `coin_in` traded for `coin_out`, holding `D` fixed.
+
+        Dynamic fees are treated as constant.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        float
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+        xp = self._xp()
+        _, slope = stableswap_price_slope(self.A, xp, self.D(xp), i, j)
+
+        if use_fee:
+            slope *= 1 - stableswap_fee_factor(self, xp, i, j)
+        return slope
+
+    @override
+    def price_jacobian(self, pairs, use_fee=True):
+        """
+        Returns the derivatives of :meth:`price` for each coin pair with respect
+        to the amount traded for each coin pair, holding `D` fixed.
+
+        Dynamic fees are treated as constant.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            (coin_in, coin_out) pairs of coin IDs.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square matrix whose entry `[k, m]` is the derivative of the price of
+            `pairs[k]` with respect to the amount of `pairs[m][0]` traded for
+            `pairs[m][1]`.
+        """
+        xp = self._xp()
+        D = self.D(xp)
+
+        gradients = []
+        directions = np.zeros((len(xp), len(pairs)))
+        for m, pair in enumerate(pairs):
+            i, j = self.get_asset_indices(*pair)
+            p, grad = stableswap_price_gradient(self.A, xp, D, i, j)
+            if use_fee:
+                grad = np.multiply(grad, 1 - stableswap_fee_factor(self, xp, i, j))
+            gradients.append(grad)
+
+            # along the curve, d(xp[j])/d(xp[i]) = -p
+            directions[i, m] = 1
+            directions[j, m] = -p
+
+        return np.array(gradients) @ directions
+
+    @override
+    def estimate_trade_size(self, coin_in, coin_out, price_target):
+        """
+        Returns an estimate of the amount of `coin_in` to trade for `coin_out`
+        to move :meth:`price` (with fees) to `price_target`.
+
+        The price target is inverted along the stableswap curve, ignoring fees
+        retained by the pool.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        price_target : float
+            Target price of `coin_in` quoted in `coin_out`.
+
+        Returns
+        -------
+        float or None
+            The estimated amount of "in" coin, or None if the inversion failed.
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+        xp = self._xp()
+        price_target /= 1 - stableswap_fee_factor(self, xp, i, j)
+        return stableswap_trade_size(self.A, xp, self.D(xp), i, j, price_target)
+
     @override
     def trade(self, coin_in, coin_out, size):
         """
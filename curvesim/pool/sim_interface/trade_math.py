@@ -0,0 +1,350 @@
+"""
+Floating-point approximations of spot price derivatives and trade sizes, used
+to seed and step arbitrage solvers.
+
+All functions hold the invariant `D` fixed, i.e. they ignore fees retained by
+the pool and any state updates done by a trade, so they are only estimates of
+the outcome of a simulated trade.
+
+Balances (`xp`) are in units of `D`.
+"""
+
+from math import isfinite, prod, sqrt
+
+
+def stableswap_price_gradient(A, xp, D, i, j):
+    """
+    Returns the spot price of coin `i` in coin `j` (without fees) and its
+    partial derivatives with respect to each balance, holding `D` fixed.
+
+    Parameters
+    ----------
+    A : int
+        Amplification coefficient, as stored by the pool.
+    xp : list of int
+        Coin balances in units of `D`.
+    D : int
+        Stableswap invariant.
+    i : int
+        Index of the "in" coin.
+    j : int
+        Index of the "out" coin.
+
+    Returns
+    -------
+    (float, list of float)
+        The spot price and its gradient.
+    """
+    n = len(xp)
+    D = float(D)
+    u = [float(x) / D for x in xp]  # normalize so D = 1
+    ui = u[i]
+    uj = u[j]
+
+    aP = A * n ** (n + 1) * prod(u)
+    T = ui * uj * aP
+    N = T + uj
+    M = T + ui
+    p = N / M
+
+    grad = []
+    for k, uk in enumerate(u):
+        # aP is linear in each balance
+        dT = T / uk + (k == i) * uj * aP + (k == j) * ui * aP
+        dN = dT + (k == j)
+        dM = dT + (k == i)
+        grad.append((dN - p * dM) / M / D)
+
+    return p, grad
+
+
+def stableswap_invariant_gradient(A, xp, D):
+    """
+    Returns the partial derivatives of the stableswap invariant `D` with respect
+    to each balance, and the derivatives of their logs with respect to each
+    balance, with `D` varying.
+
+    The derivatives of `D` are the marginal values of the coins in units of
+    `D`, e.g. in virtual LP tokens for deposits and withdrawals.
+
+    Parameters
+    ----------
+    A : int
+        Amplification coefficient, as stored by the pool.
+    xp : list of int
+        Coin balances in units of `D`.
+    D : int
+        Stableswap invariant.
+
+    Returns
+    -------
+    (list of float, list of list of float)
+        The gradient of `D`, and the Jacobian of its log, with entry `[j][m]`
+        the derivative of the log of the j-th component with respect to the
+        m-th balance.
+    """
+    n = len(xp)
+    D = float(D)
+    u = [float(x) / D for x in xp]  # normalize so D = 1
+
+    # Implicit differentiation of the invariant F(x, D) = 0 gives
+    # dD/dx_j = -N_j / E, with N_j and E the partial derivatives of F with
+    # respect to x_j and D (simplified using F = 0)
+    P = prod(u)
+    aP = A * n ** (n + 1) * P
+    N = [aP + 1 / uj for uj in u]
+    E = n**n * P - aP - (n + 1)
+    grad = [-Nj / E for Nj in N]
+
+    dE = [(n**n * P - aP) / um - (n + 1) * n * gm for um, gm in zip(u, grad)]
+    log_jacobian = []
+    for j, uj in enumerate(u):
+        row = []
+        for m, (um, gm) in enumerate(zip(u, grad)):
+            dN = aP / um - (m == j) / uj**2 + (n + 1) / uj * gm
+            row.append((dN / N[j] - dE[m] / E) / D)
+        log_jacobian.append(row)
+
+    return grad, log_jacobian
+
+
+def stableswap_price_slope(A, xp, D, i, j):
+    """
+    Returns the spot price of coin `i` in coin `j` (without fees) and its
+    derivative with respect to `xp[i]` along the stableswap curve.
+
+    Parameters
+    ----------
+    A : int
+        Amplification coefficient, as stored by the pool.
+    xp : list of int
+        Coin balances in units of `D`.
+    D : int
+        Stableswap invariant.
+    i : int
+        Index of the "in" coin.
+    j : int
+        Index of the "out" coin.
+
+    Returns
+    -------
+    (float, float)
+        The spot price and its derivative.
+    """
+    p, grad = stableswap_price_gradient(A, xp, D, i, j)
+
+    # along the curve, d(xp[j])/d(xp[i]) = -p
+    return p, grad[i] - p * grad[j]
+
+
+def stableswap_fee_factor(pool, xp, i, j):
+    """
+    Returns the fee of a stableswap pool, as a fraction, for a trade between
+    coins `i` and `j` at balances `xp`.
+    """
+    if pool.fee_mul is None:
+        return pool.fee / 10**10
+    return pool.dynamic_fee(xp[i], xp[j]) / 10**10
+
+
+def stableswap_trade_size(A, xp, D, i, j, price_target, max_iter=50):
+    """
+    Returns the amount of coin `i`, in units of `D`, to trade for coin `j` so
+    that the spot price (without fees) equals `price_target`.
+
+    Inverts the price along the stableswap curve using Newton's method, solving
+    the y-equation (see :meth:`.CurvePool.get_y`) in closed form at each step.
+
+    Returns None if the iteration fails to converge.
+    """
+    n = len(xp)
+    D = float(D)
+    u = [float(x) / D for x in xp]
+    Ann = A * n
+
+    others = [u[k] for k in range(n) if k not in (i, j)]
+    prod_others = prod(others)
+    sum_others = sum(others)
+
+    # price decreases in ui, so [lower, upper] brackets the solution
+    lower = 0.0
+    upper = float("inf")
+
+    ui = u[i]
+    for _ in range(max_iter):
+        # y-equation: y**2 + b * y = c
+        c = 1 / (ui * prod_others * n**n * Ann)
+        b = ui + sum_others + 1 / Ann - 1
+        disc = sqrt(b * b + 4 * c)
+        uj = 2 * c / (b + disc) if b > 0 else (disc - b) / 2
+
+        u[i] = ui
+        u[j] = uj
+        p, slope = stableswap_price_slope(A, u, 1, i, j)
+
+        if p > price_target:
+            lower = ui
+        else:
+            upper = ui
+
+        step = (price_target - p) / slope
+        if not isfinite(step):
+            return None
+
+        ui_next = ui + step
+        if not lower < ui_next < upper:
+            ui_next = (lower + upper) / 2
+
+        if abs(ui_next - ui) <= 1e-12 * ui:
+            return (ui_next - float(xp[i]) / D) * D
+
+        ui = ui_next
+
+    return None
+
+
+# pylint: disable-next=too-many-arguments,too-many-locals
+def cryptoswap_price_gradient(A, gamma, xp, D, i, j):
+    """
+    Returns the spot price of coin `i` in coin `j` (without fees) and its
+    partial derivatives with respect to each balance, holding `D` fixed.
+
+    Parameters
+    ----------
+    A : int
+        Amplification coefficient, as stored by the pool.
+    gamma : int
+        Gamma parameter of the pool.
+    xp : list of int
+        Coin balances in units of `D`.
+    D : int
+        Cryptoswap invariant.
+    i : int
+        Index of the "in" coin.
+    j : int
+        Index of the "out" coin.
+
+    Returns
+    -------
+    (float, list of float)
+        The spot price and its gradient.
+    """
+    n = len(xp)
+    one = 10**18
+    A_multiplier = 10**4
+    D = float(D)
+    x = [float(_x) for _x in xp]
+    xi = x[i]
+    xj = x[j]
+
+    # Price, as in CurveCryptoPool.dydx
+    K0 = one * n**n * prod(_x / D for _x in x)
+    u = one + gamma - K0
+    w = one + gamma + K0
+    S = sum(x)
+
+    coeff = A * gamma**2 / u**2
+    frac = w * (S - D) / u
+    top = xj * (A_multiplier * D + coeff * (xi + frac))
+    bottom = xi * (A_multiplier * D + coeff * (xj + frac))
+    p = top / bottom
+
+    grad = []
+    for k, xk in enumerate(x):
+        dK0 = K0 / xk
+        dcoeff = 2 * coeff * dK0 / u
+        dfrac = (dK0 * (S - D) + w) / u + frac * dK0 / u
+
+        dtop = (k == j) * (A_multiplier * D + coeff * (xi + frac)) + xj * (
+            dcoeff * (xi + frac) + coeff * ((k == i) + dfrac)
+        )
+        dbottom = (k == i) * (A_multiplier * D + coeff * (xj + frac)) + xi * (
+            dcoeff * (xj + frac) + coeff * ((k == j) + dfrac)
+        )
+        grad.append((dtop * bottom - top * dbottom) / bottom**2)
+
+    return p, grad
+
+
+def cryptoswap_fee_gradient(xp, mid_fee, out_fee, fee_gamma):
+    """
+    Returns the dynamic fee of a cryptoswap pool, as a fraction, and its
+    partial derivatives with respect to each balance.
+
+    Parameters
+    ----------
+    xp : list of int
+        Coin balances in units of `D`.
+    mid_fee : int
+        Fee with balanced coins.
+    out_fee : int
+        Fee with imbalanced coins.
+    fee_gamma : int
+        Rate of transition from `mid_fee` to `out_fee`.
+
+    Returns
+    -------
+    (float, list of float)
+        The fee and its gradient.
+    """
+    n = len(xp)
+    one = 10**18
+    x = [float(_x) for _x in xp]
+    S = sum(x)
+
+    # Fee, as in CurveCryptoPool._fee
+    K = one * n**n * prod(_x / S for _x in x)
+    f = fee_gamma * one / (fee_gamma + one - K)
+    fee = (mid_fee * f + out_fee * (one - f)) / one / 10**10
+
+    grad = []
+    for xk in x:
+        dK = K * (1 / xk - n / S)
+        df = fee_gamma * one * dK / (fee_gamma + one - K) ** 2
+        grad.append((mid_fee - out_fee) * df / one / 10**10)
+
+    return fee, grad
+
+
+# pylint: disable-next=too-many-arguments
+def cryptoswap_price_slope(A, gamma, xp, D, i, j, fee_params=None):
+    """
+    Returns the spot price of coin `i` in coin `j` and its derivative with
+    respect to `xp[i]` along the cryptoswap curve, in units of `D`.
+
+    Parameters
+    ----------
+    A : int
+        Amplification coefficient, as stored by the pool.
+    gamma : int
+        Gamma parameter of the pool.
+    xp : list of int
+        Coin balances in units of `D`.
+    D : int
+        Cryptoswap invariant.
+    i : int
+        Index of the "in" coin.
+    j : int
+        Index of the "out" coin.
+    fee_params : tuple, optional
+        (mid_fee, out_fee, fee_gamma) to deduct the dynamic fee, which
+        depends on the balances.
+
+    Returns
+    -------
+    (float, float)
+        The spot price and its derivative.
+    """
+    p, grad = cryptoswap_price_gradient(A, gamma, xp, D, i, j)
+
+    # along the curve, d(xp[j])/d(xp[i]) = -p
+    slope = grad[i] - p * grad[j]
+
+    if fee_params is not None:
+        fee, fee_grad = cryptoswap_fee_gradient(xp, *fee_params)
+        dfee = fee_grad[i] - p * fee_grad[j]
+
+        slope = slope * (1 - fee) - p * dfee
+        p = p * (1 - fee)
+
+    return p, slope
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from copy import copy
 from typing import Optional, Type
 
 from curvesim.exceptions import SnapshotError
@@ -72,6 +73,37 @@ class SnapshotMixin:
         """
         snapshot.restore(self)
 
+    def clone(self):
+        """
+        Returns a shallow copy of the pool with its own copy of the partial
+        state, so it can be traded on independently of the pool, e.g.
+        concurrently.  Attributes that are pools (e.g. a metapool's basepool)
+        are cloned as well.
+        """
+        pool = copy(self)
+        for name, value in _get_attributes(self).items():
+            if isinstance(value, SnapshotMixin):
+                setattr(pool, name, value.clone())
+        pool.revert_to_snapshot(self.get_snapshot())
+        return pool
+
+    def update_clone(self, pool):
+        """
+        Sets the attributes of a clone of the pool (see :meth:`clone`) to the
+        pool's current values, so clones can be reused.
+
+        Parameters
+        -----------
+        pool: object
+            A clone of the pool.
+        """
+        for name, value in _get_attributes(self).items():
+            if isinstance(value, SnapshotMixin):
+                value.update_clone(getattr(pool, name))
+            else:
+                setattr(pool, name, value)
+        pool.revert_to_snapshot(self.get_snapshot())
+
     @contextmanager
     def use_snapshot_context(self):
         """
@@ -96,6 +128,17 @@ class SnapshotMixin:
             self.revert_to_snapshot(snapshot)
 
 
+def _get_attributes(obj):
+    """Returns a dict of an object's instance attributes, including slots."""
+    attributes = {}
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(obj, name) and name not in ("__dict__", "__weakref__"):
+                attributes[name] = getattr(obj, name)
+    attributes.update(getattr(obj, "__dict__", {}))
+    return attributes
+
+
 class CurvePoolBalanceSnapshot(Snapshot):
     """Snapshot that saves pool balances and admin balances."""
 
@@ -710,7 +710,6 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         return self.dydx(i, j, use_fee=True)
 
-    # pylint: disable-next=too-many-locals
     def dydx(self, i, j, use_fee=False):
         r"""
         Returns the spot price of i-th coin quoted in terms of j-th coin,
@@ -759,17 +758,58 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
                 D' = -1 ( A n^{n+1} \prod{x_k} + D^{n+1} / x_i)
                         / ( n^n \prod{x_k} - A n^{n+1} \prod{x_k} - (n + 1) D^n
         """  # noqa
-        base_i = i - self.max_coin
-        base_j = j - self.max_coin
+        return self.dydx_pairs([(i, j)], use_fee=use_fee)[0]
 
-        # both in and out tokens are in basepool
-        if base_i >= 0 and base_j >= 0:
-            _dydx = self.basepool.dydx(base_i, base_j, use_fee=use_fee)
-            return float(_dydx)
+    def dydx_pairs(self, pairs, use_fee=False):
+        """
+        Returns the spot prices of each (i, j) pair of coin indices, as
+        :meth:`dydx`, with the virtual balances and invariants computed once.
 
-        rates = self.rates
-        xp = [mpz(x) * p // 10**18 for x, p in zip(self.balances, rates)]
+        The indices are assumed to include base pool underlyer indices.
+
+        Parameters
+        ----------
+        pairs: list of tuple
+            (i, j) pairs of coin indices.
+        use_fee: bool, default=False
+            Deduct fees.
+
+        Returns
+        -------
+        list of float
+            Price of i-th coin quoted in j-th coin, for each pair.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        max_coin = self.max_coin
+        base_pairs = [(i, j) for i, j in pairs if i >= max_coin and j >= max_coin]
+        primary_pairs = [(i, j) for i, j in pairs if i < max_coin]
 
+        prices = {}
+        if base_pairs:
+            base_indices = [(i - max_coin, j - max_coin) for i, j in base_pairs]
+            base_prices = self.basepool.dydx_pairs(base_indices, use_fee=use_fee)
+            prices.update(zip(base_pairs, base_prices))
+
+        xp = [mpz(x) * p // 10**18 for x, p in zip(self.balances, self.rates)]
+        if primary_pairs:
+            base_js = [j - max_coin for _, j in primary_pairs]
+            primary_prices = self._dydx_from_primary(base_js, xp, use_fee)
+            prices.update(zip(primary_pairs, primary_prices))
+
+        for i, j in pairs:
+            if (i, j) not in prices:
+                prices[i, j] = self._dydx_from_base(i - max_coin, j, xp, use_fee)
+
+        return [float(prices[i, j]) for i, j in pairs]
+
+    def _dydx_from_primary(self, base_js, xp, use_fee):
+        """
+        Returns the spot prices of the primary coin quoted in each of the
+        basepool coins `base_js`; see the formulae in :meth:`dydx`.
+        """
         bp = self.basepool
         base_xp = [mpz(x) * p // 10**18 for x, p in zip(bp.balances, bp.rates)]
         x_prod = prod(base_xp)
@@ -779,7 +819,10 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         D_pow = D ** (n + 1)
         A_pow = A * n ** (n + 1)
 
-        if base_i < 0:  # i is primary
+        dwdz = self._dydx(0, self.max_coin, xp, use_fee)
+
+        prices = []
+        for base_j in base_js:
             xj = base_xp[base_j]
             D_prime = (
                 -1
@@ -788,7 +831,6 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
             )
             D_prime = float(D_prime)
 
-            dwdz = self._dydx(0, self.max_coin, xp, use_fee)
             _dydx = dwdz / D_prime
 
             if use_fee and bp.fee:
@@ -796,33 +838,41 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
             else:
                 fee = 0
             _dydx *= 1 - fee / 10**10
+            prices.append(_dydx)
 
-        else:  # i is from basepool
-            dx = 10**12
-            base_inputs = [0] * self.basepool.n
-            base_inputs[base_i] = dx * 10**18 // self.basepool.rates[base_i]
+        return prices
 
-            dw, _ = self.basepool.calc_token_amount(base_inputs, use_fee=True)
-            # Convert lp token amount to virtual units
-            dw = dw * rates[self.max_coin] // 10**18
-            x = xp[self.max_coin] + dw
+    def _dydx_from_base(self, base_i, j, xp, use_fee):
+        """
+        Returns the spot price of basepool coin `base_i` quoted in primary coin
+        `j`, from the output of a small trade.
+        """
+        rates = self.rates
 
-            meta_i = self.max_coin
-            meta_j = j
-            y = self.get_y(meta_i, meta_j, x, xp)
+        dx = 10**12
+        base_inputs = [0] * self.basepool.n
+        base_inputs[base_i] = dx * 10**18 // self.basepool.rates[base_i]
 
-            dy = xp[meta_j] - y - 1
-            if use_fee:
-                dy_fee = dy * self.fee // 10**10
-            else:
-                dy_fee = 0
-            dy -= dy_fee
+        dw, _ = self.basepool.calc_token_amount(base_inputs, use_fee=True)
+        # Convert lp token amount to virtual units
+        dw = dw * rates[self.max_coin] // 10**18
+        x = xp[self.max_coin] + dw
 
-            _dydx = dy / dx
+        meta_i = self.max_coin
+        meta_j = j
+        y = self.get_y(meta_i, meta_j, x, xp)
+
+        dy = xp[meta_j] - y - 1
+        if use_fee:
+            dy_fee = dy * self.fee // 10**10
+        else:
+            dy_fee = 0
+        dy -= dy_fee
 
-        return float(_dydx)
+        return dy / dx
 
-    def _dydx(self, i, j, xp, use_fee=False):
+    # pylint: disable-next=too-many-arguments
+    def _dydx(self, i, j, xp, use_fee=False, D=None):
         """
         Treats indices as applying to the "top-level" pool if a metapool.
         Basically this is the "regular" pricing calc with no special metapool
@@ -846,6 +896,8 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
             "Virtual" coin balances, i.e. balances in units of D
         use_fee: bool, default=False
             Deduct fees
+        D: int, optional
+            Invariant for `xp`, if already computed
 
         Returns
         -------
@@ -860,7 +912,8 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         xj = xp[j]
         n = self.n
         A = self.A
-        D = self.D(xp)
+        if D is None:
+            D = self.D(xp)
         D_pow = mpz(D) ** (n + 1)
         x_prod = prod(xp)
         A_pow = A * n ** (n + 1)
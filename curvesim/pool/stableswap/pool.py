@@ -697,12 +697,39 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         xp = self._xp()
         return self._dydx(i, j, xp, use_fee)
 
-    def _dydx(self, i, j, xp, use_fee):
+    def dydx_pairs(self, pairs, use_fee=False):
+        """
+        Returns the spot prices of each (i, j) pair of coin indices, as
+        :meth:`dydx`, with the virtual balances and invariant computed once.
+
+        Parameters
+        ----------
+        pairs: list of tuple
+            (i, j) pairs of coin indices.
+        use_fee: bool, default=False
+            Deduct fees.
+
+        Returns
+        -------
+        list of float
+            Price of i-th coin quoted in j-th coin, for each pair.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        xp = self._xp()
+        D = self.D(xp)
+        return [self._dydx(i, j, xp, use_fee, D=D) for i, j in pairs]
+
+    # pylint: disable-next=too-many-arguments
+    def _dydx(self, i, j, xp, use_fee, D=None):
         xi = xp[i]
         xj = xp[j]
         n = self.n
         A = self.A
-        D = self.D(xp)
+        if D is None:
+            D = self.D(xp)
         D_pow = mpz(D) ** (n + 1)
         x_prod = prod(xp)
         A_pow = A * n ** (n + 1)
@@ -31,16 +31,20 @@ class CurveRaiPool(CurveMetaPool):
         """
         super().__init__(*args, rate_multiplier=redemption_price, **kwargs)
 
-    def dydx(self, i, j, use_fee=False):
-        _dydx = super().dydx(i, j, use_fee=use_fee)
+    def dydx_pairs(self, pairs, use_fee=False):
+        prices = super().dydx_pairs(pairs, use_fee=use_fee)
 
-        if i >= self.max_coin and j == 0:
-            base_i = i - self.max_coin
-            _dydx = _dydx * self.basepool.rates[base_i] / self.rate_multiplier
+        for k, (i, j) in enumerate(pairs):
+            if i >= self.max_coin and j == 0:
+                base_i = i - self.max_coin
+                prices[k] = (
+                    prices[k] * self.basepool.rates[base_i] / self.rate_multiplier
+                )
 
-        return _dydx
+        return prices
 
-    def _dydx(self, i, j, xp, use_fee=False):
-        dydx = super()._dydx(i, j, xp, use_fee=use_fee)
+    # pylint: disable-next=too-many-arguments
+    def _dydx(self, i, j, xp, use_fee=False, D=None):
+        dydx = super()._dydx(i, j, xp, use_fee=use_fee, D=D)
         rates = self.rates
         return dydx * rates[i] / rates[j]
@@ -129,6 +129,24 @@ def autosim(
     ncpu : int, default=os.cpu_count()
         Number of cores to use.
 
+    executor : :class:`~curvesim.templates.Executor`, optional
+        Executor used to run the simulations, overriding `ncpu`.  Pass a
+        :class:`~curvesim.pipelines.executors.ProcessExecutor` to reuse its
+        worker processes across calls.
+
+    vectorized : bool, default=False
+        If True, arbitrage each pair in floating point over the whole series
+        instead of optimizing integer-exact trades.  Only supported for
+        stableswap non-meta pools.
+
+    metric_freqs : dict, optional
+        Maps metric classes to the fixed pandas frequency (e.g., "1D") at which
+        to sample them.  Other metrics are computed at every timestamp.
+
+    data_per_trade : bool or str, default=True
+        If False, only summary data is returned for each run.  If a fixed pandas
+        frequency (e.g., "1D"), per-timestamp data is downsampled to it.
+
     env: str, default='prod'
         Environment for the Curve subgraph, which pulls pool and volume snapshots.
 
@@ -5,6 +5,7 @@ Functions and interfaces used in the simulation pipeline framework.
 __all__ = [
     "ApiDataSource",
     "DataSource",
+    "Executor",
     "FileDataSource",
     "Log",
     "ParameterSampler",
@@ -23,6 +24,7 @@ __all__ = [
 ]
 
 from .data_source import ApiDataSource, DataSource, FileDataSource
+from .executor import Executor
 from .log import Log
 from .param_samplers import ParameterSampler
 from .price_samplers import PriceSample, PriceSampler
@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+
+from curvesim.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Executor(ABC):
+    """
+    Runs a strategy for each pool produced by a parameter sampler.
+
+    Executors decide where and how simulation runs are executed (e.g., serially,
+    in a local process pool, or across multiple machines).  They can be used as
+    context managers to release their resources on exit.
+    """
+
+    @abstractmethod
+    def run(self, strategy, param_sampler, price_sampler):
+        """
+        Runs the strategy for each pool/parameter set in the parameter sampler.
+
+        Parameters
+        ----------
+        strategy : callable
+            A function dictating what happens at each timestep.
+
+        param_sampler : iterator
+            An iterator that returns pools and their parameters.
+
+        price_sampler : iterator
+            An iterator that returns (minimally) a time-series of prices.
+
+        Returns
+        -------
+        list
+            The strategy's output for each run, in parameter sampler order.
+        """
+        raise NotImplementedError
+
+    def shutdown(self):
+        """
+        Releases any resources held by the executor.
+
+        Base implementation is a no-op.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
@@ -39,6 +39,18 @@ class SimPool(ABC):
             The price time_series, price_sampler.prices.
         """
 
+    @property
+    def fee_band_is_exact(self):
+        """
+        Whether the spot prices with fees (see :meth:`price`) bound the price
+        after any trade in the same direction, so that no arbitrage trade is
+        profitable if the market price is within the pool's bid/ask band.
+
+        Arbitrage solvers only skip pairs priced within the band if True.  Base
+        implementation returns False.
+        """
+        return False
+
     @abstractmethod
     def price(self, coin_in, coin_out, use_fee=True):
         """
@@ -69,6 +81,28 @@ class SimPool(ABC):
         """
         raise NotImplementedError
 
+    def prices(self, pairs, use_fee=True):
+        """
+        Returns the spot prices of each (coin_in, coin_out) pair, as
+        :meth:`price`.
+
+        Base implementation calls :meth:`price` for each pair; pools can
+        override it to share computations between pairs.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            (coin_in, coin_out) pairs of coin IDs.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        list of float
+            Price of `coin_in` quoted in `coin_out`, for each pair.
+        """
+        return [self.price(*pair, use_fee=use_fee) for pair in pairs]
+
     @abstractmethod
     def trade(self, coin_in, coin_out, size):
         """
@@ -121,6 +155,81 @@ class SimPool(ABC):
         """
         raise NotImplementedError
 
+    # pylint: disable-next=unused-argument
+    def price_slope(self, coin_in, coin_out, use_fee=True):
+        """
+        Returns the derivative of :meth:`price` with respect to the amount of
+        `coin_in` traded for `coin_out`, at the current pool state.
+
+        Used by arbitrage solvers to take Newton steps.  Base implementation
+        returns None, in which case solvers use derivative-free methods.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        float or None
+            Derivative of the price of `coin_in` quoted in `coin_out`.
+        """
+        return None
+
+    # pylint: disable-next=unused-argument
+    def estimate_trade_size(self, coin_in, coin_out, price_target):
+        """
+        Returns an estimate of the amount of `coin_in` to trade for `coin_out`
+        to move :meth:`price` (with fees) to `price_target`.
+
+        Used by arbitrage solvers as an initial guess.  Base implementation
+        returns None.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        price_target : float
+            Target price of `coin_in` quoted in `coin_out`.
+
+        Returns
+        -------
+        float or None
+            The estimated amount of "in" coin.
+        """
+        return None
+
+    # pylint: disable-next=unused-argument
+    def price_jacobian(self, pairs, use_fee=True):
+        """
+        Returns the derivatives of :meth:`price` for each coin pair with respect
+        to the amount traded for each coin pair, at the current pool state.
+
+        Used by the multi-pair arbitrage optimizer in place of finite
+        differences.  Base implementation returns None.
+
+        Parameters
+        ----------
+        pairs : list of tuple
+            (coin_in, coin_out) pairs of coin IDs.
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray or None
+            Square matrix whose entry `[k, m]` is the derivative of the price of
+            `pairs[k]` with respect to the amount of `pairs[m][0]` traded for
+            `pairs[m][1]`.
+        """
+        return None
+
     def get_min_trade_size(self, coin_in):
         """
         Return the minimal trade size allowed for the pool.
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sized
 from typing import Optional, Type
 
 from curvesim.logging import get_logger
@@ -33,14 +34,20 @@ class Strategy(ABC):
     trader_class: Optional[Type[Trader]] = None
     log_class: Optional[Type[Log]] = None
 
-    def __init__(self, metrics):
+    def __init__(self, metrics, trader_kwargs=None, log_kwargs=None):
         """
         Parameters
         ----------
         metrics : List[Metric]
             A list of metrics used to evaluate the performance of the strategy.
+        trader_kwargs : dict, optional
+            Keyword arguments to create trader instances with.
+        log_kwargs : dict, optional
+            Keyword arguments to create log instances with.
         """
         self.metrics = metrics
+        self.trader_kwargs = trader_kwargs or {}
+        self.log_kwargs = log_kwargs or {}
 
     def __call__(self, pool, parameters, price_sampler):
         """
@@ -66,22 +73,43 @@ class Strategy(ABC):
 
         """
         # pylint: disable=not-callable
-        trader = self.trader_class(pool)
-        log = self.log_class(pool, self.metrics)
+        trader = self.trader_class(pool, **self.trader_kwargs)
+        length = len(price_sampler) if isinstance(price_sampler, Sized) else None
+        log = self.log_class(pool, self.metrics, length=length, **self.log_kwargs)
 
         parameters = parameters or "no parameter changes"
         logger.info("[%s] Simulating with %s", pool.symbol, parameters)
 
         pool.prepare_for_run(price_sampler.prices)
+        self.prepare_for_run(price_sampler)
 
-        for sample in price_sampler:
-            pool.prepare_for_trades(sample.timestamp)
-            trader_args = self._get_trader_inputs(sample)
-            trade_data = trader.process_time_sample(*trader_args)
-            log.update(price_sample=sample, trade_data=trade_data)
+        try:
+            for sample in price_sampler:
+                pool.prepare_for_trades(sample.timestamp)
+                trader_args = self._get_trader_inputs(sample)
+                trade_data = trader.process_time_sample(*trader_args)
+                log.update(price_sample=sample, trade_data=trade_data)
+        finally:
+            trader.shutdown()
+
+        if trader.stats:
+            logger.debug("[%s] Trader stats: %s", pool.symbol, dict(trader.stats))
 
         return log.compute_metrics()
 
+    def prepare_for_run(self, price_sampler):
+        """
+        Does any necessary preparation before beginning a simulation run,
+        e.g. precomputing trader inputs for all timesteps.
+
+        Base implementation is a no-op.
+
+        Parameters
+        ----------
+        price_sampler : iterable
+            The price sampler for the run.
+        """
+
     @abstractmethod
     def _get_trader_inputs(self, sample):
         """
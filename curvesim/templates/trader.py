@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections import Counter
 from dataclasses import fields
 from typing import Union
 
@@ -59,6 +60,12 @@ class TradeResult:
 class Trader(ABC):
     """
     Computes, executes, and reports out arbitrage trades.
+
+    Attributes
+    ----------
+    stats : collections.Counter
+        Counts of solver work over the trader's lifetime, e.g. the number of
+        trade simulations run to size arbitrage trades.
     """
 
     def __init__(self, pool):
@@ -70,6 +77,7 @@ class Trader(ABC):
 
         """
         self.pool = pool
+        self.stats = Counter()
 
     @abstractmethod
     def compute_trades(self, *args):
@@ -109,6 +117,14 @@ class Trader(ABC):
 
         return trade_results
 
+    def shutdown(self):
+        """
+        Releases any resources held by the trader, at the end of a simulation
+        run.
+
+        Base implementation is a no-op.
+        """
+
     def process_time_sample(self, *args):
         """
         Process given tick data by computing and executing trades.
@@ -0,0 +1,357 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from scipy.optimize import least_squares
+
+from curvesim.pipelines.common import ArbSolverState, get_arb_trades
+from curvesim.pipelines.common.arb_solver import solve_arb_size
+from curvesim.pipelines.vol_limited_arb.trader import (
+    levenberg_marquardt,
+    multipair_optimal_arbitrage,
+)
+from curvesim.pool.sim_interface import (
+    SimCurveCryptoPool,
+    SimCurveMetaPool,
+    SimCurvePool,
+)
+
+
+def _make_stableswap_pool():
+    return SimCurvePool(A=250, D=3000000 * 10**18, n=3, admin_fee=5 * 10**9)
+
+
+def _make_metapool():
+    basepool = SimCurvePool(A=1000, D=20000000 * 10**18, n=2, admin_fee=5 * 10**9)
+    return SimCurveMetaPool(
+        A=250, D=4000000 * 10**18, n=2, admin_fee=5 * 10**9, basepool=basepool
+    )
+
+
+def _make_cryptoswap_pool():
+    return SimCurveCryptoPool(
+        A=400000,
+        gamma=72500000000000,
+        n=2,
+        precisions=[1, 1],
+        mid_fee=26000000,
+        out_fee=45000000,
+        allowed_extra_profit=2000000000000,
+        fee_gamma=230000000000000,
+        adjustment_step=146000000000000,
+        admin_fee=5000000000,
+        ma_half_time=600,
+        price_scale=[1550997347493624157],
+        balances=[20477317313816545807568241, 13270936465339000000000000],
+        tokens=1550997347493624157 * 10**7,
+        xcp_profit=10**18,
+        xcp_profit_a=10**18,
+    )
+
+
+# (pool factory, pairs, relative tolerance of slope against finite difference)
+POOLS = [
+    (_make_stableswap_pool, [(0, 1), (2, 0)], 1e-3),
+    (_make_metapool, [(0, 3), (3, 0), (1, 2)], 1e-3),
+    (_make_metapool, [(0, 1), (2, 0)], 5e-2),  # metapool coin to basepool coin
+    (_make_cryptoswap_pool, [(0, 1), (1, 0)], 2e-1),
+]
+
+
+def _post_trade_price(pool, coin_in, coin_out, size):
+    with pool.use_snapshot_context():
+        pool.trade(coin_in, coin_out, size)
+        return pool.price(coin_in, coin_out)
+
+
+@pytest.mark.parametrize("make_pool,pairs,rtol", POOLS)
+def test_price_slope(make_pool, pairs, rtol):
+    """Test that price slopes match finite differences of simulated trades."""
+    pool = make_pool()
+    for coin_in, coin_out in pairs:
+        size = 10**21
+        price = pool.price(coin_in, coin_out)
+        post_trade_price = _post_trade_price(pool, coin_in, coin_out, size)
+        expected = (post_trade_price - price) / size
+
+        slope = pool.price_slope(coin_in, coin_out)
+        assert slope < 0
+        assert slope == pytest.approx(expected, rel=rtol)
+
+
+@pytest.mark.parametrize("make_pool,pairs,rtol", POOLS)
+def test_solve_arb_size(make_pool, pairs, rtol):
+    """Test that the Newton solver agrees with brentq in fewer evaluations."""
+    pool = make_pool()
+    for coin_in, coin_out in pairs:
+        for price_change in [0.999, 0.99, 0.9]:
+            price_target = pool.price(coin_in, coin_out) * price_change
+            lower = pool.get_min_trade_size(coin_in)
+            bracket = (lower, pool.get_max_trade_size(coin_in, coin_out))
+            error_at_lower = (
+                _post_trade_price(pool, coin_in, coin_out, lower) - price_target
+            )
+
+            args = (pool, coin_in, coin_out, price_target, bracket, error_at_lower)
+            brentq_stats = Counter()
+            expected = solve_arb_size(*args, method="brentq", stats=brentq_stats)
+            newton_stats = Counter()
+            size = solve_arb_size(*args, method="newton", stats=newton_stats)
+
+            assert size == pytest.approx(expected, rel=1e-7)
+            assert newton_stats["arb_evaluations"] < brentq_stats["arb_evaluations"]
+
+
+def test_solve_arb_size_initial_guess():
+    """Test that pools without price slopes use secant steps from `x0`."""
+    pool = _make_stableswap_pool()
+    pool.price_slope = lambda *args, **kwargs: None
+    pool.estimate_trade_size = lambda *args, **kwargs: None
+
+    price_target = pool.price(0, 1) * 0.99
+    lower = pool.get_min_trade_size(0)
+    bracket = (lower, pool.get_max_trade_size(0, 1))
+    error_at_lower = _post_trade_price(pool, 0, 1, lower) - price_target
+    args = (pool, 0, 1, price_target, bracket, error_at_lower)
+
+    brentq_stats = Counter()
+    expected = solve_arb_size(*args, method="brentq", stats=brentq_stats)
+    secant_stats = Counter()
+    size = solve_arb_size(*args, x0=expected * 1.1, stats=secant_stats)
+
+    assert size == pytest.approx(expected, rel=1e-7)
+    assert secant_stats["arb_evaluations"] < brentq_stats["arb_evaluations"]
+
+
+@pytest.mark.parametrize("method", ["brentq", "newton"])
+def test_get_arb_trades_warm_start(method):
+    """Test that warm-started solves find the same trades."""
+    pool = _make_stableswap_pool()
+    prices = {(0, 1): 0.99, (0, 2): 1.01, (1, 2): 1.0}
+    expected = get_arb_trades(pool, prices, method=method)
+
+    solver_state = ArbSolverState()
+    get_arb_trades(pool, prices, method=method, solver_state=solver_state)
+    assert set(solver_state.solutions) == {(0, 1), (2, 0)}
+
+    stats = Counter()
+    trades = get_arb_trades(pool, prices, stats, method, solver_state)
+    assert stats["arb_warm_starts"] == 2
+    for trade, expected_trade in zip(trades, expected):
+        assert trade.amount_in == pytest.approx(expected_trade.amount_in, rel=1e-7)
+
+
+@pytest.mark.parametrize("make_pool,pairs", [pool[:2] for pool in POOLS])
+def test_get_arb_trades_outcomes(make_pool, pairs):
+    """Test that trade outcomes from the solver match simulated trades."""
+    pool = make_pool()
+    prices = {pair: pool.price(*pair) * 0.99 for pair in pairs[:1]}
+    outcomes = {}
+    trades = get_arb_trades(pool, prices, outcomes=outcomes)
+
+    coin_in, coin_out, amount_in, _ = trades[0]
+    assert amount_in > 0
+    with pool.use_snapshot_context():
+        amount_out, fee = pool.trade(coin_in, coin_out, amount_in)
+        price = pool.price(coin_in, coin_out)
+    assert outcomes == {(coin_in, coin_out): (amount_out, fee, price)}
+
+
+@pytest.mark.parametrize("make_pool", [_make_stableswap_pool, _make_metapool])
+def test_get_arb_trades_executor(make_pool):
+    """Test that concurrent solves on pool clones find the same trades."""
+    pool = make_pool()
+    prices = {(0, 1): 0.99, (0, 2): 1.01, (1, 2): 1.0}
+    expected_stats = Counter()
+    expected = get_arb_trades(pool, prices, expected_stats)
+
+    solver_state = ArbSolverState()
+    with ThreadPoolExecutor(2) as executor:
+        for _ in range(2):  # clones are reused after the first call
+            stats = Counter()
+            trades = get_arb_trades(
+                pool, prices, stats, solver_state=solver_state, executor=executor
+            )
+            solver_state.solutions.clear()
+
+            assert trades == expected
+            assert stats == expected_stats
+
+    # one clone per pair that isn't skipped for being within the fee band
+    assert len(solver_state.clones) == len(prices) - expected_stats["arb_band_skips"]
+    assert all(clone is not pool for clone in solver_state.clones)
+
+
+PAIRS = [(0, 1), (1, 0), (0, 2), (2, 0), (1, 2), (2, 1)]
+
+
+def test_multipair_optimal_arbitrage_warm_start():
+    """Test that the optimizer reuses the previous Jacobian."""
+    pool = _make_stableswap_pool()
+    pool.price_jacobian = lambda *args, **kwargs: None
+
+    prices = {(0, 1): 0.99, (0, 2): 1.01, (1, 2): 1.0}
+    limits = {pair: 10**24 for pair in PAIRS}
+    expected, _, _ = multipair_optimal_arbitrage(pool, prices, limits)
+
+    solver_state = ArbSolverState()
+    multipair_optimal_arbitrage(pool, prices, limits, solver_state=solver_state)
+    assert len(solver_state.jacobians) == 1
+
+    stats = Counter()
+    trades, _, _ = multipair_optimal_arbitrage(
+        pool, prices, limits, stats, solver_state
+    )
+    assert stats["optimizer_jacobian_reuses"] == 1
+    for trade, expected_trade in zip(trades, expected):
+        assert trade.amount_in == pytest.approx(expected_trade.amount_in, rel=1e-6)
+
+
+@pytest.mark.parametrize(
+    "make_pool,pairs",
+    [
+        (_make_stableswap_pool, PAIRS),
+        (_make_metapool, PAIRS + [(0, 3), (3, 0)]),  # includes basepool LP token
+        (_make_cryptoswap_pool, PAIRS[:2]),
+    ],
+)
+def test_prices(make_pool, pairs):
+    """Test that batched prices equal individually computed prices."""
+    pool = make_pool()
+
+    for use_fee in [True, False]:
+        expected = [pool.price(*pair, use_fee=use_fee) for pair in pairs]
+        assert pool.prices(pairs, use_fee=use_fee) == expected
+
+
+@pytest.mark.parametrize("make_pool", [_make_stableswap_pool, _make_cryptoswap_pool])
+def test_price_jacobian(make_pool):
+    """Test that price Jacobians match finite differences of simulated trades."""
+    pool = make_pool()
+    pairs = [(0, 1), (1, 0)]
+    prices = [pool.price(*pair) for pair in pairs]
+
+    jac = pool.price_jacobian(pairs)
+    for m, pair in enumerate(pairs):
+        assert jac[m, m] == pytest.approx(pool.price_slope(*pair))
+
+        size = 10**21
+        with pool.use_snapshot_context():
+            pool.trade(*pair, size)
+            post_trade_prices = [pool.price(*pair) for pair in pairs]
+
+        expected = [(p1 - p0) / size for p0, p1 in zip(prices, post_trade_prices)]
+        np.testing.assert_allclose(jac[:, m], expected, rtol=2e-1)
+
+
+def test_metapool_price_jacobian():
+    """
+    Test that metapool price Jacobians match finite differences of simulated
+    trades, without fees, for pairs on either or both levels of the pool.
+    """
+    basepool = SimCurvePool(A=1000, D=20000000 * 10**18, n=2, fee=0)
+    pool = SimCurveMetaPool(A=250, D=4000000 * 10**18, n=2, fee=0, basepool=basepool)
+    pairs = PAIRS + [(0, 3), (3, 0)]  # includes basepool LP token
+    prices = pool.prices(pairs)
+
+    jac = pool.price_jacobian(pairs)
+    for m, pair in enumerate(pairs):
+        size = 10**20
+        with pool.use_snapshot_context():
+            pool.trade(*pair, size)
+            post_trade_prices = pool.prices(pairs)
+
+        expected = [(p1 - p0) / size for p0, p1 in zip(prices, post_trade_prices)]
+        np.testing.assert_allclose(jac[:, m], expected, rtol=1e-2, atol=1e-31)
+
+
+def test_levenberg_marquardt():
+    """Test that the optimizer agrees with least_squares within bounds."""
+
+    def fun(x):
+        return np.array([10 * (x[1] - x[0] ** 2), 1 - x[0]])
+
+    def jac(x):
+        return np.array([[-20 * x[0], 10], [-1, 0]])
+
+    for bounds in [([-2, -2], [2, 2]), ([-2, -2], [0.5, 2])]:
+        expected = least_squares(fun, [-1.2, 1], jac=jac, bounds=bounds)
+        res = levenberg_marquardt(fun, [-1.2, 1], bounds, jac)
+        assert res.success
+        np.testing.assert_allclose(res.x, expected.x, atol=1e-3)
+        assert res.cost == pytest.approx(expected.cost, abs=1e-8)
+
+
+@pytest.mark.parametrize("make_pool", [_make_stableswap_pool, _make_metapool])
+def test_multipair_optimal_arbitrage(make_pool):
+    """Test that the optimizer matches least_squares in fewer evaluations."""
+    pool = make_pool()
+    prices = {(0, 1): 0.99, (0, 2): 0.995, (1, 2): 1.003}
+    limits = {pair: 10**24 for pair in PAIRS}
+
+    least_squares_stats = Counter()
+    _, _, expected = multipair_optimal_arbitrage(
+        pool, prices, limits, least_squares_stats, method="least_squares"
+    )
+    stats = Counter()
+    _, _, res = multipair_optimal_arbitrage(pool, prices, limits, stats)
+
+    assert res.cost == pytest.approx(expected.cost, rel=1e-2)
+    evaluations = stats["optimizer_evaluations"]
+    assert evaluations < least_squares_stats["optimizer_evaluations"] / 2
+
+
+def test_get_arb_trades_band_skip():
+    """Test that pairs priced within the pool's bid/ask band aren't simulated."""
+    pool = _make_stableswap_pool()
+    prices = {(0, 1): 1.0, (0, 2): 1.0, (1, 2): 1.0}
+
+    stats = Counter()
+    trades = get_arb_trades(pool, prices, stats)
+    assert all(trade.amount_in == 0 for trade in trades)
+    assert stats["arb_band_skips"] == 3
+    assert stats["arb_skipped_timesteps"] == 1
+    assert stats["arb_evaluations"] == 0
+
+    prices[0, 1] = 0.99
+    stats = Counter()
+    trades = get_arb_trades(pool, prices, stats)
+    assert trades[0].amount_in > 0
+    assert stats["arb_band_skips"] == 2
+    assert stats["arb_skipped_timesteps"] == 0
+
+
+def test_get_arb_trades_no_band_skip():
+    """
+    Test that pairs priced within the bid/ask band of pools where it doesn't
+    bound post-trade prices are still sized.
+    """
+    pool = _make_cryptoswap_pool()
+    pool.balances = [20422231182437100281752828, 13306578787846010892890112]
+    pool.D = 41060651997243794085153300
+    pool.xcp_profit = 1000003775773585334
+    pool.virtual_price = 1062867831270474218
+    pool.last_prices = [1545525866576455827]
+    pool.last_prices_timestamp = 1700003600
+    pool._block_timestamp = 1700007200  # pylint: disable=protected-access
+    prices = {(0, 1): 0.6437724016553034}
+
+    # price_scale adjusts after the trade, so the price rises past the band
+    assert not pool.fee_band_is_exact
+    assert pool.price(0, 1) < prices[0, 1] < 1 / pool.price(1, 0)
+
+    stats = Counter()
+    trades = get_arb_trades(pool, prices, stats)
+    assert trades[0].amount_in > 0
+    assert stats["arb_band_skips"] == 0
+
+    pool = _make_stableswap_pool()
+    pool.fee_mul = 2 * 10**10
+    prices = {(0, 1): 1.0, (0, 2): 1.0, (1, 2): 1.0}
+    assert not pool.fee_band_is_exact
+
+    stats = Counter()
+    get_arb_trades(pool, prices, stats)
+    assert stats["arb_band_skips"] == 0
+    assert stats["arb_evaluations"] == 3
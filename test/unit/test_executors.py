@@ -0,0 +1,131 @@
+import multiprocessing as mp
+import os
+
+import pytest
+
+from curvesim.exceptions import ExecutorError
+from curvesim.iterators.param_samplers import ParameterizedPoolIterator
+from curvesim.pipelines.executors import (
+    DistributedExecutor,
+    ProcessExecutor,
+    SerialExecutor,
+    ThreadExecutor,
+)
+from curvesim.pipelines.executors.distributed import _NodeManager
+from curvesim.pool.sim_interface import SimCurvePool
+
+VARIABLE_PARAMS = {"A": [10, 100, 1000], "fee": [10**6, 4 * 10**6]}
+
+
+def _make_param_sampler():
+    pool = SimCurvePool(A=250, D=10**24, n=2, admin_fee=5 * 10**9)
+    return ParameterizedPoolIterator(pool, VARIABLE_PARAMS)
+
+
+def _strategy(pool, params, price_sampler):
+    return pool.A, pool.fee, price_sampler
+
+
+def _pid_strategy(pool, params, price_sampler):
+    return os.getpid()
+
+
+def _crashing_strategy(pool, params, price_sampler):
+    """Kills its worker process the first time it runs."""
+    if not os.path.exists(price_sampler):
+        with open(price_sampler, "w", encoding="utf-8"):
+            os._exit(1)  # pylint: disable=protected-access
+    return pool.A
+
+
+def _failing_strategy(pool, params, price_sampler):
+    raise ValueError("strategy failed")
+
+
+def test_executors_match_serial():
+    """Test that all executors return the same results in the same order."""
+    expected = SerialExecutor().run(_strategy, _make_param_sampler(), "prices")
+    assert len(expected) == 6
+
+    with ThreadExecutor(2) as executor:
+        assert executor.run(_strategy, _make_param_sampler(), "prices") == expected
+
+    with ProcessExecutor(2) as executor:
+        assert executor.run(_strategy, _make_param_sampler(), "prices") == expected
+
+    with DistributedExecutor(heartbeat_timeout=4) as executor:
+        executor.spawn_local_nodes(2, processes=2)
+        assert executor.run(_strategy, _make_param_sampler(), "prices") == expected
+
+        # Executor can be reused for subsequent runs
+        assert executor.run(_strategy, _make_param_sampler(), "prices") == expected
+
+
+def test_process_executor_reuse():
+    """Test that worker processes are reused across runs until shutdown."""
+    executor = ProcessExecutor(2)
+    first = executor.run(_pid_strategy, _make_param_sampler(), "prices")
+    second = executor.run(_pid_strategy, _make_param_sampler(), "prices")
+    worker_pids = set(first) | set(second)
+    assert len(worker_pids) <= 2
+    assert os.getpid() not in worker_pids
+
+    executor.shutdown()
+    third = executor.run(_pid_strategy, _make_param_sampler(), "prices")
+    assert not set(third) & worker_pids
+    executor.shutdown()
+
+
+def test_distributed_executor_retries(tmp_path):
+    """Test that tasks lost with a crashed worker are retried."""
+    marker = str(tmp_path / "crashed")
+
+    with DistributedExecutor(heartbeat_timeout=4) as executor:
+        executor.spawn_local_nodes(1)
+        results = executor.run(_crashing_strategy, _make_param_sampler(), marker)
+
+    assert results == [A for A in VARIABLE_PARAMS["A"] for _ in range(2)]
+
+
+def _take_task_and_die(address, authkey, ready):
+    """Node that dies right after taking a task from the queue."""
+    manager = _NodeManager(address=address, authkey=authkey)
+    manager.connect()
+    tasks = manager.tasks()
+    ready.set()
+    tasks.get()
+    os._exit(1)  # pylint: disable=protected-access
+
+
+def test_distributed_executor_retries_taken_tasks():
+    """Test that tasks taken by a node that died before starting them are retried."""
+    expected = SerialExecutor().run(_strategy, _make_param_sampler(), "prices")
+
+    with DistributedExecutor(heartbeat_timeout=2) as executor:
+        executor.start()
+        ready = mp.Event()
+        node = mp.Process(
+            target=_take_task_and_die, args=(executor.address, executor.authkey, ready)
+        )
+        node.start()
+        ready.wait(timeout=10)
+
+        executor.spawn_local_nodes(1)
+        assert executor.run(_strategy, _make_param_sampler(), "prices") == expected
+        node.join(timeout=10)
+        assert node.exitcode == 1
+
+
+def test_distributed_executor_no_nodes():
+    """Test that runs fail if no nodes connect."""
+    with DistributedExecutor(heartbeat_timeout=2, connect_timeout=2) as executor:
+        with pytest.raises(ExecutorError, match="No nodes connected"):
+            executor.run(_strategy, _make_param_sampler(), "prices")
+
+
+def test_distributed_executor_error():
+    """Test that errors raised by the strategy are surfaced."""
+    with DistributedExecutor(heartbeat_timeout=4) as executor:
+        executor.spawn_local_nodes(1)
+        with pytest.raises(ExecutorError, match="strategy failed"):
+            executor.run(_failing_strategy, _make_param_sampler(), "prices")
@@ -0,0 +1,62 @@
+import logging
+from multiprocessing import Pool
+
+from curvesim.logging import (
+    configure_multiprocess_logging,
+    flush_multiprocess_logging,
+    get_logger,
+    multiprocessing_logging_queue,
+)
+
+logger = get_logger(__name__)
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _log_records(n_records):
+    for i in range(n_records):
+        logger.info("info %s", i)
+        logger.warning("warning %s", i)
+    flush_multiprocess_logging()
+
+
+def _run_workers(level):
+    handler = _ListHandler()
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    root_logger.handlers[:] = [handler]
+    try:
+        with multiprocessing_logging_queue() as logging_queue:
+            with Pool(
+                2,
+                initializer=configure_multiprocess_logging,
+                initargs=(logging_queue, level),
+            ) as pool:
+                pool.map(_log_records, [150] * 4)
+                pool.close()
+                pool.join()
+    finally:
+        root_logger.handlers[:] = handlers
+
+    return handler.records
+
+
+def test_multiprocess_logging():
+    """Test that batched worker records all reach the main process."""
+    records = _run_workers("debug")
+    assert len(records) == 1200
+    assert records[1].getMessage() == "warning 0"
+
+
+def test_multiprocess_logging_level():
+    """Test that records below the worker level are dropped."""
+    records = _run_workers("warning")
+    assert len(records) == 600
+    assert all(record.levelno == logging.WARNING for record in records)
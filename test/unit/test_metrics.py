@@ -1,7 +1,8 @@
 from copy import deepcopy
 
 import pytest
-from pandas import DataFrame, Series
+from numpy import array
+from pandas import Categorical, DataFrame, Series
 
 from curvesim.exceptions import MetricError
 from curvesim.metrics import init_metrics, metrics
@@ -65,6 +66,8 @@ def _test_metric_class_init(metric):
     assert metric.metric_function == metric.config["functions"]["metrics"]
     assert metric.plot_config == metric.config.get("plot", None)
     assert metric.summary_functions == metric.config["functions"].get("summary", None)
+    assert metric.update_function == metric.config["functions"].get("update", None)
+    assert metric.inputs == metric.config["functions"].get("inputs", None)
 
 
 def _test_pool_metric_class_init(metric, pool):
@@ -98,6 +101,24 @@ def _test_pricing_metric_class_init(metric, coin_names, prices):
     assert metric.get_market_price("COIN0", "COIN1", prices) == 10
     assert metric.get_market_price("COIN1", "COIN0", prices) == 1 / 10
 
+    # Test get_market_prices
+    coins = Series(Categorical(["COIN0", "COIN1", "COIN1"], categories=coin_names))
+    price_df = DataFrame.from_records([prices, {("COIN0", "COIN1"): 4}])
+    timesteps = array([0, 0, 1])
+    market_prices = metric.get_market_prices(coins, "COIN1", price_df, timesteps)
+    assert market_prices.tolist() == [10, 1, 1]
+    market_prices = metric.get_market_prices(coins, "COIN0", price_df, timesteps)
+    assert market_prices.tolist() == [1, 1 / 10, 1 / 4]
+
+    # Test get_numeraire_prices
+    for price_data in [prices, Series(prices)]:
+        numeraire_prices = metric.get_numeraire_prices(price_data)
+        assert numeraire_prices == {"COIN0": 1, "COIN1": 1 / 10}
+    numeraire_prices = metric.get_numeraire_prices(price_df)
+    assert list(numeraire_prices.columns) == metric.coin_names
+    numeraire_prices = numeraire_prices.iloc[:, [0, -1]].to_numpy()
+    assert numeraire_prices.tolist() == [[1, 1 / 10], [1, 1 / 4]]
+
 
 def test_get_poin_pairs():
     """Test that get_coin_pairs returns same results regardless of input format."""
@@ -1,6 +1,8 @@
+import pytest
 from numpy import inf, mean
 
-from curvesim.metrics.metrics import _compute_liquidity_density
+from curvesim.metrics import init_metrics
+from curvesim.metrics.metrics import PriceDepth, _compute_liquidity_density
 from curvesim.utils import get_pairs
 
 
@@ -27,6 +29,56 @@ def test_liquidity_density_sim_curve_tricrypto_pool(sim_curve_tricrypto_pool):
     _test_liquidity_density_cryptoswap(sim_curve_tricrypto_pool)
 
 
+@pytest.mark.parametrize(
+    "pool_fixture",
+    [
+        "sim_curve_pool",
+        "sim_curve_tripool",
+        "sim_curve_meta_pool",
+        "sim_curve_crypto_pool",
+        "sim_curve_tricrypto_pool",
+    ],
+)
+def test_liquidity_density_finite_difference(pool_fixture, request):
+    """
+    Test that liquidity density matches a finite-difference estimate from a
+    small trade, without fees.
+    """
+    pool = request.getfixturevalue(pool_fixture)
+    pool.metadata = {"coins": {"names": ["SYM" + str(i) for i in range(pool.n)]}}
+    if hasattr(pool, "basepool"):
+        pool.basepool.metadata = {"coins": {"names": ["BP_SYM0", "BP_SYM1"]}}
+    if hasattr(pool, "mid_fee"):
+        pool.mid_fee = pool.out_fee = 0
+        pool.allowed_extra_profit = inf  # disable _tweak_price
+    else:
+        pool.fee = 0
+
+    LDs_expected = []
+    for coin_in, coin_out in get_pairs(pool.coin_names):
+        for pair in [(coin_in, coin_out), (coin_out, coin_in)]:
+            amount_in = pool.asset_balances[pair[0]] // 10**8
+            x_avg = pool.asset_balances[pair[0]] + amount_in / 2
+
+            price_pre = pool.price(*pair, use_fee=False)
+            with pool.use_snapshot_context():
+                pool.trade(*pair, amount_in)
+                price_post = pool.price(*pair, use_fee=False)
+
+            LD_expected = (
+                amount_in
+                * (price_pre + price_post)
+                / (2 * (price_pre - price_post) * x_avg)
+            )
+            (LD,) = _compute_liquidity_density(pool, [pair])
+            assert abs(LD - LD_expected) / LD_expected < 1e-4
+            LDs_expected.append(LD_expected)
+
+    (metric,) = init_metrics([PriceDepth], pool=pool)
+    LD = metric.get_LD_update()["liquidity_density"]
+    assert abs(LD - mean(LDs_expected)) / mean(LDs_expected) < 1e-4
+
+
 def _test_liquidity_density_stableswap(pool):
     """
     Tests liquidity density for stableswap pools:
@@ -35,14 +87,10 @@ def _test_liquidity_density_stableswap(pool):
     - Ensure LD at center is ~correct
     """
 
-    def trade_size_function(pool, coin_in):
-        x_per_dx = 10**8
-        return pool.asset_balances[coin_in] // x_per_dx
-
     A_list = [10, 50, 100, 500, 1000, 5000]
     for A in A_list:
         pool.A = A
-        LD_range = _test_compute_liquidity_density(pool, trade_size_function)
+        LD_range = _test_compute_liquidity_density(pool)
 
         # Ensure LD at center is ~correct
         LD_max_expected = (A + 1) / 2
@@ -58,9 +106,6 @@ def _test_liquidity_density_cryptoswap(pool):
     - Ensure LD near tail is ~.5 (constant product LD)
     """
 
-    def trade_size_function(pool, coin_in):
-        return pool.get_min_trade_size(coin_in)
-
     pool.allowed_extra_profit = inf  # disable _tweak_price
     pool.balances = pool._convert_D_to_balances(pool.D)  # balance pool
     n = pool.n
@@ -71,7 +116,7 @@ def _test_liquidity_density_cryptoswap(pool):
         for gamma in gamma_list:
             pool.A = A * n**n * 10000
             pool.gamma = gamma
-            LD_range = _test_compute_liquidity_density(pool, trade_size_function)
+            LD_range = _test_compute_liquidity_density(pool)
 
             # Ensure LD at center is ~correct
             A_v1 = A * n ** (n - 1)
@@ -82,7 +127,7 @@ def _test_liquidity_density_cryptoswap(pool):
             assert 0.47 < LD_range[-1] < 0.501
 
 
-def _test_compute_liquidity_density(pool, trade_size_fn):
+def _test_compute_liquidity_density(pool):
     """
     Computes liquidity density ranges for each trading pair/direction and tests that:
     - LD is max at center
@@ -96,8 +141,8 @@ def _test_compute_liquidity_density(pool, trade_size_fn):
     LD_ranges = []
     for pair in coin_pairs:
         coin_in, coin_out = pair
-        LD0 = _compute_liquidity_density_range(pool, coin_in, coin_out, trade_size_fn)
-        LD1 = _compute_liquidity_density_range(pool, coin_out, coin_in, trade_size_fn)
+        LD0 = _compute_liquidity_density_range(pool, coin_in, coin_out)
+        LD1 = _compute_liquidity_density_range(pool, coin_out, coin_in)
         LD_ranges += [LD0, LD1]
 
     # Ensure LD is max at center
@@ -114,7 +159,7 @@ def _test_compute_liquidity_density(pool, trade_size_fn):
     return LD_ranges_means
 
 
-def _compute_liquidity_density_range(pool, coin_in, coin_out, trade_size_function):
+def _compute_liquidity_density_range(pool, coin_in, coin_out):
     """Computes liquidity density at a range of locations along the bonding curve."""
 
     pre_trade_size = 0
@@ -128,8 +173,7 @@ def _compute_liquidity_density_range(pool, coin_in, coin_out, trade_size_functio
         with pool.use_snapshot_context():
             if pre_trade_size > 0:
                 pool.trade(coin_in, coin_out, pre_trade_size)
-            LD_trade_size = trade_size_function(pool, coin_in)
-            LD = _compute_liquidity_density(pool, coin_in, coin_out, LD_trade_size)
+            (LD,) = _compute_liquidity_density(pool, [(coin_in, coin_out)])
             coin_out_balances = pool.asset_balances[coin_out]
 
         LD_range.append(LD)
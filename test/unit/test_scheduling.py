@@ -0,0 +1,41 @@
+from multiprocessing import Pool
+
+from curvesim.pipelines.scheduling import CostModel, TaskScheduler
+
+
+def test_cost_model_estimate():
+    """Test that costs are learned for seen and unseen parameter sets."""
+    model = CostModel(default_cost=5)
+    assert model.estimate({"A": 100}) == 5
+
+    model.update({"A": 100, "fee": 1}, 1)
+    model.update({"A": 1000, "fee": 1}, 3)
+    model.update({"A": 1000, "fee": 1}, 5)
+
+    assert model.estimate({"A": 100, "fee": 1}) == 1
+    assert model.estimate({"A": 1000, "fee": 1}) == 4
+
+    # Unseen combination: high A should still be estimated as more costly
+    assert model.estimate({"A": 1000, "fee": 2}) > model.estimate({"A": 100, "fee": 2})
+
+
+def _square(x):
+    return x**2
+
+
+def test_task_scheduler_order():
+    """Test that results are returned in input order regardless of dispatch order."""
+    model = CostModel()
+    for x in range(10):
+        model.update({"x": x}, x)
+
+    scheduler = TaskScheduler(cost_model=model)
+    args_list = [(x,) for x in range(10)]
+    params_list = [{"x": x} for x in range(10)]
+
+    with Pool(2) as pool:
+        results = scheduler.run(pool, _square, args_list, params_list)
+
+    assert results == [x**2 for x in range(10)]
+    assert sum(u["tasks"] for u in scheduler.utilization.values()) == 10
+    assert len(model) == 20
@@ -155,3 +155,33 @@ def test_snapshot_context():
 
     assert pool.balances == pre_balances
     assert pool.admin_balances == pre_admin_balances
+
+
+def test_metapool_clone():
+    """Test that clones of a metapool and its basepool trade independently."""
+    basepool = SimCurvePool(A=1000, D=2750000 * 10**18, n=2, admin_fee=5 * 10**9)
+    pool = SimCurveMetaPool(
+        A=250, D=4000000 * 10**18, n=2, admin_fee=5 * 10**9, basepool=basepool
+    )
+    pre_balances = pool.balances.copy()
+    pre_bp_balances = basepool.balances.copy()
+    pre_lp_tokens = basepool.tokens
+
+    clone = pool.clone()
+    assert clone.basepool is not basepool
+
+    clone.exchange_underlying(0, 1, 10**12)
+    assert clone.balances != pre_balances
+    assert clone.basepool.balances != pre_bp_balances
+    assert pool.balances == pre_balances
+    assert basepool.balances == pre_bp_balances
+    assert basepool.tokens == pre_lp_tokens
+
+    # updated clones match the pool and still trade independently
+    pool.exchange_underlying(1, 0, 10**12)
+    pool.update_clone(clone)
+    assert clone.balances == pool.balances
+    assert clone.basepool.balances == basepool.balances
+    assert clone.basepool.tokens == basepool.tokens
+    assert clone.balances is not pool.balances
+    assert clone.basepool is not basepool
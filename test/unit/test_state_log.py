@@ -1,10 +1,33 @@
-import pytest
+from copy import deepcopy
+from datetime import datetime, timedelta
+from itertools import combinations, permutations
 
-from curvesim.exceptions import UnregisteredPoolError
+import pytest
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from curvesim.exceptions import PlotError, UnregisteredPoolError
+from curvesim.iterators.price_samplers.price_volume import PriceVolumeSample
+from curvesim.metrics import init_metrics, make_results
+from curvesim.metrics.base import Metric
+from curvesim.metrics.metrics import (
+    ArbMetrics,
+    PoolBalance,
+    PoolValue,
+    PoolVolume,
+    PriceDepth,
+    Timestamp,
+)
+from curvesim.metrics.state_log import StateLog
+from curvesim.metrics.state_log.intermediates import (
+    get_dependencies,
+    get_intermediates,
+    intermediate_functions,
+)
 from curvesim.metrics.state_log.pool_parameters import get_pool_parameters
 from curvesim.metrics.state_log.pool_state import get_pool_state
-
-# To Do: Currently only get_pool_parameters/get_pool_state are tested.
+from curvesim.pool.sim_interface import SimCurveCryptoPool
+from curvesim.templates.trader import TradeResult
 
 
 def test_get_pool_parameters_curve_pool(sim_curve_pool):
@@ -104,6 +127,7 @@ def test_get_pool_state_curve_pool(sim_curve_pool):
         "balances": pool.balances,
         "tokens": pool.tokens,
         "admin_balances": pool.admin_balances,
+        "virtual_value": pool.D(),
     }
 
     state = get_pool_state(pool)
@@ -127,6 +151,7 @@ def test_get_pool_state_curve_crypto_pool(sim_curve_crypto_pool):
         "_block_timestamp": pool._block_timestamp,
         "not_adjusted": pool.not_adjusted,
         "virtual_price": pool.virtual_price,
+        "virtual_value": pool._get_xcp(pool.D),
     }
 
     state = get_pool_state(pool)
@@ -151,6 +176,7 @@ def _test_get_pool_state_curve_meta_pool(pool):
         "balances_base": pool.basepool.balances,
         "tokens_base": pool.basepool.tokens,
         "admin_balances_base": pool.basepool.admin_balances,
+        "virtual_value": pool.D(),
     }
 
     state = get_pool_state(pool)
@@ -167,3 +193,388 @@ def test_get_pool_state_unmapped_exception():
 
     with pytest.raises(UnregisteredPoolError):
         get_pool_state(pool)
+
+
+class _FullLogMetric(Metric):
+    """Metric using all state log data at the end of the run."""
+
+    config = {"functions": {"metrics": lambda **kwargs: DataFrame()}}
+
+
+@pytest.mark.parametrize("length", [None, 2, 5])
+def test_state_log_get_logs(sim_curve_crypto_pool, length):
+    """
+    Test that the columnar state log returns the same data as building
+    DataFrames from the logged records, whether or not it has to grow.
+    """
+    pool = sim_curve_crypto_pool
+    _set_metadata(pool)
+    log = StateLog(pool, [_FullLogMetric()], length=length)
+
+    records = []
+    pair = tuple(pool.asset_names)
+    start = datetime(2023, 1, 1)
+    for i in range(5):
+        amount_in = 10**18 * (i + 1)
+        amount_out, fee = pool.trade(0, 1, amount_in)
+        trades = [TradeResult(*pair, amount_in, amount_out, fee)] * (i % 2)
+        record = {
+            "price_sample": PriceVolumeSample(
+                start + timedelta(hours=i), {pair: 1.5 + i / 10}, {pair: 10.0 * i}
+            ),
+            "trade_data": {"trades": trades, "price_errors": {pair: i / 100}},
+        }
+        log.update(**record)
+        records.append({"pool_state": get_pool_state(pool), **record})
+
+    logs = log.get_logs()
+    df = DataFrame(records)
+    times = [record["price_sample"].timestamp for record in records]
+
+    assert list(logs) == ["pool_parameters", *df, "trades"]
+    for col in df:
+        expected = DataFrame(df[col].to_list(), index=times)
+        assert_frame_equal(logs[col], expected, check_exact=True)
+
+    trades = logs["trades"]
+    assert trades.timestep.to_list() == [1, 3]
+    assert trades.period.to_list() == [1, 3]
+    assert trades.coin_in.cat.codes.to_list() == [0, 0]
+    assert trades.coin_out.cat.codes.to_list() == [1, 1]
+    for timestep, trade in zip(trades.timestep, trades.itertuples(index=False)):
+        expected = (timestep, *records[timestep]["trade_data"]["trades"][0])
+        assert trade[:-1] == expected
+
+
+@pytest.mark.parametrize(
+    "pool_fixture",
+    [
+        "sim_curve_pool",
+        "sim_curve_meta_pool",
+        "sim_curve_rai_pool",
+        "sim_curve_crypto_pool",
+    ],
+)
+def test_state_log_pool_state_capture(pool_fixture, request):
+    """
+    Test that pool state captured as tuples is logged the same as the pool
+    state records, and isn't changed by later trades.
+    """
+    pool = request.getfixturevalue(pool_fixture)
+    _set_metadata(pool)
+    log = StateLog(pool, [_FullLogMetric()])
+
+    records = []
+    times = [datetime(2023, 1, 1) + timedelta(hours=i) for i in range(5)]
+    coin_in, coin_out = pool.asset_names[:2]
+    for i, time in enumerate(times):
+        pool.trade(coin_in, coin_out, 10**21 * (i + 1))
+        log.update(price_sample=PriceVolumeSample(time, {}, {}))
+        records.append(get_pool_state(pool))
+
+    expected = DataFrame(records, index=times)
+    assert_frame_equal(log.get_logs()["pool_state"], expected, check_exact=True)
+
+
+@pytest.mark.parametrize(
+    "pool_fixture", ["sim_curve_pool", "sim_curve_meta_pool", "sim_curve_crypto_pool"]
+)
+def test_state_log_update_functions(pool_fixture, request):
+    """
+    Test that metrics with update functions give the same results as when
+    computed from the state log at the end of the run, and that pool state is
+    only recorded if a metric needs it.
+    """
+    pool = request.getfixturevalue(pool_fixture)
+    _set_metadata(pool)
+
+    metrics = init_metrics([PoolValue, PoolBalance, PriceDepth], pool=pool)
+    log = StateLog(pool, [*metrics, _FullLogMetric()])
+    streaming_log = StateLog(pool, metrics)
+
+    start = datetime(2023, 1, 1)
+    coin_in, coin_out = pool.asset_names[:2]
+    for i in range(5):
+        amount_out, fee = pool.trade(coin_in, coin_out, 10**21 * (i + 1))
+        prices = {pair: 1 + i / 100 for pair in combinations(pool.asset_names, 2)}
+        sample = PriceVolumeSample(start + timedelta(days=i), prices, {})
+        trade_data = {"trades": [TradeResult(coin_in, coin_out, 1, amount_out, fee)]}
+        log.update(price_sample=sample, trade_data=trade_data)
+        streaming_log.update(price_sample=sample, trade_data=trade_data)
+
+    logs = log.get_logs()
+    assert "pool_state" in logs
+    assert list(streaming_log.get_logs()) == ["pool_parameters", "price_sample"]
+    logs.update(get_intermediates(intermediate_functions, logs, pool))
+
+    results = [
+        metric.compute(logs, log.get_updates(i)) for i, metric in enumerate(metrics)
+    ]
+    for metric, (data, summary) in zip(metrics, results):
+        expected_data, expected_summary = metric.compute(logs)
+        assert_frame_equal(data, expected_data, check_exact=True)
+        assert_frame_equal(summary, expected_summary, check_exact=True)
+
+
+@pytest.mark.parametrize("pool_fixture", ["sim_curve_pool", "sim_curve_crypto_pool"])
+def test_state_log_metric_freqs(pool_fixture, request):
+    """
+    Test that metrics with a sampling frequency are only computed at the first
+    timestamp of each period, with trades priced at their own timestamp and
+    summed over the period they were executed in, and that data only they use is
+    only recorded at those timestamps.
+    """
+    pool = request.getfixturevalue(pool_fixture)
+    _set_metadata(pool)
+
+    metric_classes = [PoolValue, PriceDepth, ArbMetrics, PoolVolume]
+    freqs = dict.fromkeys(metric_classes, "1D")
+    log = StateLog(pool, init_metrics(metric_classes, pool=pool))
+    sampled_log = StateLog(pool, init_metrics(metric_classes, freqs, pool=pool))
+
+    start = datetime(2023, 1, 1, 12)
+    coin_in, coin_out = pool.asset_names[:2]
+    for i in range(6):
+        amount_out, fee = pool.trade(coin_in, coin_out, 10**22)
+        prices = dict.fromkeys(combinations(pool.asset_names, 2), 1 + i / 10)
+        sample = PriceVolumeSample(start + timedelta(hours=6 * i), prices, {})
+        trade_data = {
+            "trades": [TradeResult(coin_in, coin_out, 10**22, amount_out, fee)],
+            "price_errors": {(coin_in, coin_out): i / 100},
+        }
+        log.update(price_sample=sample, trade_data=trade_data)
+        sampled_log.update(price_sample=sample, trade_data=trade_data)
+
+    assert sampled_log.samples == {"1D": [0, 2]}
+    assert len(sampled_log.state_per_trade["price_sample"]) == 6
+    assert len(sampled_log.state_per_trade["trade_data"]) == 2
+    assert "pool_state" not in sampled_log.state_per_trade
+
+    _, data, _ = log.compute_metrics()
+    _, sampled_data, _ = sampled_log.compute_metrics()
+    times = data.index[[0, 2]]
+    assert sampled_data.index.equals(times)
+
+    columns = ["pool_value_virtual", "pool_value", "liquidity_density", "price_error"]
+    expected = data.loc[times, columns]
+    assert_frame_equal(sampled_data[columns], expected, check_exact=True)
+
+    columns = ["arb_profit", "pool_fees", "pool_volume"]
+    expected = data[columns].groupby(data.index.floor("1D")).sum().set_index(times)
+    assert_frame_equal(sampled_data[columns], expected)
+
+
+def test_state_log_data_per_trade(sim_curve_pool):
+    """
+    Test that per-timestamp metric data is discarded, or downsampled with each
+    sub-metric's resample rule, after computing the same summary data.
+    """
+    pool = sim_curve_pool
+    _set_metadata(pool)
+
+    metrics = init_metrics([Timestamp, PoolValue, ArbMetrics], pool=pool)
+    logs = [
+        StateLog(pool, metrics, data_per_trade=data) for data in [True, False, "1D"]
+    ]
+
+    start = datetime(2023, 1, 1, 12)
+    coin_in, coin_out = pool.asset_names[:2]
+    prices = {(coin_in, coin_out): 1}
+    for i in range(6):
+        amount_out, fee = pool.trade(coin_in, coin_out, 10**22)
+        sample = PriceVolumeSample(start + timedelta(hours=6 * i), prices, {})
+        trade_data = {
+            "trades": [TradeResult(coin_in, coin_out, 10**22, amount_out, fee)],
+            "price_errors": {(coin_in, coin_out): i / 100},
+        }
+        for log in logs:
+            log.update(price_sample=sample, trade_data=trade_data)
+
+    (_, data, summary), *results = [log.compute_metrics() for log in logs]
+    (_, no_data, no_data_summary), (_, daily_data, daily_summary) = results
+
+    assert no_data.empty
+    assert list(no_data.columns) == list(data.columns)
+    assert_frame_equal(no_data_summary, summary, check_exact=True)
+    assert_frame_equal(daily_summary, summary, check_exact=True)
+
+    rules = {
+        "timestamp": "first",
+        "pool_value_virtual": "last",
+        "pool_value": "last",
+        "arb_profit": "sum",
+        "pool_fees": "sum",
+        "price_error": "first",
+    }
+    expected = data.groupby(data.index.floor("1D")).agg(rules)
+    assert_frame_equal(daily_data, expected, check_exact=True, check_freq=False)
+
+
+def test_plot_without_data_per_trade(sim_curve_pool):
+    """
+    Test that results without per-timestamp data plot only summary data, and
+    raise an error if only per-timestamp data is plotted.
+    """
+    _set_metadata(sim_curve_pool)
+    coin_in, coin_out = sim_curve_pool.asset_names[:2]
+    prices = {(coin_in, coin_out): 1}
+    start = datetime(2023, 1, 1, 12)
+
+    output = []
+    for A in [100, 200]:
+        pool = deepcopy(sim_curve_pool)
+        pool.A = A
+        metrics = init_metrics([Timestamp, PoolValue, ArbMetrics], pool=pool)
+        log = StateLog(pool, metrics, data_per_trade=False)
+        for i in range(6):
+            amount_out, fee = pool.trade(coin_in, coin_out, 10**22)
+            sample = PriceVolumeSample(start + timedelta(hours=6 * i), prices, {})
+            trade_data = {
+                "trades": [TradeResult(coin_in, coin_out, 10**22, amount_out, fee)],
+                "price_errors": {(coin_in, coin_out): i / A},
+            }
+            log.update(price_sample=sample, trade_data=trade_data)
+        output.append(log.compute_metrics())
+
+    results = make_results(*zip(*output), metrics)
+    assert results.data().empty
+
+    chart = results.plot()
+    assert chart.to_dict() == results.plot(data=False).to_dict()
+
+    with pytest.raises(PlotError):
+        results.plot(summary=False)
+
+
+@pytest.mark.parametrize(
+    "pool_fixture",
+    [
+        "sim_curve_pool",
+        "sim_curve_meta_pool",
+        "sim_curve_rai_pool",
+        "sim_curve_crypto_pool",
+    ],
+)
+def test_state_log_trade_metrics(pool_fixture, request):
+    """
+    Test that metrics computed from the flat trade table are the same as
+    computing them trade by trade.
+    """
+    pool = request.getfixturevalue(pool_fixture)
+    _set_metadata(pool)
+
+    metrics = init_metrics([ArbMetrics, PoolVolume], pool=pool)
+    log = StateLog(pool, metrics)
+
+    numeraire = metrics[0].numeraire
+    pairs = list(permutations(pool.asset_names, 2))
+    pairs.sort(key=lambda pair: pair[1] != numeraire)  # exact fee sums first
+
+    records = []
+    start = datetime(2023, 1, 1)
+    for i in range(6):
+        trades = [
+            TradeResult(
+                *pair, 3**40 * (i + k + 1), 3**40 * (i + 1), 7**20 * (k + 1)
+            )
+            for k, pair in enumerate(pairs[: i % 4])
+        ]
+        prices = {
+            pair: 1 + (i + k) / 100
+            for k, pair in enumerate(combinations(pool.asset_names, 2))
+        }
+        record = {
+            "price_sample": PriceVolumeSample(start + timedelta(days=i), prices, {}),
+            "trade_data": {"trades": trades, "price_errors": {}},
+        }
+        log.update(**record)
+        records.append(record)
+
+    logs = log.get_logs()
+    (arb_data, _), (volume_data, _) = [metric.compute(logs) for metric in metrics]
+
+    arb_metric, volume_metric = metrics
+    for i, record in enumerate(records):
+        prices = record["price_sample"].prices
+        trades = record["trade_data"]["trades"]
+
+        arb_profit, pool_fees, volume = 0, 0, 0
+        for trade in trades:
+            market_price = arb_metric.get_market_price(
+                trade.coin_in, trade.coin_out, prices
+            )
+            arb = trade.amount_out - trade.amount_in * market_price
+            fee = trade.fee
+            if trade.coin_out != numeraire:
+                price = arb_metric.get_market_price(trade.coin_out, numeraire, prices)
+                arb *= price
+                fee *= price
+            arb_profit += arb
+            pool_fees += fee
+
+            if isinstance(pool, SimCurveCryptoPool):
+                price = volume_metric.get_market_price(trade.coin_in, numeraire, prices)
+                volume += trade.amount_in * price
+            elif pool.asset_names[0] in (trade.coin_in, trade.coin_out):
+                volume += trade.amount_in
+
+        assert arb_data["arb_profit"].iloc[i] == arb_profit / 10**18
+        assert arb_data["pool_fees"].iloc[i] == pool_fees / 10**18
+        assert volume_data["pool_volume"].iloc[i] == volume / 10**18
+
+
+def test_state_log_intermediates(sim_curve_crypto_pool, monkeypatch):
+    """
+    Test that intermediates are only computed if used, after their inputs, and
+    once per run for all metrics that use them.
+    """
+    pool = sim_curve_crypto_pool
+    _set_metadata(pool)
+
+    assert get_dependencies(["numeraire_prices", "reserves", "trades"]) == [
+        "price_sample",
+        "prices",
+        "numeraire_prices",
+        "pool_state",
+        "reserves",
+        "trades",
+    ]
+
+    calls = []
+    _get_prices = intermediate_functions["prices"]
+
+    def get_prices(**kwargs):
+        calls.append("prices")
+        return _get_prices(**kwargs)
+
+    monkeypatch.setitem(intermediate_functions, "prices", get_prices)
+
+    metrics = init_metrics([ArbMetrics, PoolVolume, PoolBalance], pool=pool)
+    log = StateLog(pool, metrics)
+    assert log.intermediates == {None: ["prices", "numeraire_prices"]}
+
+    prices = {tuple(pool.asset_names): 1.5}
+    sample = PriceVolumeSample(datetime(2023, 1, 1), prices, {})
+    log.update(price_sample=sample, trade_data={"trades": [], "price_errors": {}})
+
+    log.compute_metrics()
+    assert calls == ["prices"]
+    assert "pool_state" not in log.get_logs()
+
+
+def _set_metadata(pool):
+    pool.metadata = {
+        "coins": {
+            "names": [f"COIN{i}" for i in range(pool.n)],
+            "addresses": [f"0x{i}" for i in range(pool.n)],
+        },
+        "chain": "mainnet",
+    }
+    if hasattr(pool, "basepool"):
+        pool.basepool.metadata = {
+            "coins": {
+                "names": [f"BASE{i}" for i in range(pool.basepool.n)],
+                "addresses": [f"0xb{i}" for i in range(pool.basepool.n)],
+            },
+            "chain": "mainnet",
+        }
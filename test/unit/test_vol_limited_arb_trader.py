@@ -1,7 +1,29 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from unittest.mock import patch
+
+import numpy as np
+import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
+from pandas import DataFrame, MultiIndex, date_range
 
+from curvesim.exceptions import CurvesimValueError
+from curvesim.iterators.price_samplers import PriceVolume
+from curvesim.metrics import init_metrics
+from curvesim.metrics import metrics as Metrics
+from curvesim.pipelines.vol_limited_arb.strategy import (
+    VolumeLimitedStrategy,
+    _compute_volume_limits,
+)
 from curvesim.pipelines.vol_limited_arb.trader import _apply_volume_limits
+from curvesim.pipelines.vol_limited_arb.vectorized import (
+    VectorizedArbitrageur,
+    VectorizedVolumeLimitedStrategy,
+    _FloatStableswap,
+)
+from curvesim.pool.sim_interface import SimCurvePool
 from curvesim.templates.trader import ArbTrade
 
 
@@ -39,3 +61,146 @@ def test_apply_volume_limits(trade_sizes, min_trade_sizes, volume_limits):
 
     for trade in excluded_trades:
         assert trade.amount_in <= pool.get_min_trade_size(trade.coin_in)
+
+
+def test_compute_volume_limits():
+    """Test that precomputed volume limits match each sample's volumes."""
+    pairs = [("SYM0", "SYM1"), ("SYM0", "SYM2"), ("SYM1", "SYM2")]
+    rng = np.random.default_rng(0)
+    columns = MultiIndex.from_tuples(
+        [("price", pair) for pair in pairs] + [("volume", pair) for pair in pairs]
+    )
+    data = DataFrame(
+        rng.uniform(0.5, 2, (10, 6)) * [1, 1, 1, 10**6, 10**6, 10**6],
+        index=date_range("2024-01-01", periods=10, freq="1h"),
+        columns=columns,
+    )
+    price_sampler = PriceVolume(data)
+    vol_mult = dict(zip(pairs, [0.1, 0.25, 1 / 3]))
+
+    volume_limits = _compute_volume_limits(
+        price_sampler.prices, price_sampler.volumes, vol_mult
+    )
+
+    assert len(volume_limits) == len(data)
+    for sample, limits in zip(price_sampler, volume_limits):
+        for (i, j), volume in sample.volumes.items():
+            limit = volume * vol_mult[i, j]
+            assert limits[i, j] == int(limit * 10**18)
+            assert limits[j, i] == int(limit * sample.prices[i, j] * 10**18)
+
+
+PAIRS = [("SYM0", "SYM1"), ("SYM0", "SYM2"), ("SYM1", "SYM2")]
+
+
+def _make_price_sampler(prices, volumes):
+    columns = MultiIndex.from_tuples(
+        [("price", pair) for pair in PAIRS] + [("volume", pair) for pair in PAIRS]
+    )
+    data = DataFrame(
+        np.hstack([prices, volumes]),
+        index=date_range("2024-01-01", periods=len(prices), freq="1h"),
+        columns=columns,
+    )
+    return PriceVolume(data)
+
+
+@pytest.mark.parametrize("fee_mul", [None, 2 * 10**10])
+def test_float_stableswap(fee_mul):
+    """Test that floating-point trades and prices match the integer pool."""
+    pool = SimCurvePool(
+        A=250, D=3000000 * 10**18, n=3, admin_fee=5 * 10**9, fee_mul=fee_mul
+    )
+    float_pool = _FloatStableswap(pool)
+
+    # tolerances allow for the integer pool's rounding of dynamic fees
+    for i, j, dx in [(0, 1, 10**23), (2, 0, 5 * 10**23), (1, 2, 10**21)]:
+        expected = pool.exchange(i, j, dx)
+        assert float_pool.exchange(i, j, dx) == pytest.approx(expected, rel=1e-6)
+        assert float_pool.D() == pytest.approx(pool.D(), rel=1e-9)
+        for pair in [(i, j), (j, i)]:
+            expected = pool.price(*pair)
+            assert float_pool.price(*pair) == pytest.approx(expected, rel=1e-9)
+
+    for attr in ["balances", "admin_balances"]:
+        expected = np.array(getattr(pool, attr), dtype=float)
+        np.testing.assert_allclose(getattr(float_pool, attr), expected, rtol=1e-6)
+
+
+def test_vectorized_volume_limited_strategy():
+    """Test that vectorized arbitrage approximates the exact strategy's results."""
+    pool = SimCurvePool(A=250, D=3000000 * 10**18, n=3, admin_fee=5 * 10**9)
+    pool.metadata = {
+        "coins": {"names": ["SYM0", "SYM1", "SYM2"], "addresses": ["0x0"] * 3},
+        "symbol": "TEST",
+    }
+
+    rng = np.random.default_rng(0)
+    walk = np.exp(np.cumsum(rng.normal(0, 0.003, (20, 3)), axis=0))
+    prices = walk[:, [0, 0, 1]] / walk[:, [1, 2, 2]]
+    price_sampler = _make_price_sampler(prices, rng.uniform(1e5, 1e6, (20, 3)))
+    vol_mult = dict.fromkeys(PAIRS, 0.5)
+
+    results = []
+    for strategy_class in [VolumeLimitedStrategy, VectorizedVolumeLimitedStrategy]:
+        _pool = deepcopy(pool)
+        metrics = init_metrics([Metrics.PoolBalance, Metrics.PoolVolume], pool=_pool)
+        strategy = strategy_class(metrics, vol_mult)
+        results.append(strategy(_pool, None, price_sampler))
+
+    (_, expected, expected_summary), (_, data, summary) = results
+    assert list(data.columns) == list(expected.columns)
+    assert (data.index == expected.index).all()
+    np.testing.assert_allclose(
+        summary.to_numpy(dtype=float), expected_summary.to_numpy(dtype=float), rtol=5e-2
+    )
+
+
+def test_vectorized_strategy_run_loop():
+    """Test that the vectorized strategy runs the base strategy's loop."""
+    pool = SimCurvePool(A=250, D=3000000 * 10**18, n=3, admin_fee=5 * 10**9)
+    pool.metadata = {
+        "coins": {"names": ["SYM0", "SYM1", "SYM2"], "addresses": ["0x0"] * 3},
+        "symbol": "TEST",
+    }
+
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(0.98, 1.02, (5, 3))
+    price_sampler = _make_price_sampler(prices, rng.uniform(1e5, 1e6, (5, 3)))
+    metrics = init_metrics([Metrics.PoolBalance], pool=pool)
+    strategy = VectorizedVolumeLimitedStrategy(metrics, dict.fromkeys(PAIRS, 0.5))
+
+    with patch.object(SimCurvePool, "prepare_for_trades") as prepare_for_trades:
+        strategy(pool, None, price_sampler)
+
+    timestamps = [call.args[0] for call in prepare_for_trades.call_args_list]
+    assert timestamps == list(price_sampler.prices.index)
+
+    with pytest.raises(CurvesimValueError):
+        VectorizedArbitrageur(DummyPool({}))
+
+
+def test_volume_limited_strategy_pair_workers():
+    """Test that the trader's thread pool is shut down at the end of a run."""
+    pool = SimCurvePool(A=250, D=3000000 * 10**18, n=3, admin_fee=5 * 10**9)
+    pool.metadata = {
+        "coins": {"names": ["SYM0", "SYM1", "SYM2"], "addresses": ["0x0"] * 3},
+        "symbol": "TEST",
+    }
+
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(0.98, 1.02, (5, 3))
+    price_sampler = _make_price_sampler(prices, rng.uniform(1e5, 1e6, (5, 3)))
+    metrics = init_metrics([Metrics.PoolBalance], pool=pool)
+    strategy = VolumeLimitedStrategy(
+        metrics, dict.fromkeys(PAIRS, 0.5), trader_kwargs={"max_workers": 2}
+    )
+
+    threads = set(threading.enumerate())
+    submit = ThreadPoolExecutor.submit
+    with patch.object(ThreadPoolExecutor, "submit", autospec=True) as mock_submit:
+        mock_submit.side_effect = submit
+        strategy(pool, None, price_sampler)
+
+    assert mock_submit.called
+    assert set(threading.enumerate()) <= threads